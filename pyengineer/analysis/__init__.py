@@ -1,5 +1,17 @@
 """Exportar"""
 from ._linear import Linear
 from ._dynamic import Dynamic
+from ._buckling import Buckling
+from ._results import Results
+from ._operator import ElementOperator
+from ._envelope import Envelope, Extremes
+from ._moving import MovingLoad
 
-__all__ = ['Linear' , 'Dynamic']
+__all__ = ['Linear',
+           'Dynamic',
+           'Buckling',
+           'Results',
+           'ElementOperator',
+           'Envelope',
+           'Extremes',
+           'MovingLoad']
@@ -0,0 +1,75 @@
+"""Montagem de matrizes globais a partir das matrizes dos elementos"""
+import numpy as np
+from numpy.typing import NDArray
+from numpy import float64
+from scipy import sparse
+
+
+def assemble(matrices: NDArray[float64],
+             spread_vectors: NDArray[np.int64],
+             order: int,
+             use_sparse: bool = True) -> sparse.csr_matrix | NDArray[float64]:
+    """Monta a matriz global a partir das matrizes dos elementos
+
+    Os triplets (linha, coluna, valor) de todos os elementos são criados de uma vez e os
+    repetidos são somados na conversão para CSR.
+
+    Args:
+        matrices (NDArray[float64]): (n_elements, m, m) matrizes dos elementos em coordenadas
+            globais
+        spread_vectors (NDArray[np.int64]): (n_elements, m) vetores de espalhamento
+        order (int): Ordem da matriz global
+        use_sparse (bool, optional): Retorna uma matriz CSR. Defaults to True.
+
+    Returns:
+        sparse.csr_matrix | NDArray[float64]: Matriz global
+    """
+    size = spread_vectors.shape[1]
+    matrices = np.asarray(matrices, dtype=float).reshape(-1, size, size)
+    spread_vectors = np.asarray(spread_vectors).reshape(-1, size)
+
+    rows = np.repeat(spread_vectors, size, axis=1).ravel()
+    columns = np.tile(spread_vectors, (1, size)).ravel()
+    values = matrices.ravel()
+
+    if not use_sparse:
+        matrix = np.zeros([order, order])
+        np.add.at(matrix, (rows, columns), values)
+        return matrix
+
+    return sparse.csr_matrix((values, (rows, columns)), shape=(order, order))
+
+
+def add_in_place(matrix: sparse.csr_matrix | NDArray[float64],
+                 dofs: NDArray[np.int64],
+                 change: NDArray[float64]) -> bool:
+    """Soma a matriz de um elemento em uma matriz global sem criar uma nova matriz
+
+    Args:
+        matrix (sparse.csr_matrix | NDArray[float64]): Matriz global
+        dofs (NDArray[np.int64]): (m,) linhas e colunas do elemento
+        change (NDArray[float64]): (m, m) valores somados
+
+    Returns:
+        bool: False se alguma posição não existe na matriz esparsa (nada é alterado)
+    """
+    dofs = np.asarray(dofs, dtype=np.int64)
+    if isinstance(matrix, np.ndarray):
+        np.add.at(matrix, (dofs[:, None], dofs[None, :]), change)
+        return True
+    if not isinstance(matrix, sparse.csr_matrix):
+        return False
+
+    # Posição de cada entrada em matrix.data, procurada nas colunas ordenadas de cada linha
+    matrix.sort_indices()
+    positions = np.empty([dofs.size, dofs.size], dtype=np.int64)
+    for row, dof in enumerate(dofs):
+        start, end = matrix.indptr[dof], matrix.indptr[dof + 1]
+        columns = matrix.indices[start:end]
+        found = np.minimum(np.searchsorted(columns, dofs), end - start - 1)
+        if end == start or np.any(columns[found] != dofs):
+            return False
+        positions[row] = start + found
+
+    np.add.at(matrix.data, positions, change)
+    return True
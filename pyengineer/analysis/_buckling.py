@@ -0,0 +1,153 @@
+"""Faz a análise de flambagem linear (autovalores) da estrutura"""
+import numpy as np
+from numpy.typing import NDArray
+from numpy import float64
+from scipy import sparse
+from scipy.sparse import linalg as sparse_linalg
+
+from ..objects import Load
+from ..functions import elements
+
+from ._assembly import assemble
+from ._linear import Linear
+from ._operator import ElementOperator
+from ._solvers import InverseOperator
+
+
+class Buckling:
+    """Flambagem linear a partir dos esforços normais de um carregamento de referência
+
+    Os fatores de carga críticos resolvem (K + lambda Kg) phi = 0. A rigidez geométrica de
+    todas as barras é calculada de uma vez e o problema é resolvido para mu = 1 / lambda com
+    Lanczos (ARPACK), usando o solver da análise linear como K^-1.
+    """
+    def __init__(self, linear: Linear, load: Load | str, modes: int = 5,
+                 calculate: bool = True):
+        """Construtor
+
+        Args:
+            linear (Linear): Análise linear calculada
+            load (Load | str): Carregamento de referência (ou o seu nome)
+            modes (int, optional): Número de modos calculados. Defaults to 5.
+            calculate (bool, optional): Calcula os modos ao criar o objeto. Defaults to True.
+        """
+        self.linear = linear
+        self.load_name = load.name if isinstance(load, Load) else load
+        self.n_modes = modes
+        self.calculated = False
+        self.axial_forces: NDArray[float64] = np.array([]) # (n_bars,) tração positiva
+        # (n_bars, 12, 12) matrizes geométricas das barras em coordenadas globais
+        self.element_geometric: NDArray[float64] = np.zeros([0, 12, 12])
+        # Matriz de rigidez geométrica global e dos graus de liberdade de kg_solution
+        self.kgeo: sparse.csr_matrix | NDArray[float64] | ElementOperator = np.array([])
+        self.kgeo_solution: sparse.csr_matrix | NDArray[float64] | ElementOperator = np.array([])
+        # Modos, em ordem crescente do fator de carga crítico
+        self.critical_factors: NDArray[float64] = np.array([])
+        # (n_dof_solution, n_modes) modos com o maior deslocamento igual a 1
+        self.modes_matrix: NDArray[float64] = np.zeros([0, 0])
+        self.mode_shapes: NDArray[float64] = np.zeros([0, 0, 6]) # (n_modes, n_nodes, 6)
+
+        if calculate:
+            self.calculate_modes()
+
+    def calculate_axial_forces(self) -> NDArray[float64]:
+        """Esforço normal de cada barra no carregamento de referência
+
+        Raises:
+            ValueError: Se o carregamento não foi calculado
+
+        Returns:
+            NDArray[float64]: (n_bars,) média dos esforços normais das extremidades
+        """
+        bars = self.linear.bars
+        if any(self.load_name not in bar.extreme_forces for bar in bars):
+            raise ValueError(f"The load '{self.load_name}' has not been calculated.")
+
+        forces = np.array([bar.extreme_forces[self.load_name] for bar in bars]).reshape(-1, 12)
+        return (forces[:, 0] + forces[:, 6]) / 2
+
+    def calculate_geometric_stiffness(self
+                                      ) -> sparse.csr_matrix | NDArray[float64] | ElementOperator:
+        """Calcula a matriz de rigidez geométrica global com a mesma numeração de kg
+
+        As liberações seguem a condensação das matrizes elásticas: com os operadores T das
+        liberações, a matriz condensada é T Kg T^T.
+
+        Returns:
+            sparse.csr_matrix | NDArray[float64] | ElementOperator: Matriz de rigidez
+                geométrica global, ou o operador elemento por elemento se `matrix_free`
+        """
+        linear = self.linear
+        bars = linear.bars
+        self.axial_forces = self.calculate_axial_forces()
+
+        kl = elements.local_geometric_stiffness(
+            [bar.length for bar in bars], self.axial_forces,
+            [bar.section.properties['area'] for bar in bars],
+            [bar.section.properties['Iy'] + bar.section.properties['Iz'] for bar in bars])
+        operators = linear.element_operators
+        kl = operators @ kl @ operators.transpose(0, 2, 1)
+        self.element_geometric = elements.to_global(kl, linear.element_r)
+
+        free_dofs = linear.free_dofs
+        spread_vectors = linear.numbering.spread_vectors
+        if linear.matrix_free:
+            self.kgeo = ElementOperator(self.element_geometric, spread_vectors,
+                                        linear.matrix_order)
+            self.kgeo_solution = ElementOperator(self.element_geometric, spread_vectors,
+                                                 linear.matrix_order, dofs=free_dofs)
+            return self.kgeo
+
+        self.kgeo = assemble(self.element_geometric, spread_vectors, linear.matrix_order,
+                             linear.use_sparse)
+        if isinstance(self.kgeo, sparse.csr_matrix):
+            self.kgeo_solution = sparse.csr_matrix(self.kgeo[free_dofs][:, free_dofs])
+        else:
+            self.kgeo_solution = self.kgeo[np.ix_(free_dofs, free_dofs)]
+
+        return self.kgeo
+
+    def calculate_modes(self) -> None:
+        """Calcula os menores fatores de carga críticos e os modos de flambagem
+
+        -Kg phi = mu K phi é resolvido com `eigsh` (K^-1 do solver da análise linear) para os
+        maiores mu, e lambda = 1 / mu. Modos com mu <= 0 (o carregamento não causa flambagem)
+        são descartados.
+
+        Raises:
+            ValueError: Se a análise linear não foi calculada
+        """
+        linear = self.linear
+        if linear.solver is None:
+            raise ValueError("The analysis has not been calculated.")
+
+        self.calculate_geometric_stiffness()
+        order = linear.free_dofs.size
+        n_modes = min(self.n_modes, order - 1)
+
+        inverse = InverseOperator(linear.solver, order)
+        geometric = sparse_linalg.aslinearoperator(self.kgeo_solution)
+        eigenvalues, vectors = sparse_linalg.eigsh(-geometric, k=n_modes,
+                                                   M=linear.kg_solution, Minv=inverse,
+                                                   which='LA')
+
+        positive = eigenvalues > 0
+        factors = 1.0 / eigenvalues[positive]
+        vectors = vectors[:, positive]
+        order_modes = np.argsort(factors)
+        factors = factors[order_modes]
+        vectors = vectors[:, order_modes]
+
+        # Maior deslocamento igual a 1
+        if vectors.size:
+            largest = np.take_along_axis(vectors, np.argmax(np.abs(vectors), axis=0)[None], 0)
+            vectors = vectors / largest
+
+        self.critical_factors = factors
+        self.modes_matrix = vectors
+
+        full = np.zeros([linear.matrix_order, factors.size])
+        full[linear.free_dofs] = vectors
+        self.mode_shapes = full[linear.numbering.node_dofs].transpose(2, 0, 1)
+
+        self.calculated = True
@@ -0,0 +1,142 @@
+"""Cache das matrizes locais dos elementos"""
+from collections import OrderedDict
+
+import numpy as np
+from numpy.typing import NDArray
+from numpy import float64
+
+from ..objects import Bar
+from ..functions import elements
+
+CacheKey = tuple[tuple[float, ...], tuple[float, ...], int, bytes]
+CacheEntry = tuple[NDArray[float64], NDArray[float64], NDArray[float64]]
+
+
+class ElementCache:
+    """Cache das matrizes locais compartilhadas por barras idênticas
+
+    Barras com a mesma seção, o mesmo material, o mesmo comprimento e as mesmas liberações
+    têm as mesmas matrizes locais; só a rotação muda.
+    """
+    def __init__(self, max_size: int = 4096, length_tolerance: float = 1e-9):
+        """Construtor
+
+        Args:
+            max_size (int, optional): Número máximo de entradas; as usadas há mais tempo são
+                descartadas primeiro. Defaults to 4096.
+            length_tolerance (float, optional): Tolerância dos comprimentos. Defaults to 1e-9.
+        """
+        self.max_size = max_size
+        self.length_tolerance = length_tolerance
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[CacheKey, CacheEntry] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, bar: Bar) -> CacheKey:
+        """Chave da barra no cache
+
+        Args:
+            bar (Bar): Barra
+
+        Returns:
+            CacheKey: Propriedades da seção e do material, comprimento e liberações
+        """
+        properties = bar.section.properties
+        return ((float(properties['area']), float(properties['Ix']), float(properties['Iy']),
+                 float(properties['Iz'])),
+                (float(bar.material.properties['E']), float(bar.material.properties['G'])),
+                int(round(bar.length / self.length_tolerance)),
+                bar.release_mask.tobytes())
+
+    def get_matrices(self, bars: list[Bar]) -> CacheEntry:
+        """Matrizes locais das barras, calculando só as que não estão no cache
+
+        Args:
+            bars (list[Bar]): Barras
+
+        Returns:
+            CacheEntry: (n_bars, 12, 12) rigidez sem liberações, rigidez com liberações e
+                operadores de condensação das cargas
+        """
+        keys = [self.key(bar) for bar in bars]
+        unique: dict[CacheKey, int] = {}
+        inverse = np.array([unique.setdefault(key, len(unique)) for key in keys],
+                           dtype=np.int64)
+
+        first_bar = np.unique(inverse, return_index=True)[1] # Primeira barra de cada chave
+        missing = [key for key in unique if key not in self._entries]
+        new_entries = self.calculate_entries([bars[first_bar[unique[key]]] for key in missing],
+                                             missing)
+
+        self.misses += len(missing)
+        self.hits += len(bars) - len(missing)
+
+        entries: list[CacheEntry] = []
+        for key in unique:
+            if key in new_entries:
+                entry = new_entries[key]
+                self._entries[key] = entry
+            else:
+                entry = self._entries[key]
+                self._entries.move_to_end(key)
+            entries.append(entry)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+        if not entries:
+            empty = np.zeros([0, 12, 12])
+            return empty, empty.copy(), empty.copy()
+
+        kl_nr = np.array([entry[0] for entry in entries])[inverse]
+        kl = np.array([entry[1] for entry in entries])[inverse]
+        operators = np.array([entry[2] for entry in entries])[inverse]
+
+        return kl_nr, kl, operators
+
+    def calculate_entries(self, bars: list[Bar],
+                          keys: list[CacheKey]) -> dict[CacheKey, CacheEntry]:
+        """Calcula de uma vez as matrizes locais de barras que não estão no cache
+
+        Args:
+            bars (list[Bar]): Uma barra de cada chave
+            keys (list[CacheKey]): Chaves das barras
+
+        Returns:
+            dict[CacheKey, CacheEntry]: Matrizes de cada chave
+        """
+        if not bars:
+            return {}
+
+        area, ix, iy, iz = ([bar.section.properties[key] for bar in bars]
+                            for key in ('area', 'Ix', 'Iy', 'Iz'))
+        e, g = ([bar.material.properties[key] for bar in bars] for key in ('E', 'G'))
+        kl_nr = elements.local_stiffness([bar.length for bar in bars], (area, ix, iy, iz),
+                                         (e, g))
+        kl, operators = elements.condense_releases(kl_nr,
+                                                   np.array([bar.release_mask for bar in bars]))
+
+        return {key: (kl_nr[index], kl[index], operators[index])
+                for index, key in enumerate(keys)}
+
+    def statistics(self) -> dict[str, int | float]:
+        """Estatísticas de acertos e falhas do cache
+
+        Returns:
+            dict[str, int | float]: hits, misses, hit_rate, size e max_size
+        """
+        total = self.hits + self.misses
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._entries),
+                'max_size': self.max_size}
+
+    def clear(self) -> None:
+        """Apaga as entradas e zera as estatísticas"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
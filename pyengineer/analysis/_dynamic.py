@@ -1,5 +1,767 @@
-"""Faz a análise não linear da estrutura"""
+"""Faz a análise dinâmica da estrutura"""
+from typing import Literal, TypedDict, Unpack
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from numpy import float64
+from scipy import linalg
+from scipy import signal
+from scipy import sparse
+from scipy.sparse import linalg as sparse_linalg
+
+from ..objects import Node
+from ..objects import Bar
+from ..functions import elements
+
+from ._assembly import assemble
+from ._linear import Linear
+from ._results import Results
+from ._history import TimeHistory, FrequencyResponse
+from ._operator import ElementOperator
+from ._solvers import Factorization, ConjugateGradient, JacobiPreconditioner, InverseOperator
+
+
+class INewmarkParameters(TypedDict, total=False):
+    """Parâmetros da integração de Newmark-beta / HHT-alpha"""
+    alpha: float
+    beta: float
+    gamma: float
+
+
+class Newmark:
+    """Passos da integração de Newmark-beta / HHT-alpha com a rigidez efetiva fatorada"""
+    def __init__(self, dynamic: 'Dynamic', time_step: float, damping: tuple[float, float],
+                 parameters: INewmarkParameters):
+        """Construtor
+
+        Args:
+            dynamic (Dynamic): Análise dinâmica com a matriz de massa calculada
+            time_step (float): Passo de tempo
+            damping (tuple[float, float]): Coeficientes de Rayleigh (a0, a1)
+            parameters (INewmarkParameters): alpha, beta e gamma
+        """
+        self.dynamic = dynamic
+        self.time_step = time_step
+        self.damping = damping
+        self.alpha = parameters.get('alpha', 0.0)
+        self.beta = parameters.get('beta', (1 + self.alpha)**2 / 4)
+        self.gamma = parameters.get('gamma', 0.5 + self.alpha)
+
+        # K_eff = c_m M + c_k K, fatorada uma vez
+        ratio = self.gamma / (self.beta * time_step)
+        self.solver = dynamic.create_effective_solver(
+            1 / (self.beta * time_step**2) + (1 - self.alpha) * ratio * damping[0],
+            (1 - self.alpha) * (1 + ratio * damping[1]))
+
+    def integrate(self, factors: NDArray[float64], node_rows: NDArray[np.int64],
+                  bar_rows: NDArray[np.int64]) -> tuple[NDArray[float64], NDArray[float64]]:
+        """Integra a partir do repouso e grava os graus de liberdade escolhidos
+
+        Args:
+            factors (NDArray[float64]): (n_times, n_loads) fator de cada caso de carga
+            node_rows (NDArray[np.int64]): (n_nodes, 6) linhas gravadas dos nós
+            bar_rows (NDArray[np.int64]): (n_bars, 12) linhas gravadas das barras
+
+        Returns:
+            tuple[NDArray[float64], NDArray[float64]]: (3, n_times, n_nodes, 6) deslocamentos,
+                velocidades e acelerações dos nós e (n_bars, 12, n_times) deslocamentos das
+                barras
+        """
+        linear = self.dynamic.linear
+        loads = linear.forces[linear.free_dofs] # (n, n_loads)
+        recorded = np.zeros((3, factors.shape[0]) + node_rows.shape)
+        bar_displacements = np.zeros(bar_rows.shape + (factors.shape[0],))
+
+        # u, v e a com uma coluna de zeros no fim para os graus de liberdade restringidos
+        state = np.zeros([3, loads.shape[0] + 1])
+        force = loads @ factors[0]
+        state[2, :-1] = self.dynamic.initial_acceleration(force)
+        for step in range(factors.shape[0]):
+            if step:
+                next_force = loads @ factors[step]
+                state[:, :-1] = self.step(state[:, :-1], force, next_force)
+                force = next_force
+            recorded[:, step] = state[:, node_rows]
+            bar_displacements[:, :, step] = state[0, bar_rows]
+
+        return recorded, bar_displacements
+
+    def step(self, state: NDArray[float64], force: NDArray[float64],
+             next_force: NDArray[float64]) -> NDArray[float64]:
+        """Avança um passo de tempo
+
+        Args:
+            state (NDArray[float64]): (3, n) deslocamentos, velocidades e acelerações
+            force (NDArray[float64]): (n,) forças no início do passo
+            next_force (NDArray[float64]): (n,) forças no fim do passo
+
+        Returns:
+            NDArray[float64]: (3, n) estado no fim do passo
+        """
+        alpha = self.alpha
+        w, inertia = self.predictors(state)
+
+        k_products = np.asarray(self.dynamic.linear.kg_solution
+                                @ np.column_stack((state[0], state[1], w)))
+        m_products = np.asarray(self.dynamic.mg_solution
+                                @ np.column_stack((state[1], w, inertia)))
+        # C x = a0 M x + a1 K x, para x = v e x = w
+        damping = (self.damping[0] * m_products[:, :2]
+                   + self.damping[1] * k_products[:, 1:])
+
+        next_u = self.solver.solve((1 - alpha) * next_force + alpha * force
+                                   - alpha * (damping[:, 0] + k_products[:, 0])
+                                   + m_products[:, 2] + (1 - alpha) * damping[:, 1])
+        return self.corrector(state, next_u)
+
+    def predictors(self, state: NDArray[float64]) -> tuple[NDArray[float64], NDArray[float64]]:
+        """Termos do passo que dependem só do estado no início
+
+        Args:
+            state (NDArray[float64]): (3, n) deslocamentos, velocidades e acelerações
+
+        Returns:
+            tuple[NDArray[float64], NDArray[float64]]: vetor multiplicado pelo amortecimento e
+                vetor multiplicado pela massa
+        """
+        u, v, a = state
+        beta, gamma, dt = self.beta, self.gamma, self.time_step
+        return ((gamma / (beta * dt) * u - (1 - gamma / beta) * v
+                 - dt * (1 - gamma / (2 * beta)) * a),
+                u / (beta * dt**2) + v / (beta * dt) + (1 / (2 * beta) - 1) * a)
+
+    def corrector(self, state: NDArray[float64], next_u: NDArray[float64]) -> NDArray[float64]:
+        """Velocidades e acelerações no fim do passo
+
+        Args:
+            state (NDArray[float64]): (3, n) deslocamentos, velocidades e acelerações
+            next_u (NDArray[float64]): (n,) deslocamentos no fim do passo
+
+        Returns:
+            NDArray[float64]: (3, n) estado no fim do passo
+        """
+        u, v, a = state
+        beta, gamma, dt = self.beta, self.gamma, self.time_step
+        next_a = (next_u - u - dt * v) / (beta * dt**2) - (1 / (2 * beta) - 1) * a
+        return np.vstack((next_u, v + dt * ((1 - gamma) * a + gamma * next_a), next_a))
+
+
 class Dynamic:
-    """Análise não-linear"""
-    def __init__(self):
-        pass
+    """Análise dinâmica (modal) a partir de uma análise linear já calculada
+
+    Usa a rigidez, os apoios e a fatoração da análise linear. Só os modos mais baixos são
+    calculados, com Lanczos (ARPACK) em shift-invert em torno de zero.
+    """
+    def __init__(self, linear: Linear, modes: int = 10,
+                 mass: Literal['lumped', 'consistent'] = 'lumped',
+                 calculate: bool = True):
+        """Construtor
+
+        Args:
+            linear (Linear): Análise linear calculada
+            modes (int, optional): Número de modos calculados. Defaults to 10.
+            mass (Literal['lumped', 'consistent'], optional): Matriz de massa discreta
+                (diagonal) ou consistente. Defaults to 'lumped'.
+            calculate (bool, optional): Calcula os modos ao criar o objeto. Defaults to True.
+        """
+        self.linear = linear
+        self.n_modes = modes
+        self.mass_type = mass
+        self.calculated = False
+        # (n_bars, 12, 12) matrizes de massa das barras em coordenadas globais
+        self.element_mass: NDArray[float64] = np.zeros([0, 12, 12])
+        self.mg: sparse.csr_matrix | NDArray[float64] = np.array([]) # Matriz de massa global
+        # Matriz de massa dos graus de liberdade de kg_solution
+        self.mg_solution: sparse.csr_matrix | NDArray[float64] = np.array([])
+        # Modos, em ordem crescente de frequência
+        self.eigenvalues: NDArray[float64] = np.array([]) # omega^2
+        self.angular_frequencies: NDArray[float64] = np.array([]) # rad/s
+        self.frequencies: NDArray[float64] = np.array([]) # Hz
+        self.periods: NDArray[float64] = np.array([]) # s
+        # (n_dof_solution, n_modes) modos normalizados pela massa (phi^T M phi = 1)
+        self.modes_matrix: NDArray[float64] = np.zeros([0, 0])
+        self.mode_shapes: NDArray[float64] = np.zeros([0, 0, 6]) # (n_modes, n_nodes, 6)
+        # Direções: Dx, Dy, Dz (translações) e Rx, Ry, Rz (rotações em torno da origem)
+        self.influence_vectors: NDArray[float64] = np.zeros([0, 6]) # (n_dof_solution, 6)
+        self.participation_factors: NDArray[float64] = np.zeros([0, 6]) # (n_modes, 6)
+        self.effective_masses: NDArray[float64] = np.zeros([0, 6]) # (n_modes, 6)
+        self.total_masses: NDArray[float64] = np.zeros(6) # (6,)
+
+        if calculate:
+            self.calculate_modes()
+
+    def calculate_mass(self) -> sparse.csr_matrix | NDArray[float64]:
+        """Calcula a matriz de massa global com a mesma numeração de kg
+
+        Returns:
+            sparse.csr_matrix | NDArray[float64]: Matriz de massa global
+        """
+        linear = self.linear
+        bars = linear.bars
+        ml = elements.local_mass([bar.length for bar in bars],
+                                 [bar.section.properties['area'] for bar in bars],
+                                 [bar.material.properties['rho'] for bar in bars],
+                                 [bar.section.properties['Iy'] + bar.section.properties['Iz']
+                                  for bar in bars],
+                                 self.mass_type == 'lumped')
+        self.element_mass = elements.to_global(ml, linear.element_r)
+
+        self.mg = assemble(self.element_mass, linear.numbering.spread_vectors,
+                           linear.matrix_order, linear.use_sparse)
+
+        free_dofs = linear.free_dofs
+        if isinstance(self.mg, sparse.csr_matrix):
+            self.mg_solution = sparse.csr_matrix(self.mg[free_dofs][:, free_dofs])
+        else:
+            self.mg_solution = self.mg[np.ix_(free_dofs, free_dofs)]
+
+        return self.mg
+
+    def calculate_influence_vectors(self) -> NDArray[float64]:
+        """Deslocamentos de corpo rígido unitários nas seis direções globais
+
+        Returns:
+            NDArray[float64]: (n_dof_solution, 6) vetores de influência
+        """
+        linear = self.linear
+        positions = np.array([node.position for node in linear.nodes], dtype=float)
+        positions = positions.reshape(-1, 3)
+        x, y, z = positions.T
+
+        blocks = np.zeros([positions.shape[0], 6, 6])
+        blocks[:, np.arange(6), np.arange(6)] = 1.0
+        # Translações dos nós para uma rotação unitária em torno dos eixos globais (e x p)
+        blocks[:, 1, 3], blocks[:, 2, 3] = -z, y
+        blocks[:, 0, 4], blocks[:, 2, 4] = z, -x
+        blocks[:, 0, 5], blocks[:, 1, 5] = -y, x
+
+        vectors = np.zeros([linear.matrix_order, 6])
+        vectors[linear.numbering.node_dofs.ravel()] = blocks.reshape(-1, 6)
+        # Os apoios não se movem com o solo (também com o método 'penalty')
+        vectors[linear.restrained_dofs] = 0.0
+
+        return vectors[linear.free_dofs]
+
+    def calculate_modes(self) -> None:
+        """Calcula os modos de vibração mais baixos
+
+        K phi = omega^2 M phi é resolvido com `eigsh` em shift-invert (sigma = 0), usando o
+        solver da análise linear como operador inverso.
+
+        Raises:
+            ValueError: Se a análise linear não foi calculada
+        """
+        linear = self.linear
+        if linear.solver is None:
+            raise ValueError("The analysis has not been calculated.")
+
+        self.calculate_mass()
+        order = linear.free_dofs.size
+        n_modes = min(self.n_modes, order - 1)
+
+        inverse = InverseOperator(linear.solver, order)
+        eigenvalues, vectors = sparse_linalg.eigsh(linear.kg_solution, k=n_modes,
+                                                   M=self.mg_solution, sigma=0.0,
+                                                   OPinv=inverse, which='LM')
+
+        order_modes = np.argsort(eigenvalues)
+        eigenvalues = eigenvalues[order_modes]
+        vectors = vectors[:, order_modes]
+
+        # Normalização pela massa
+        vectors /= np.sqrt(np.sum(vectors * (self.mg_solution @ vectors), axis=0))
+
+        self.eigenvalues = eigenvalues
+        self.angular_frequencies = np.sqrt(np.clip(eigenvalues, 0.0, None))
+        self.frequencies = self.angular_frequencies / (2 * np.pi)
+        with np.errstate(divide='ignore'):
+            self.periods = 1.0 / self.frequencies
+        self.modes_matrix = vectors
+
+        full = np.zeros([linear.matrix_order, n_modes])
+        full[linear.free_dofs] = vectors
+        self.mode_shapes = full[linear.numbering.node_dofs].transpose(2, 0, 1)
+
+        # Fatores de participação e massas efetivas
+        self.influence_vectors = self.calculate_influence_vectors()
+        mass_influence = self.mg_solution @ self.influence_vectors
+        self.participation_factors = vectors.T @ mass_influence
+        self.effective_masses = self.participation_factors**2
+        self.total_masses = np.sum(self.influence_vectors * mass_influence, axis=0)
+
+        self.calculated = True
+
+    def mass_ratios(self) -> NDArray[float64]:
+        """Razão entre a massa efetiva de cada modo e a massa total em cada direção
+
+        Returns:
+            NDArray[float64]: (n_modes, 6) razões de massa (acumule com cumsum(axis=0))
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.total_masses > 0,
+                            self.effective_masses / self.total_masses, 0.0)
+
+    @staticmethod
+    def rayleigh_coefficients(ratio: float, omega_1: float, omega_2: float
+                              ) -> tuple[float, float]:
+        """Coeficientes do amortecimento de Rayleigh C = a0 M + a1 K
+
+        Args:
+            ratio (float): Razão de amortecimento nas duas frequências
+            omega_1 (float): Primeira frequência angular (rad/s)
+            omega_2 (float): Segunda frequência angular (rad/s)
+
+        Returns:
+            tuple[float, float]: a0 e a1
+        """
+        return (2 * ratio * omega_1 * omega_2 / (omega_1 + omega_2),
+                2 * ratio / (omega_1 + omega_2))
+
+    def time_history(self, load_factors: ArrayLike, time_step: float,
+                     nodes: list[Node] | None = None,
+                     bars: list[Bar] | None = None,
+                     damping: tuple[float, float] = (0.0, 0.0),
+                     **parameters: Unpack[INewmarkParameters]) -> TimeHistory:
+        """Integração direta no tempo (Newmark-beta / HHT-alpha)
+
+        As cargas são os casos de carga vezes funções do tempo, F(t) = sum(F_l * g_l(t)), e a
+        estrutura parte do repouso. A rigidez efetiva é fatorada uma vez.
+
+        Args:
+            load_factors (ArrayLike): (n_times, n_loads) valor da função do tempo de cada
+                caso de carga em cada instante (t = i * time_step)
+            time_step (float): Passo de tempo
+            nodes (list[Node] | None, optional): Nós gravados. Defaults to None (nenhum).
+            bars (list[Bar] | None, optional): Barras gravadas. Defaults to None (nenhuma).
+            damping (tuple[float, float], optional): Coeficientes de Rayleigh (a0, a1), veja
+                `rayleigh_coefficients`. Defaults to (0.0, 0.0).
+            **parameters (INewmarkParameters): alpha, dissipação HHT entre 0 e 1/3
+                (0 é Newmark); beta, (1 + alpha)^2 / 4 por padrão; gamma, 1/2 + alpha por
+                padrão
+
+        Returns:
+            TimeHistory: Deslocamentos, velocidades e acelerações dos nós e esforços nas barras
+        """
+        if self.linear.solver is None:
+            raise ValueError("The analysis has not been calculated.")
+        if not sparse.issparse(self.mg_solution) and self.mg_solution.size == 0:
+            self.calculate_mass()
+
+        nodes = nodes if nodes is not None else []
+        bars = bars if bars is not None else []
+        factors = np.asarray(load_factors, dtype=float).reshape(-1, len(self.linear.loads))
+        node_rows, bar_indices, bar_rows = self.recorded_rows(nodes, bars)
+
+        recorded, bar_displacements = Newmark(self, time_step, damping, parameters).integrate(
+            factors, node_rows, bar_rows)
+
+        return TimeHistory(np.arange(factors.shape[0], dtype=float64) * time_step,
+                           [node.name for node in nodes], recorded,
+                           [bar.name for bar in bars],
+                           self.recorded_bars_forces(bar_indices, bar_displacements, factors))
+
+    def initial_acceleration(self, force: NDArray[float64]) -> NDArray[float64]:
+        """Aceleração da estrutura em repouso, M a = F(0)
+
+        Graus de liberdade sem massa (M singular) começam com aceleração nula.
+
+        Args:
+            force (NDArray[float64]): (n,) forças no instante inicial
+
+        Returns:
+            NDArray[float64]: (n,) acelerações
+        """
+        m = self.mg_solution
+        acceleration = np.zeros(force.size)
+        massive = np.flatnonzero(np.asarray(abs(m).sum(axis=1)).ravel() > 0)
+        if not np.any(force[massive]):
+            return acceleration
+
+        if isinstance(m, sparse.csr_matrix):
+            acceleration[massive] = Factorization(m[massive][:, massive]).solve(force[massive])
+        else:
+            acceleration[massive] = Factorization(m[np.ix_(massive, massive)]).solve(
+                force[massive])
+        return acceleration
+
+    def create_effective_solver(self, c_m: float, c_k: float
+                                ) -> Factorization | ConjugateGradient:
+        """Solver de c_m M + c_k K nos graus de liberdade de kg_solution
+
+        Args:
+            c_m (float): Fator da matriz de massa
+            c_k (float): Fator da matriz de rigidez
+
+        Returns:
+            Factorization | ConjugateGradient: Fatoração, ou gradientes conjugados com Jacobi
+                se a análise linear não monta a matriz de rigidez
+        """
+        linear = self.linear
+        k = linear.kg_solution
+        m = self.mg_solution
+
+        if isinstance(k, ElementOperator):
+            operator = c_m * sparse_linalg.aslinearoperator(m) + c_k * k
+            diagonal = c_m * m.diagonal() + c_k * k.diagonal()
+            return ConjugateGradient(operator, JacobiPreconditioner(diagonal),
+                                     linear.tolerance, linear.max_iterations)
+
+        return Factorization(c_m * m + c_k * k)
+
+    def recorded_rows(self, nodes: list[Node], bars: list[Bar]
+                      ) -> tuple[NDArray[np.int64], NDArray[np.int64], NDArray[np.int64]]:
+        """Linhas de kg_solution dos graus de liberdade gravados
+
+        Graus de liberdade restringidos apontam para a linha depois da última, que é um zero
+        no fim dos vetores.
+
+        Args:
+            nodes (list[Node]): Nós gravados
+            bars (list[Bar]): Barras gravadas
+
+        Returns:
+            tuple[NDArray[np.int64], ...]: (n_nodes, 6) linhas dos nós, (n_bars,) índices das
+                barras e (n_bars, 12) linhas das barras
+        """
+        linear = self.linear
+        solution_dofs = linear.solution_dofs()
+        solution_dofs[solution_dofs < 0] = linear.free_dofs.size
+
+        node_rows = solution_dofs[linear.numbering.node_dofs[
+            [linear.numbering.node_index[node] for node in nodes]]].reshape(-1, 6)
+        bar_indices = np.array([linear.numbering.bar_index[bar] for bar in bars],
+                               dtype=np.int64)
+        bar_rows = solution_dofs[linear.numbering.spread_vectors[bar_indices]].reshape(-1, 12)
+
+        return node_rows, bar_indices, bar_rows
+
+    def recorded_bars_forces(self, bar_indices: NDArray[np.int64],
+                             displacements: NDArray[float64],
+                             factors: NDArray[float64]) -> NDArray[float64]:
+        """Esforços nas barras gravadas, com as forças de engastamento dos carregamentos
+
+        Args:
+            bar_indices (NDArray[np.int64]): (n_bars,) índices das barras
+            displacements (NDArray[float64]): (n_bars, 12, n) deslocamentos das barras
+            factors (NDArray[float64]): (n, n_loads) fator de cada caso de carga
+
+        Returns:
+            NDArray[float64]: (n, n_bars, 12) esforços nas barras
+        """
+        linear = self.linear
+        if bar_indices.size == 0:
+            return np.zeros([factors.shape[0], 0, 12], dtype=displacements.dtype)
+
+        fixed_end = np.einsum('tl,lbj->bjt', factors, linear.fixed_end_forces[:, bar_indices])
+        return elements.end_forces(linear.element_kl[bar_indices],
+                                   linear.element_r[bar_indices],
+                                   displacements, fixed_end).transpose(2, 0, 1)
+
+    def modal_time_history(self, load_factors: ArrayLike, time_step: float,
+                           nodes: list[Node] | None = None,
+                           bars: list[Bar] | None = None,
+                           damping_ratios: ArrayLike = 0.05) -> TimeHistory:
+        """Resposta no tempo por superposição modal
+
+        Cada equação modal é integrada de forma exata para cargas lineares entre os
+        instantes, com um filtro recursivo (`scipy.signal.lfilter`) por modo no lugar de um
+        laço nos passos de tempo. A estrutura parte do repouso.
+
+        Args:
+            load_factors (ArrayLike): (n_times, n_loads) valor da função do tempo de cada
+                caso de carga em cada instante (t = i * time_step)
+            time_step (float): Passo de tempo
+            nodes (list[Node] | None, optional): Nós gravados. Defaults to None (nenhum).
+            bars (list[Bar] | None, optional): Barras gravadas. Defaults to None (nenhuma).
+            damping_ratios (ArrayLike, optional): Razão de amortecimento de cada modo (ou
+                de todos). Defaults to 0.05.
+
+        Returns:
+            TimeHistory: Deslocamentos, velocidades e acelerações dos nós e esforços nas barras
+
+        Raises:
+            ValueError: Se os modos não foram calculados
+        """
+        if not self.calculated:
+            raise ValueError("The modes have not been calculated.")
+
+        nodes = nodes if nodes is not None else []
+        bars = bars if bars is not None else []
+        factors = np.asarray(load_factors, dtype=float).reshape(-1, len(self.linear.loads))
+        omega = self.angular_frequencies
+        zeta = np.broadcast_to(np.asarray(damping_ratios, dtype=float), omega.shape)
+
+        # Cargas modais (n_modes, n_times), deslocamentos e velocidades
+        modal_loads = ((self.modes_matrix.T @ self.linear.forces[self.linear.free_dofs])
+                       @ factors.T)
+        q, q_dot = self.modal_response(modal_loads, zeta, time_step)
+        recorded, bars_forces = self.modal_recovery(
+            nodes, bars, np.stack((q, q_dot, modal_loads - 2 * (zeta * omega)[:, None] * q_dot
+                                   - (omega**2)[:, None] * q)), factors)
+
+        return TimeHistory(np.arange(factors.shape[0], dtype=float64) * time_step,
+                           [node.name for node in nodes], recorded,
+                           [bar.name for bar in bars], bars_forces)
+
+    def modal_recovery(self, nodes: list[Node], bars: list[Bar], values: NDArray,
+                       factors: NDArray) -> tuple[NDArray, NDArray]:
+        """Valores dos nós e esforços nas barras gravados a partir de coordenadas modais
+
+        Args:
+            nodes (list[Node]): Nós gravados
+            bars (list[Bar]): Barras gravadas
+            values (NDArray): (k, n_modes, n) coordenadas modais, a primeira de deslocamentos
+            factors (NDArray): (n, n_loads) fator de cada caso de carga
+
+        Returns:
+            tuple[NDArray, NDArray]: (k, n, n_nodes, 6) valores dos nós e (n, n_bars, 12)
+                esforços nas barras
+        """
+        node_rows, bar_indices, bar_rows = self.recorded_rows(nodes, bars)
+        modes = np.vstack((self.modes_matrix, np.zeros([1, self.eigenvalues.size])))
+        bar_displacements = np.einsum('bjm,mt->bjt', modes[bar_rows], values[0])
+
+        return (np.einsum('njm,kmt->ktnj', modes[node_rows], values),
+                self.recorded_bars_forces(bar_indices, bar_displacements, factors))
+
+    def modal_response(self, modal_loads: NDArray[float64], zeta: NDArray[float64],
+                       time_step: float) -> tuple[NDArray[float64], NDArray[float64]]:
+        """Integra q'' + 2 zeta w q' + w^2 q = p(t) a partir do repouso
+
+        Args:
+            modal_loads (NDArray[float64]): (n_modes, n_times) cargas modais p
+            zeta (NDArray[float64]): (n_modes,) razões de amortecimento
+            time_step (float): Passo de tempo
+
+        Returns:
+            tuple[NDArray[float64], NDArray[float64]]: (n_modes, n_times) q e q'
+        """
+        # x(t + dt) = Phi x(t) + G0 p(t) + G1 p(t + dt), with x = (q, q'). Then
+        # y = x - G1 p follows y(t + dt) = Phi y(t) + (Phi G1 + G0) p(t), a 2nd order filter
+        phi, current, following = self.modal_recurrence(zeta, time_step)
+        inputs = np.einsum('mij,mj->mi', phi, following) + current
+        start = -following * modal_loads[:, :1] # y(0), estrutura em repouso
+        trace = phi[:, 0, 0] + phi[:, 1, 1]
+        # (z I - Phi)^-1 = (z I + adj(-Phi)) / det(z I - Phi)
+        numerator = np.einsum('mij,mj->mi', np.stack(
+            (np.stack((-phi[:, 1, 1], phi[:, 0, 1]), axis=-1),
+             np.stack((phi[:, 1, 0], -phi[:, 0, 0]), axis=-1)), axis=1), inputs)
+        initial = np.einsum('mij,mj->mi', phi, start) - trace[:, None] * start
+
+        response = following[:, :, None] * modal_loads[:, None, :]
+        for mode in range(modal_loads.shape[0]):
+            for component in range(2):
+                response[mode, component] += signal.lfilter(
+                    [0.0, inputs[mode, component], numerator[mode, component]],
+                    [1.0, -trace[mode], np.linalg.det(phi[mode])], modal_loads[mode],
+                    zi=[start[mode, component], initial[mode, component]])[0]
+
+        return response[:, 0], response[:, 1]
+
+    def modal_recurrence(self, zeta: NDArray[float64], time_step: float
+                         ) -> tuple[NDArray[float64], NDArray[float64], NDArray[float64]]:
+        """Recorrência exata das equações modais para cargas lineares entre os instantes
+
+        Os coeficientes de todos os modos vêm de uma única exponencial de matrizes.
+
+        Args:
+            zeta (NDArray[float64]): (n_modes,) razões de amortecimento
+            time_step (float): Passo de tempo
+
+        Returns:
+            tuple[NDArray[float64], ...]: (n_modes, 2, 2) Phi, (n_modes, 2) G0 e (n_modes, 2)
+                G1 de x(t + dt) = Phi x(t) + G0 p(t) + G1 p(t + dt), com x = (q, q')
+        """
+        omega = self.angular_frequencies
+        augmented = np.zeros([omega.size, 4, 4])
+        augmented[:, 0, 1] = 1.0
+        augmented[:, 1, 0] = -omega**2
+        augmented[:, 1, 1] = -2 * zeta * omega
+        augmented[:, 1, 2] = 1.0
+        augmented[:, 2, 3] = 1.0
+        exponential = np.asarray(linalg.expm(augmented * time_step), dtype=float64)
+
+        return (exponential[:, :2, :2],
+                exponential[:, :2, 2] - exponential[:, :2, 3] / time_step,
+                exponential[:, :2, 3] / time_step)
+
+    def frequency_response(self, frequencies: ArrayLike,
+                           load_amplitudes: ArrayLike | None = None,
+                           nodes: list[Node] | None = None,
+                           bars: list[Bar] | None = None,
+                           damping_ratios: ArrayLike = 0.05) -> FrequencyResponse:
+        """Resposta harmônica permanente para uma varredura de frequências
+
+        Para F(t) = Re(F e^(i W t)), as amplitudes modais são
+        q = phi^T F / (w^2 - W^2 + 2 i zeta w W).
+
+        Args:
+            frequencies (ArrayLike): (n_frequencies,) frequências de excitação (Hz)
+            load_amplitudes (ArrayLike | None, optional): (n_loads,) amplitude (pode ser
+                complexa) de cada caso de carga. Defaults to None (1 para todos).
+            nodes (list[Node] | None, optional): Nós gravados. Defaults to None (nenhum).
+            bars (list[Bar] | None, optional): Barras gravadas. Defaults to None (nenhuma).
+            damping_ratios (ArrayLike, optional): Razão de amortecimento de cada modo (ou
+                de todos). Defaults to 0.05.
+
+        Returns:
+            FrequencyResponse: Amplitudes complexas dos deslocamentos e esforços
+
+        Raises:
+            ValueError: Se os modos não foram calculados
+        """
+        if not self.calculated:
+            raise ValueError("The modes have not been calculated.")
+
+        linear = self.linear
+        nodes = nodes if nodes is not None else []
+        bars = bars if bars is not None else []
+        frequencies = np.atleast_1d(np.asarray(frequencies, dtype=float))
+        amplitudes = (np.ones(len(linear.loads)) if load_amplitudes is None
+                      else np.asarray(load_amplitudes, dtype=complex))
+        omega = self.angular_frequencies
+        zeta = np.broadcast_to(np.asarray(damping_ratios, dtype=float), omega.shape)
+        excitation = 2 * np.pi * frequencies
+
+        modal_loads = self.modes_matrix.T @ (linear.forces[linear.free_dofs] @ amplitudes)
+        # (n_modes, n_frequencies) modal amplitudes
+        q = modal_loads[:, None] / (omega[:, None]**2 - excitation[None, :]**2
+                                    + 2j * (zeta * omega)[:, None] * excitation[None, :])
+        displacements, bars_forces = self.modal_recovery(
+            nodes, bars, q[np.newaxis], np.broadcast_to(amplitudes, (q.shape[1], amplitudes.size)))
+
+        return FrequencyResponse(frequencies, [node.name for node in nodes], displacements[0],
+                                 [bar.name for bar in bars],
+                                 np.asarray(bars_forces, dtype=np.complex128))
+
+    @staticmethod
+    def cqc_correlation(angular_frequencies: ArrayLike,
+                        damping_ratios: ArrayLike) -> NDArray[float64]:
+        """Coeficientes de correlação modal da combinação CQC (Der Kiureghian)
+
+        Args:
+            angular_frequencies (ArrayLike): (n_modes,) frequências angulares (rad/s)
+            damping_ratios (ArrayLike): (n_modes,) razões de amortecimento
+
+        Returns:
+            NDArray[float64]: (n_modes, n_modes) matriz de correlação
+        """
+        omega = np.asarray(angular_frequencies, dtype=float)
+        zeta = np.broadcast_to(np.asarray(damping_ratios, dtype=float), omega.shape)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r = omega[None, :] / omega[:, None]
+        zeta_i = zeta[:, None]
+        zeta_j = zeta[None, :]
+
+        numerator = 8 * np.sqrt(zeta_i * zeta_j) * (zeta_i + r * zeta_j) * r**1.5
+        denominator = ((1 - r**2)**2 + 4 * zeta_i * zeta_j * r * (1 + r**2)
+                       + 4 * (zeta_i**2 + zeta_j**2) * r**2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlation = numerator / denominator
+
+        correlation[~np.isfinite(correlation)] = 0.0
+        np.fill_diagonal(correlation, 1.0)
+        return correlation
+
+    def modal_peaks(self, spectrum: tuple[ArrayLike, ArrayLike],
+                    direction: int | ArrayLike = 0) -> NDArray[float64]:
+        """Deslocamentos modais máximos q = gamma Sa / w^2 para um espectro de resposta
+
+        Args:
+            spectrum (tuple[ArrayLike, ArrayLike]): Períodos (s), em ordem crescente, e
+                acelerações espectrais Sa de cada período
+            direction (int | ArrayLike, optional): Direção da excitação: índice (0 a 5, veja
+                `participation_factors`) ou vetor com as componentes de cada direção.
+                Defaults to 0 (x).
+
+        Returns:
+            NDArray[float64]: (n_modes,) deslocamentos modais, com sinal
+        """
+        values = np.asarray(direction)
+        weights = np.zeros(6)
+        if values.ndim == 0:
+            weights[int(values)] = 1.0
+        else:
+            values = values.astype(float).ravel()
+            weights[:values.size] = values
+
+        omega = self.angular_frequencies
+        accelerations = np.interp(self.periods, np.asarray(spectrum[0], dtype=float),
+                                  np.asarray(spectrum[1], dtype=float))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(omega > 0, (self.participation_factors @ weights) * accelerations
+                            / omega**2, 0.0)
+
+    def modal_peak_results(self, spectrum: tuple[ArrayLike, ArrayLike],
+                           direction: int | ArrayLike = 0) -> Results:
+        """Respostas máximas de cada modo para um espectro de resposta
+
+        As reações são K u - w^2 M u (as forças de inércia são as cargas do modo).
+
+        Args:
+            spectrum (tuple[ArrayLike, ArrayLike]): Períodos (s), em ordem crescente, e
+                acelerações espectrais Sa de cada período
+            direction (int | ArrayLike, optional): Direção da excitação, veja `modal_peaks`.
+                Defaults to 0 (x).
+
+        Returns:
+            Results: Resultados com um caso por modo ('Mode 1', 'Mode 2', ...), com sinal
+
+        Raises:
+            ValueError: Se os modos não foram calculados
+        """
+        if not self.calculated:
+            raise ValueError("The modes have not been calculated.")
+
+        linear = self.linear
+        displacements = np.zeros([linear.matrix_order, self.eigenvalues.size])
+        displacements[linear.free_dofs] = self.modes_matrix * self.modal_peaks(spectrum,
+                                                                               direction)
+        bars_forces = elements.end_forces(
+            linear.element_kl, linear.element_r,
+            displacements[linear.numbering.spread_vectors]).transpose(2, 0, 1)
+
+        return linear.solution_results(
+            [f'Mode {index + 1}' for index in range(self.eigenvalues.size)], displacements,
+            np.asarray(linear.kg @ displacements)
+            - np.asarray(self.mg @ displacements) * self.angular_frequencies**2, bars_forces)
+
+    def response_spectrum(self, spectrum: tuple[ArrayLike, ArrayLike],
+                          direction: int | ArrayLike = 0,
+                          method: Literal['SRSS', 'CQC'] = 'CQC',
+                          damping_ratios: ArrayLike = 0.05,
+                          name: str = 'Spectrum') -> Results:
+        """Análise por espectro de resposta
+
+        SRSS é sqrt(sum(r_i^2)) e CQC é sqrt(r^T rho r), aplicadas em todos os resultados
+        de uma vez.
+
+        Args:
+            spectrum (tuple[ArrayLike, ArrayLike]): Períodos (s), em ordem crescente, e
+                acelerações espectrais Sa de cada período
+            direction (int | ArrayLike, optional): Direção da excitação, veja `modal_peaks`.
+                Defaults to 0 (x).
+            method (Literal['SRSS', 'CQC'], optional): Combinação modal. Defaults to 'CQC'.
+            damping_ratios (ArrayLike, optional): Razão de amortecimento de cada modo (ou
+                de todos), usada na CQC. Defaults to 0.05.
+            name (str, optional): Nome do caso nos resultados. Defaults to 'Spectrum'.
+
+        Returns:
+            Results: Resultados (positivos) com um único caso, `name`
+        """
+        modal = self.modal_peak_results(spectrum, direction)
+
+        if method == 'SRSS':
+            correlation = np.eye(self.eigenvalues.size)
+        else:
+            correlation = self.cqc_correlation(self.angular_frequencies, damping_ratios)
+
+        def combine(values: NDArray[float64]) -> NDArray[float64]:
+            flat = values.reshape(values.shape[0], -1)
+            squared = np.einsum('iq,ij,jq->q', flat, correlation, flat, optimize=True)
+            return np.sqrt(np.clip(squared, 0.0, None)).reshape((1,) + values.shape[1:])
+
+        return Results([name], modal.node_names, modal.bar_names,
+                       combine(modal.displacements),
+                       combine(modal.reactions),
+                       combine(modal.bars_forces))
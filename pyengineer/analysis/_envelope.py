@@ -0,0 +1,83 @@
+"""Envoltórias de resultados calculadas por blocos de combinações"""
+import numpy as np
+from numpy.typing import NDArray
+from numpy import float64
+
+
+class Extremes:
+    """Máximos e mínimos acumulados de um array de resultados e a combinação que governa"""
+    def __init__(self, shape: tuple[int, ...]):
+        """Construtor
+
+        Args:
+            shape (tuple[int, ...]): Forma dos resultados de uma combinação
+        """
+        self.maximum: NDArray[float64] = np.full(shape, -np.inf)
+        self.minimum: NDArray[float64] = np.full(shape, np.inf)
+        # Índice da combinação de cada máximo e mínimo (-1 enquanto vazio)
+        self.arg_maximum: NDArray[np.int64] = np.full(shape, -1, dtype=np.int64)
+        self.arg_minimum: NDArray[np.int64] = np.full(shape, -1, dtype=np.int64)
+
+    def update(self, values: NDArray[float64], offset: int) -> None:
+        """Acumula um bloco de combinações nos extremos
+
+        Args:
+            values (NDArray[float64]): (n_chunk, ...) resultados de combinações consecutivas
+            offset (int): Índice da primeira combinação do bloco
+        """
+        if values.shape[0] == 0:
+            return
+
+        arg = np.argmax(values, axis=0)
+        chunk_max = np.take_along_axis(values, arg[np.newaxis], axis=0)[0]
+        greater = chunk_max > self.maximum
+        self.maximum[greater] = chunk_max[greater]
+        self.arg_maximum[greater] = arg[greater] + offset
+
+        arg = np.argmin(values, axis=0)
+        chunk_min = np.take_along_axis(values, arg[np.newaxis], axis=0)[0]
+        smaller = chunk_min < self.minimum
+        self.minimum[smaller] = chunk_min[smaller]
+        self.arg_minimum[smaller] = arg[smaller] + offset
+
+
+class Envelope:
+    """Envoltória de deslocamentos, reações e esforços nas barras de várias combinações
+
+    Guarda só o máximo, o mínimo e a combinação que governa cada valor: a memória não
+    depende do número de combinações.
+    """
+    def __init__(self,
+                 combination_names: list[str],
+                 node_names: list[str],
+                 bar_names: list[str]):
+        """Construtor
+
+        Args:
+            combination_names (list[str]): Nomes das combinações (índices de arg_*)
+            node_names (list[str]): Nomes dos nós
+            bar_names (list[str]): Nomes das barras
+        """
+        self.combination_names = list(combination_names)
+        self.node_names = list(node_names)
+        self.bar_names = list(bar_names)
+        self.displacements = Extremes((len(self.node_names), 6))
+        self.reactions = Extremes((len(self.node_names), 6))
+        self.bars_forces = Extremes((len(self.bar_names), 12))
+
+    def update(self,
+               displacements: NDArray[float64],
+               reactions: NDArray[float64],
+               bars_forces: NDArray[float64],
+               offset: int) -> None:
+        """Acumula os resultados de um bloco de combinações
+
+        Args:
+            displacements (NDArray[float64]): (n_chunk, n_nodes, 6) deslocamentos
+            reactions (NDArray[float64]): (n_chunk, n_nodes, 6) reações
+            bars_forces (NDArray[float64]): (n_chunk, n_bars, 12) esforços nas barras
+            offset (int): Índice da primeira combinação do bloco
+        """
+        self.displacements.update(displacements, offset)
+        self.reactions.update(reactions, offset)
+        self.bars_forces.update(bars_forces, offset)
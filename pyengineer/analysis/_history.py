@@ -0,0 +1,78 @@
+"""Histórico no tempo de nós e barras escolhidos"""
+import numpy as np
+from numpy.typing import NDArray
+from numpy import float64
+
+
+class TimeHistory:
+    """Resposta no tempo gravada apenas para os nós e barras escolhidos
+
+    Os arrays são indexados por (instante, nó, componente) e (instante, barra, componente).
+    """
+    def __init__(self,
+                 time: NDArray[float64],
+                 node_names: list[str],
+                 states: NDArray[float64],
+                 bar_names: list[str] | None = None,
+                 bars_forces: NDArray[float64] | None = None):
+        """Construtor
+
+        Args:
+            time (NDArray[float64]): (n_times,) instantes
+            node_names (list[str]): Nomes dos nós gravados
+            states (NDArray[float64]): (3, n_times, n_nodes, 6) deslocamentos, velocidades e
+                acelerações (relativas) dos nós
+            bar_names (list[str] | None, optional): Nomes das barras gravadas.
+                Defaults to None.
+            bars_forces (NDArray[float64] | None, optional): (n_times, n_bars, 12) esforços
+                nas barras gravadas. Defaults to None.
+        """
+        self.time = time
+        self.node_names = list(node_names)
+        self.displacements = states[0]
+        self.velocities = states[1]
+        self.accelerations = states[2]
+        self.bar_names = list(bar_names) if bar_names is not None else []
+        self.bars_forces = (bars_forces if bars_forces is not None
+                            else np.zeros([time.size, 0, 12]))
+
+
+class FrequencyResponse:
+    """Amplitudes complexas da resposta harmônica para várias frequências de excitação
+
+    Os arrays são indexados por (frequência, nó, componente) e (frequência, barra,
+    componente). A resposta em cada frequência é Re(valor * e^(i W t)).
+    """
+    def __init__(self,
+                 frequencies: NDArray[float64],
+                 node_names: list[str],
+                 displacements: NDArray[np.complex128],
+                 bar_names: list[str] | None = None,
+                 bars_forces: NDArray[np.complex128] | None = None):
+        """Construtor
+
+        Args:
+            frequencies (NDArray[float64]): (n_frequencies,) frequências de excitação (Hz)
+            node_names (list[str]): Nomes dos nós gravados
+            displacements (NDArray[np.complex128]): (n_frequencies, n_nodes, 6) deslocamentos
+            bar_names (list[str] | None, optional): Nomes das barras gravadas.
+                Defaults to None.
+            bars_forces (NDArray[np.complex128] | None, optional): (n_frequencies, n_bars, 12)
+                esforços nas barras gravadas. Defaults to None.
+        """
+        self.frequencies = frequencies
+        self.node_names = list(node_names)
+        self.displacements = displacements
+        self.bar_names = list(bar_names) if bar_names is not None else []
+        self.bars_forces = (bars_forces if bars_forces is not None
+                            else np.zeros([frequencies.size, 0, 12], dtype=complex))
+
+    @property
+    def amplitudes(self) -> NDArray[float64]:
+        """Amplitudes (módulos) dos deslocamentos"""
+        return np.abs(self.displacements)
+
+    @property
+    def phases(self) -> NDArray[float64]:
+        """Ângulos de fase dos deslocamentos (rad)"""
+        return np.angle(self.displacements)
@@ -1,17 +1,48 @@
 """Faz a análise linear da estrutura"""
+from typing import Literal, TypedDict, Unpack
+
 import numpy as np
 from numpy.typing import NDArray
 from numpy import float64
+from scipy import sparse
 
 from ..objects import Node
 from ..objects import Bar
 from ..objects import Load
 from ..objects import Support
+from ..objects import Section
+from ..objects import Material
+from ..types import ReleasesType
+from ..functions import elements
+
+from ._assembly import assemble, add_in_place
+from ._cache import ElementCache
+from ._numbering import DofNumbering
+from ._operator import ElementOperator
+from ._results import Results
+from ._envelope import Envelope
+from ._solvers import Factorization, BandedFactorization, ConjugateGradient, LowRankUpdate
+from ._solvers import JacobiPreconditioner, BlockJacobiPreconditioner
+
+class ILinearOptions(TypedDict, total=False):
+    """Opções da análise linear"""
+    use_sparse: bool
+    supports_method: Literal['partition', 'penalty']
+    cache_size: int
+    renumber: bool
+    solver: Literal['direct', 'banded', 'cg']
+    preconditioner: Literal['jacobi', 'block_jacobi']
+    tolerance: float
+    max_iterations: int | None
+    matrix_free: bool
+    max_update_rank: int
+
 
 class Linear:
     """Análise linear"""
     def __init__(self, nodes: list[Node], bars: list[Bar],
-                 loads: list[Load], supports: Support, calculate: bool = True):
+                 loads: list[Load], supports: Support, calculate: bool = True,
+                 **options: Unpack[ILinearOptions]):
         """Construtor
 
         Args:
@@ -19,157 +50,762 @@ class Linear:
             bars (list[Bar]): Barras
             loads (list[Load]): Casos de carga
             supports (Support): Apoios
+            calculate (bool, optional): Calcula a estrutura ao criar o objeto. Defaults to True.
+            **options (ILinearOptions):
+                use_sparse: usa matrizes esparsas (CSR); a matriz densa só deve ser usada em
+                modelos pequenos. Padrão True.
+                supports_method: como os apoios são aplicados. 'partition' elimina os graus de
+                liberdade restringidos e resolve apenas o sistema livre (K_ff); 'penalty' soma
+                um número grande na diagonal. Padrão 'partition'.
+                cache_size: número máximo de matrizes locais guardadas no cache de elementos
+                (barras idênticas compartilham a mesma matriz). Padrão 4096.
+                renumber: renumera os graus de liberdade com Reverse Cuthill-McKee para
+                diminuir a largura de banda; os resultados continuam na ordem dos nós.
+                Padrão False.
+                solver: 'direct' usa a fatoração esparsa (ou densa); 'banded' usa Cholesky em
+                banda, indicado junto com `renumber`; 'cg' usa gradientes conjugados
+                precondicionados, sem fatoração, para modelos muito grandes. Padrão 'direct'.
+                preconditioner: precondicionador do solver 'cg', 'jacobi' (diagonal) ou
+                'block_jacobi' (blocos nodais 6x6). Padrão 'block_jacobi'.
+                tolerance: resíduo relativo do solver 'cg'. Padrão 1e-10.
+                max_iterations: limite de iterações do solver 'cg'. Padrão None (10 vezes a
+                ordem do sistema).
+                matrix_free: não monta a matriz de rigidez global; kg e kg_solution passam a
+                ser operadores (ElementOperator) que aplicam as matrizes dos elementos. Exige o
+                solver 'cg'. Padrão False.
+                max_update_rank: número máximo de graus de liberdade alterados por
+                `modify_bar`, `add_bar` e `remove_bar` corrigidos com Sherman-Morrison-Woodbury
+                sobre a fatoração existente; acima disso a matriz é fatorada novamente.
+                Padrão 120.
         """
         self.nodes = nodes
-        self.bars = bars
+        self.bars = list(bars) # Cópia: add_bar e remove_bar não alteram a lista recebida
         self.loads = loads
         self.supports = supports
         self.matrix_order = 6 * len(nodes)
+        self.use_sparse = options.get('use_sparse', True)
+        self.supports_method = options.get('supports_method', 'partition')
+        self.renumber = options.get('renumber', False)
+        self.solver_type = options.get('solver', 'direct')
+        self.matrix_free = options.get('matrix_free', False)
+        if self.matrix_free and self.solver_type != 'cg':
+            raise ValueError("The matrix-free analysis requires solver='cg'.")
+        self.max_update_rank = options.get('max_update_rank', 120)
+        self.preconditioner = options.get('preconditioner', 'block_jacobi')
+        self.tolerance = options.get('tolerance', 1e-10)
+        self.max_iterations = options.get('max_iterations', None)
         self.calculated = False
         self.displacements: dict[Load, NDArray[float64]] = {}
         self.reactions: dict[Load, NDArray[float64]] = {}
-        self.kg: NDArray[float64] = np.array([])
-        self.kg_solution: NDArray[float64] = np.array([])
+        self.kg: sparse.csr_matrix | NDArray[float64] | ElementOperator = np.array([])
+        self.kg_solution: sparse.csr_matrix | NDArray[float64] | ElementOperator = np.array([])
         self.forces_vector: dict[Load,  NDArray[float64] ] = {}
+        self.forces: NDArray[float64] = np.array([]) # (n_dof, n_loads) vetores de forças
+        # (n_loads, n_bars, 12) forças de engastamento perfeito em coordenadas globais
+        self.fixed_end_forces: NDArray[float64] = np.zeros([0, 0, 12])
+        # (n_dof, n_loads) deslocamentos e (n_loads, n_bars, 12) esforços nas barras
+        self.displacements_matrix: NDArray[float64] = np.array([])
+        self.bars_forces: NDArray[float64] = np.zeros([0, 0, 12])
+        self.results: Results | None = None # Resultados em arrays contíguos
+        # Combinações: nome -> {nome do caso de carga: fator} e seus resultados
+        self.combinations: dict[str, dict[str, float]] = {}
+        self.combinations_results: Results | None = None
+        # Matrizes de todas as barras: locais, globais, rotações e condensação das liberações
+        self.element_kl: NDArray[float64] = np.zeros([0, 12, 12])
+        self.element_klg: NDArray[float64] = np.zeros([0, 12, 12])
+        self.element_r: NDArray[float64] = np.zeros([0, 3, 3])
+        self.element_operators: NDArray[float64] = np.zeros([0, 12, 12])
+        # Numeração dos graus de liberdade. Vetores e matrizes globais (kg, forces,
+        # displacements_matrix) usam esta numeração; os resultados seguem a ordem dos nós.
+        # Vazia até `calculate_structure`, que cria a numeração (e o RCM) uma única vez
+        self.numbering = DofNumbering([], [])
+        # Matrizes locais de barras idênticas
+        self.element_cache = ElementCache(options.get('cache_size', 4096))
+        # Solver de kg_solution. Com 'cg', solver.iterations e solver.residuals trazem as
+        # iterações e o resíduo relativo de cada caso de carga. Depois de alterar barras é
+        # um LowRankUpdate sobre a fatoração original
+        self.solver: (Factorization | BandedFactorization | ConjugateGradient | LowRankUpdate
+                      | None) = None
+        # Graus de liberdade que fazem parte de kg_solution e os restringidos
+        self.free_dofs: NDArray[np.int64] = np.array([], dtype=np.int64)
+        self.restrained_dofs: NDArray[np.int64] = np.array([], dtype=np.int64)
 
         if calculate:
             self.calculate_structure()
 
     def calculate_structure(self) -> None:
         """Realiza a calculo"""
-        self.displacements = {}
-        self.reactions: dict[Load, NDArray[float64]] = {}
+        self.numbering = DofNumbering(self.nodes, self.bars, self.renumber)
+        self.matrix_order = self.numbering.order
         self.kg_solution = self.calculate_kg_solution()
         self.forces_vector = self.calculate_forces_vector()
 
-        for load in self.loads:
-            # Calculate displacements
-            self.displacements[load] = np.linalg.inv(self.kg_solution) @ self.forces_vector[load]
-
-            # Calculate reactions
-            self.reactions[load] = self.kg @ self.displacements[load] - self.forces_vector[load]
+        # Fatora uma vez e resolve todos os casos de carga juntos
+        self.solver = self.create_solver(self.kg_solution)
+        self.solve_loads()
 
+    def solve_loads(self) -> None:
+        """Resolve todos os casos de carga com o solver atual e calcula as reações, os esforços
+        nas barras e os resultados
+        """
+        reactions = self.solve_displacements()
         self.calculate_extremes_bars_forces()
+        displacements = self.displacements_matrix
+
+        # Resultados por (caso, nó, componente); os dicionários guardam views deles
+        self.displacements = {}
+        self.reactions = {}
+        self.results = self.solution_results([load.name for load in self.loads],
+                                             displacements, reactions, self.bars_forces)
+        for index, load in enumerate(self.loads):
+            self.displacements[load] = self.results.displacements[index].reshape(-1)
+            self.reactions[load] = self.results.reactions[index].reshape(-1)
+
+        if self.combinations:
+            self.calculate_combinations()
 
         self.calculated = True
 
+    def solution_results(self, names: list[str], displacements: NDArray[float64],
+                         reactions: NDArray[float64], bars_forces: NDArray[float64]) -> Results:
+        """Cria os resultados a partir de vetores na numeração dos graus de liberdade
+
+        Args:
+            names (list[str]): Nomes das colunas (casos de carga, modos ou posições)
+            displacements (NDArray[float64]): (n_dof, n) deslocamentos
+            reactions (NDArray[float64]): (n_dof, n) reações
+            bars_forces (NDArray[float64]): (n, n_bars, 12) esforços nas barras
+
+        Returns:
+            Results: Resultados na ordem dos nós e das barras
+        """
+        node_dofs = self.numbering.node_dofs
+        return Results(names, [node.name for node in self.nodes], [bar.name for bar in self.bars],
+                       displacements[node_dofs].transpose(2, 0, 1),
+                       reactions[node_dofs].transpose(2, 0, 1), bars_forces)
+
+    def solve_displacements(self) -> NDArray[float64]:
+        """Resolve todos os casos de carga e guarda os deslocamentos em `displacements_matrix`
+
+        Returns:
+            NDArray[float64]: (n_dof, n_loads) reações
+
+        Raises:
+            ValueError: Se a estrutura ainda não foi calculada
+        """
+        if self.solver is None:
+            raise ValueError("The analysis has not been calculated.")
+
+        forces = self.forces
+        displacements = np.zeros([self.matrix_order, len(self.loads)])
+        if isinstance(self.solver, ConjugateGradient):
+            # Avisa com os nomes dos casos de carga que não convergiram
+            displacements[self.free_dofs] = self.solver.solve(
+                forces[self.free_dofs], names=[load.name for load in self.loads])
+        else:
+            displacements[self.free_dofs] = self.solver.solve(forces[self.free_dofs])
+        self.displacements_matrix = displacements
+
+        # Deslocamentos restringidos são nulos: nos apoios é K_rf @ u_f - f_r
+        return np.asarray(self.kg @ displacements) - forces
+
+    def update_results(self) -> None:
+        """Resolve novamente e atualiza os resultados no lugar, sem recriá-los
+
+        Só vale quando as barras e os casos de carga são os mesmos: os dicionários de
+        deslocamentos, reações e esforços continuam apontando para os mesmos arrays.
+        """
+        if self.results is None:
+            raise ValueError("The analysis has not been calculated.")
+
+        reactions = self.solve_displacements()
+        self.recover_bars_forces()
+
+        node_dofs = self.numbering.node_dofs
+        self.results.displacements[...] = self.displacements_matrix[node_dofs].transpose(2, 0, 1)
+        self.results.reactions[...] = reactions[node_dofs].transpose(2, 0, 1)
+        self.results.bars_forces[...] = self.bars_forces
+
+        if self.combinations:
+            self.calculate_combinations()
+
+    def add_combination(self, name: str, factors: dict[str, float]) -> None:
+        """Adiciona (ou substitui) uma combinação de casos de carga
+
+        Args:
+            name (str): Nome da combinação
+            factors (dict[str, float]): Fator de cada caso de carga, pelo nome do caso.
+                Casos que não aparecem têm fator zero.
+
+        Raises:
+            ValueError: Se algum caso de carga não existir
+        """
+        load_names = {load.name for load in self.loads}
+        for load_name in factors:
+            if load_name not in load_names:
+                raise ValueError(f"The load case '{load_name}' of the combination '{name}' "
+                                 "does not exist.")
+
+        self.combinations[name] = dict(factors)
+
+        if self.results is None:
+            return
+
+        # Calcula só a combinação nova (ou substituída)
+        combination = self.results.combine(self.combination_coefficients(factors), [name])
+        current = self.combinations_results
+        if current is None:
+            self.combinations_results = combination
+        elif name in current.load_index:
+            index = current.load_index[name]
+            current.displacements[index] = combination.displacements[0]
+            current.reactions[index] = combination.reactions[0]
+            current.bars_forces[index] = combination.bars_forces[0]
+        else:
+            self.combinations_results = Results(
+                current.load_names + [name], current.node_names, current.bar_names,
+                np.concatenate((current.displacements, combination.displacements)),
+                np.concatenate((current.reactions, combination.reactions)),
+                np.concatenate((current.bars_forces, combination.bars_forces)))
+
+    def combination_coefficients(self, factors: dict[str, float]) -> NDArray[float64]:
+        """Coeficientes de uma combinação
+
+        Args:
+            factors (dict[str, float]): Fator de cada caso de carga, pelo nome do caso
+
+        Returns:
+            NDArray[float64]: (n_loads,) fator de cada caso de carga
+        """
+        load_index: dict[str, int] = {}
+        for index, load in enumerate(self.loads):
+            load_index.setdefault(load.name, index)
+
+        coefficients = np.zeros(len(self.loads))
+        for load_name, factor in factors.items():
+            coefficients[load_index[load_name]] += factor
+
+        return coefficients
+
+    def combination_matrix(self) -> NDArray[float64]:
+        """Matriz de coeficientes das combinações
+
+        Returns:
+            NDArray[float64]: (n_combinations, n_loads) fator de cada caso em cada combinação
+        """
+        coefficients = np.zeros([len(self.combinations), len(self.loads)])
+        for row, factors in enumerate(self.combinations.values()):
+            coefficients[row] = self.combination_coefficients(factors)
+
+        return coefficients
+
+    def calculate_envelope(self, chunk_size: int = 256) -> Envelope:
+        """Calcula a envoltória das combinações sem guardar os resultados de cada uma
+
+        Args:
+            chunk_size (int, optional): Combinações processadas por bloco. Defaults to 256.
+
+        Returns:
+            Envelope: Máximos, mínimos e combinação que governa cada resultado
+
+        Raises:
+            ValueError: Se a estrutura ainda não foi calculada
+        """
+        if self.results is None:
+            raise ValueError("The analysis has not been calculated.")
+
+        return self.results.envelope(self.combination_matrix(), list(self.combinations),
+                                     chunk_size)
+
+    def pattern_envelope(self, pattern_loads: list[Load],
+                         permanent: dict[str, float] | None = None,
+                         factor: float = 1.0) -> Envelope:
+        """Envoltória de todos os padrões de carregamento de alguns casos de carga
+
+        Cada caso de `pattern_loads` é a carga de um vão ou painel, resolvido uma vez como um
+        caso de carga normal. Os 2^n padrões não são resolvidos (`Results.pattern_envelope`).
+
+        Args:
+            pattern_loads (list[Load]): Casos de carga de cada vão/painel (da análise)
+            permanent (dict[str, float] | None, optional): Fatores dos casos sempre
+                presentes, pelo nome do caso. Defaults to None.
+            factor (float, optional): Fator dos casos alternados. Defaults to 1.0.
+
+        Returns:
+            Envelope: Máximos e mínimos de cada resultado
+
+        Raises:
+            ValueError: Se a estrutura ainda não foi calculada
+        """
+        if self.results is None:
+            raise ValueError("The analysis has not been calculated.")
+
+        coefficients = None
+        if permanent is not None:
+            coefficients = np.zeros(len(self.loads))
+            for load_name, load_factor in permanent.items():
+                coefficients[self.results.load_index[load_name]] += load_factor
+
+        return self.results.pattern_envelope([load.name for load in pattern_loads],
+                                             coefficients, factor)
+
+    def calculate_combinations(self) -> Results:
+        """Calcula os resultados de todas as combinações por superposição dos casos de carga
+
+        Returns:
+            Results: Resultados das combinações (também em `combinations_results`)
+
+        Raises:
+            ValueError: Se a estrutura ainda não foi calculada
+        """
+        if self.results is None:
+            raise ValueError("The analysis has not been calculated.")
+
+        self.combinations_results = self.results.combine(self.combination_matrix(),
+                                                         list(self.combinations))
+        return self.combinations_results
+
+    def modify_bar(self, bar: Bar,
+                   section: Section | None = None,
+                   material: Material | None = None,
+                   releases: dict[ReleasesType, bool] | None = None) -> None:
+        """Troca a seção, o material ou as liberações de uma barra e atualiza os resultados
+
+        Só a contribuição da barra é recalculada; a fatoração existente é corrigida (ver
+        `max_update_rank`) e os resultados são atualizados no lugar.
+
+        Args:
+            bar (Bar): Barra da análise
+            section (Section | None, optional): Nova seção. Defaults to None.
+            material (Material | None, optional): Novo material. Defaults to None.
+            releases (dict[ReleasesType, bool] | None, optional): Liberações alteradas.
+                Defaults to None.
+        """
+        index = self.numbering.bar_index[bar]
+        old_klg = self.element_klg[index].copy()
+        self.remove_bar_loads(index)
+
+        if section is not None:
+            bar.section = section
+        if material is not None:
+            bar.material = material
+        if releases is not None:
+            bar.releases.update(releases)
+
+        kl, klg, r, operators = self.calculate_elements([bar])
+        self.element_kl[index] = kl[0]
+        self.element_klg[index] = klg[0]
+        self.element_r[index] = r[0]
+        self.element_operators[index] = operators[0]
+        self.add_bar_loads(bar)
+
+        self.update_structure(self.numbering.spread_vectors[index], klg[0] - old_klg)
+
+    def add_bar(self, bar: Bar) -> None:
+        """Adiciona uma barra entre nós da análise e atualiza os resultados
+
+        Args:
+            bar (Bar): Nova barra
+
+        Raises:
+            ValueError: Se algum nó da barra não fizer parte da análise
+        """
+        if (bar.start_node not in self.numbering.node_index or
+                bar.end_node not in self.numbering.node_index):
+            raise ValueError(f"The nodes of the bar '{bar.name}' are not in the analysis.")
+
+        kl, klg, r, operators = self.calculate_elements([bar])
+        self.bars.append(bar)
+        self.numbering.add_bar(bar)
+        self.element_kl = np.concatenate((self.element_kl, kl))
+        self.element_klg = np.concatenate((self.element_klg, klg))
+        self.element_r = np.concatenate((self.element_r, r))
+        self.element_operators = np.concatenate((self.element_operators, operators))
+        self.fixed_end_forces = np.concatenate(
+            (self.fixed_end_forces, np.zeros([len(self.loads), 1, 12])), axis=1)
+        self.add_bar_loads(bar)
+
+        self.update_structure(self.numbering.spread_vectors[-1], klg[0])
+
+    def remove_bar(self, bar: Bar) -> None:
+        """Remove uma barra da análise e atualiza os resultados
+
+        As cargas aplicadas na barra deixam de ser consideradas.
+
+        Args:
+            bar (Bar): Barra da análise
+        """
+        index = self.numbering.bar_index[bar]
+        spread_vector = self.numbering.spread_vectors[index]
+        old_klg = self.element_klg[index]
+        self.remove_bar_loads(index)
+
+        self.bars.pop(index)
+        self.numbering.remove_bar(bar)
+        self.element_kl = np.delete(self.element_kl, index, axis=0)
+        self.element_klg = np.delete(self.element_klg, index, axis=0)
+        self.element_r = np.delete(self.element_r, index, axis=0)
+        self.element_operators = np.delete(self.element_operators, index, axis=0)
+        self.fixed_end_forces = np.delete(self.fixed_end_forces, index, axis=1)
+
+        self.update_structure(spread_vector, -old_klg)
+
+    def add_bar_loads(self, bar: Bar) -> None:
+        """Soma as forças de engastamento perfeito de uma barra em `forces`
+
+        Args:
+            bar (Bar): Barra da análise
+        """
+        bar_index, load_index, fixed_end = self.calculate_bars_loads([bar])
+        np.add.at(self.fixed_end_forces, (load_index, bar_index), fixed_end)
+        np.add.at(self.forces, (self.numbering.spread_vectors[bar_index], load_index[:, None]),
+                  fixed_end)
+
+    def remove_bar_loads(self, index: int) -> None:
+        """Tira as forças de engastamento perfeito de uma barra de `forces`
+
+        Args:
+            index (int): Índice da barra
+        """
+        self.forces[self.numbering.spread_vectors[index]] -= self.fixed_end_forces[:, index].T
+        self.fixed_end_forces[:, index] = 0.0
+
+    def update_structure(self, spread_vector: NDArray[np.int64],
+                         change: NDArray[float64]) -> None:
+        """Soma a alteração de uma barra nas matrizes de rigidez e resolve novamente
+
+        Args:
+            spread_vector (NDArray[np.int64]): (12,) graus de liberdade da barra
+            change (NDArray[float64]): (12, 12) alteração da matriz global da barra
+        """
+        # Linhas de kg_solution dos graus de liberdade da barra (restringidos ficam de fora)
+        rows = np.minimum(np.searchsorted(self.free_dofs, spread_vector), self.free_dofs.size - 1)
+        free = self.free_dofs[rows] == spread_vector
+        dofs = rows[free]
+        change_free = change[np.ix_(free, free)]
+
+        self.update_matrices(spread_vector, change, dofs, change_free)
+        self.update_solver(dofs, change_free)
+        self.forces_vector = self.loads_forces_vectors()
+
+        if self.bars_forces.shape[1] == len(self.bars):
+            self.update_results()
+        else:
+            self.solve_loads() # O número de barras mudou
+
+    def update_matrices(self, spread_vector: NDArray[np.int64], change: NDArray[float64],
+                        dofs: NDArray[np.int64], change_free: NDArray[float64]) -> None:
+        """Soma a alteração de uma barra em `kg` e `kg_solution`, no lugar quando possível
+
+        Args:
+            spread_vector (NDArray[np.int64]): (12,) graus de liberdade da barra
+            change (NDArray[float64]): (12, 12) alteração da matriz global da barra
+            dofs (NDArray[np.int64]): Linhas de kg_solution dos graus de liberdade livres
+            change_free (NDArray[float64]): Alteração nas linhas `dofs`
+        """
+        kg, kg_solution = self.kg, self.kg_solution
+        if isinstance(kg_solution, ElementOperator):
+            # Os operadores aplicam element_klg, que já tem a alteração
+            self.kg = ElementOperator(self.element_klg, self.numbering.spread_vectors,
+                                      self.matrix_order)
+            self.kg_solution = ElementOperator(self.element_klg, self.numbering.spread_vectors,
+                                               self.matrix_order, kg_solution.support_diagonal,
+                                               kg_solution.dofs)
+        elif not isinstance(kg, ElementOperator):
+            # Uma barra nova entre nós que não estavam ligados precisa de posições novas
+            if not add_in_place(kg, spread_vector, change):
+                self.kg = kg + assemble(change[np.newaxis], spread_vector[np.newaxis],
+                                        self.matrix_order, self.use_sparse)
+            if not add_in_place(kg_solution, dofs, change_free):
+                self.kg_solution = sparse.csr_matrix(
+                    kg_solution + assemble(change_free[np.newaxis], dofs[np.newaxis],
+                                           self.free_dofs.size, self.use_sparse))
+
+    def update_solver(self, dofs: NDArray[np.int64], change_free: NDArray[float64]) -> None:
+        """Corrige a fatoração com Sherman-Morrison-Woodbury ou cria o solver de novo
+
+        O solver 'cg' é sempre criado de novo; acima de `max_update_rank` graus de liberdade
+        alterados a matriz é fatorada novamente.
+
+        Args:
+            dofs (NDArray[np.int64]): Linhas de kg_solution alteradas
+            change_free (NDArray[float64]): Alteração nas linhas `dofs`
+        """
+        # Solvers diretos sempre têm a matriz montada ('matrix_free' exige 'cg')
+        if (isinstance(self.solver, ConjugateGradient) or self.solver is None
+                or isinstance(self.kg_solution, ElementOperator)):
+            self.solver = self.create_solver(self.kg_solution)
+            return
+
+        solver = (self.solver if isinstance(self.solver, LowRankUpdate)
+                  else LowRankUpdate(self.solver))
+        solver.matrix = self.kg_solution
+        self.solver = solver
+        if np.setdiff1d(dofs, solver.dofs).size + solver.rank > self.max_update_rank:
+            self.solver = self.create_solver(self.kg_solution)
+        else:
+            solver.update(dofs, change_free)
+
+    def create_solver(self, matrix: sparse.csr_matrix | NDArray[float64] | ElementOperator
+                      ) -> Factorization | BandedFactorization | ConjugateGradient:
+        """Cria o solver do tipo escolhido para a matriz
+
+        Args:
+            matrix (sparse.csr_matrix | NDArray[float64] | ElementOperator): Matriz do sistema
+
+        Returns:
+            Factorization | BandedFactorization | ConjugateGradient: Solver pronto para
+                resolver o sistema
+        """
+        # Um operador (matrix_free) só é resolvido com 'cg'
+        if self.solver_type == 'cg' or isinstance(matrix, ElementOperator):
+            if self.preconditioner == 'jacobi':
+                preconditioner = JacobiPreconditioner.from_matrix(matrix)
+            elif isinstance(matrix, ElementOperator):
+                preconditioner = BlockJacobiPreconditioner(*matrix.block_diagonal())
+            else:
+                preconditioner = BlockJacobiPreconditioner.from_matrix(
+                    matrix, self.solution_node_dofs())
+            return ConjugateGradient(matrix, preconditioner,
+                                     self.tolerance, self.max_iterations)
+
+        if self.solver_type == 'banded':
+            return BandedFactorization(matrix)
+
+        return Factorization(matrix)
+
+    def solution_dofs(self) -> NDArray[np.int64]:
+        """Linha de kg_solution de cada grau de liberdade da estrutura
+
+        Returns:
+            NDArray[np.int64]: (n_dof,) índices, -1 para graus de liberdade restringidos que não
+                fazem parte do sistema
+        """
+        position = np.full(self.matrix_order, -1, dtype=np.int64)
+        position[self.free_dofs] = np.arange(self.free_dofs.size, dtype=np.int64)
+        return position
+
+    def solution_node_dofs(self) -> NDArray[np.int64]:
+        """Linhas de kg_solution dos graus de liberdade de cada nó
+
+        Returns:
+            NDArray[np.int64]: (n_nodes, 6) índices, -1 para graus de liberdade restringidos
+                que não fazem parte do sistema
+        """
+        return self.solution_dofs()[self.numbering.node_dofs]
+
     def calculate_forces_vector(self) -> dict[Load, NDArray[float64]]:
         """Calcula o vetor de forças para cada caso de carga e cria um dicionário
 
         Returns:
-            dict: Vetor de forças
+            dict: Vetor de forças na ordem dos nós
         """
-        forces: dict[Load, NDArray[float64]] = {}
-        for load in self.loads:
-            f_load = np.zeros(self.matrix_order, dtype=float)
+        self.forces = self.calculate_forces_matrix()
 
-            for node in load.nodes_loads:
-                node_position = (self.nodes.index(node) + 1) * 6 - 6
+        return self.loads_forces_vectors()
 
-                for force in load.nodes_loads[node].values():
-                    index = 0
-                    for key in force.keys():
-                        f_load[node_position + index] += force[key]
-                        index += 1
+    def loads_forces_vectors(self) -> dict[Load, NDArray[float64]]:
+        """Vetor de forças de cada caso de carga na ordem dos nós
 
-            for bar in load.bars_loads_pt:
-                bar.calculate_forces_vector(load)
-                spread_vector = self.calculate_spread_vector(bar)
+        Sem renumeração são colunas de `forces`; com renumeração são cópias.
 
-                for i in range(12):
-                    f_load[spread_vector[i]] += bar.vector_loads[i]
+        Returns:
+            dict: Vetor de forças
+        """
+        dofs = self.numbering.node_dofs.ravel()
+        if np.array_equal(dofs, np.arange(dofs.size)):
+            return {load: self.forces[:, index] for index, load in enumerate(self.loads)}
+
+        return {load: self.forces[dofs, index] for index, load in enumerate(self.loads)}
 
-            for bar in load.bars_loads_dist:
-                bar.calculate_forces_vector(load)
-                spread_vector = self.calculate_spread_vector(bar)
+    def calculate_forces_matrix(self) -> NDArray[float64]:
+        """Calcula os vetores de forças de todos os casos de carga de uma vez
 
-                for i in range(12):
-                    f_load[spread_vector[i]] += bar.vector_loads[i]
+        As forças de engastamento de cada caso ficam em `fixed_end_forces`.
 
-            forces[load] = f_load.copy()
+        Returns:
+            NDArray[float64]: (n_dof, n_loads) matriz com o vetor de forças de cada caso
+        """
+        forces = np.zeros([self.matrix_order, len(self.loads)])
+        self.fixed_end_forces = np.zeros([len(self.loads), len(self.bars), 12])
+        keys = ('Fx', 'Fy', 'Fz', 'Mx', 'My', 'Mz')
+
+        # Cargas nos nós ///////////////////////////////////////////////////////////////////////////
+        node_indices: list[int] = []
+        load_indices: list[int] = []
+        values: list[list[float]] = []
+        for load_index, load in enumerate(self.loads):
+            for node, node_loads in load.nodes_loads.items():
+                for force in node_loads.values():
+                    node_indices.append(self.numbering.node_index[node])
+                    load_indices.append(load_index)
+                    values.append([force[key] for key in keys])
+
+        if values:
+            np.add.at(forces,
+                      (self.numbering.node_dofs[node_indices], np.array(load_indices)[:, None]),
+                      np.array(values, dtype=float))
+
+        # Cargas nas barras ////////////////////////////////////////////////////////////////////////
+        bar_index, load_index, fixed_end = self.calculate_bars_loads()
+        np.add.at(self.fixed_end_forces, (load_index, bar_index), fixed_end)
+        np.add.at(forces, (self.numbering.spread_vectors[bar_index], load_index[:, None]),
+                  fixed_end)
 
         return forces
 
-    def calculate_kg(self) -> NDArray[float64]:
+    def calculate_bars_loads(self, bars: list[Bar] | None = None
+                             ) -> tuple[NDArray[np.int64], NDArray[np.int64], NDArray[float64]]:
+        """Calcula as forças de engastamento perfeito das cargas nas barras
+
+        Args:
+            bars (list[Bar] | None, optional): Barras. Defaults to None (todas as barras).
+
+        Returns:
+            tuple[NDArray[np.int64], NDArray[np.int64], NDArray[float64]]: (n,) índices das
+                barras, (n,) índices dos casos de carga e (n, 12) forças em coordenadas globais
+        """
+        bar_indices: list[int] = []
+        load_indices: list[int] = []
+        vectors: list[NDArray[float64]] = [np.zeros([0, 12])]
+        for load_index, load in enumerate(self.loads):
+            if bars is None:
+                loaded = list(dict.fromkeys([*load.bars_loads_pt, *load.bars_loads_dist]))
+            else:
+                loaded = [bar for bar in bars
+                          if bar in load.bars_loads_pt or bar in load.bars_loads_dist]
+
+            for bar in loaded:
+                if bar not in self.numbering.bar_index:
+                    continue # Barra removida da análise
+
+                local_vectors = bar.calculate_local_loads_vectors(load)
+                bar_indices.extend([self.numbering.bar_index[bar]] * local_vectors.shape[0])
+                load_indices.extend([load_index] * local_vectors.shape[0])
+                vectors.append(local_vectors)
+
+        bar_index = np.array(bar_indices, dtype=np.int64)
+        fixed_end = np.concatenate(vectors)
+        if not bar_indices:
+            return bar_index, bar_index.copy(), fixed_end
+
+        # Aplica as liberações e passa para coordenadas globais
+        fixed_end = np.einsum('nij,nj->ni', self.element_operators[bar_index], fixed_end)
+        fixed_end = elements.rotate_vectors(self.element_r[bar_index], fixed_end, transpose=True)
+
+        return bar_index, np.array(load_indices, dtype=np.int64), fixed_end
+
+    def calculate_kg(self) -> sparse.csr_matrix | NDArray[float64] | ElementOperator:
         """ Calcula a matriz de rigidez global
 
         Returns:
-            ndarray: Matriz de rigidez global
+            sparse.csr_matrix | ndarray | ElementOperator: Matriz de rigidez global, ou o
+                operador elemento por elemento se `matrix_free`
         """
-        kg = np.zeros([self.matrix_order, self.matrix_order])
+        (self.element_kl, self.element_klg,
+         self.element_r, self.element_operators) = self.calculate_elements(self.bars)
 
-        for bar in self.bars:
-            spread_vector = self.calculate_spread_vector(bar)
-            bar.calculate_kl()
-            bar.calculate_r()
-            bar.klg = bar.calculate_klg()
+        if self.matrix_free:
+            return ElementOperator(self.element_klg, self.numbering.spread_vectors,
+                                   self.matrix_order)
 
-            line_local = -1 # Índice da linha localmente
-            for line_global in spread_vector:
-                line_local += 1
-                column_local = -1 # Índice da coluna localmente
-                for column_global in spread_vector:
-                    column_local += 1
-                    kg[line_global][column_global] += bar.klg[line_local][column_local]
+        return assemble(self.element_klg, self.numbering.spread_vectors, self.matrix_order,
+                        self.use_sparse)
 
-        return kg
+    def calculate_elements(self, bars: list[Bar]) -> tuple[NDArray[float64], NDArray[float64],
+                                                           NDArray[float64], NDArray[float64]]:
+        """Calcula as matrizes das barras e atribui a cada uma
 
-    def calculate_kg_solution(self) -> NDArray[float64]:
+        Args:
+            bars (list[Bar]): Barras
+
+        Returns:
+            tuple[NDArray[float64], ...]: (n_bars, 12, 12) matrizes locais, (n_bars, 12, 12)
+                matrizes globais, (n_bars, 3, 3) rotações e (n_bars, 12, 12) operadores de
+                condensação das liberações
+        """
+        kl_nr, kl, operators = self.element_cache.get_matrices(bars)
+        r = elements.direction_cosines([bar.start_node.position for bar in bars],
+                                       [bar.end_node.position for bar in bars],
+                                       [bar.rotation for bar in bars],
+                                       [bar.y_up for bar in bars])
+
+        klg = elements.to_global(kl, r)
+
+        for index, bar in enumerate(bars):
+            bar.kl_nr = kl_nr[index]
+            bar.kl = kl[index]
+            bar.releases_operator = operators[index]
+            bar.r = r[index]
+            bar.klg = klg[index]
+
+        return kl, klg, r, operators
+
+    def calculate_kg_solution(self) -> sparse.csr_matrix | NDArray[float64] | ElementOperator:
         """Aplica os apoios na matriz
 
         Returns:
-            ndarray: Matriz de rigidez com os apoios aplicados
+            sparse.csr_matrix | ndarray | ElementOperator: Matriz de rigidez com os apoios
+                aplicados. No método 'partition' é a matriz dos graus de liberdade livres (K_ff).
         """
         self.kg = self.calculate_kg()
-        kg_solution = self.kg.copy()
+
+        return self.apply_supports()
+
+    def apply_supports(self) -> sparse.csr_matrix | NDArray[float64] | ElementOperator:
+        """Aplica os apoios em `kg`
+
+        Returns:
+            sparse.csr_matrix | ndarray | ElementOperator: Matriz de rigidez com os apoios
+                aplicados
+        """
+        diagonal = np.zeros(self.matrix_order)
+        restrained = np.zeros(self.matrix_order, dtype=bool)
 
         for node in self.supports.nodes_support:
             # Índices globais de cada nó
-            node_index = self.nodes.index(node)
+            node_dofs = self.numbering.node_dofs[self.numbering.node_index[node]]
 
-            support_indices: list[int] = []
-            spring_index = {}
-            index = 0
-            for support in self.supports.nodes_support[node].values():
+            for index, support in enumerate(self.supports.nodes_support[node].values()):
                 if support:
+                    # Se tiver mola, soma apenas a mola
                     if isinstance(support, float):
-                        spring_index[6 * (node_index + 1) - (6 - index)] = support
-                    support_indices.append(6 * (node_index + 1) - (6 - index))
+                        diagonal[node_dofs[index]] += support
+                    else:
+                        restrained[node_dofs[index]] = True
+
+        if self.supports_method == 'penalty':
+            # Colocar número grande na diagonal
+            diagonal[restrained] += 1e25
+            self.free_dofs = np.arange(self.matrix_order)
+        else:
+            self.free_dofs = np.flatnonzero(~restrained)
+        self.restrained_dofs = np.flatnonzero(restrained)
 
-                index += 1
+        if self.matrix_free or isinstance(self.kg, ElementOperator):
+            return ElementOperator(self.element_klg, self.numbering.spread_vectors,
+                                   self.matrix_order, diagonal, self.free_dofs)
 
+        if sparse.issparse(self.kg):
+            kg_solution = sparse.csr_matrix(self.kg + sparse.diags(diagonal))
+        else:
+            kg_solution = np.asarray(self.kg) + np.diag(diagonal)
 
-            # Colocar número grande na diagonal
-            for i in support_indices:
-                for j in support_indices:
-                    if i == j:
-                        # Se tiver mola, soma apenas a mola
-                        if i in spring_index:
-                            kg_solution[i][j] += spring_index[i]
-                        else:
-                            kg_solution[i][j] += 1e25
-
-        return kg_solution
-
-    def calculate_spread_vector(self, bar: Bar) -> list[int]:
+        if self.supports_method == 'penalty':
+            return kg_solution
+
+        return kg_solution[self.free_dofs][:, self.free_dofs]
+
+    def calculate_spread_vector(self, bar: Bar) -> NDArray[np.int64]:
         """Calcula o vetor de espalhamento
 
         Args:
             bar (Bar): Barra
 
         Returns:
-            list[int]: Vetor de espalhamento
+            NDArray[np.int64]: Vetor de espalhamento
         """
-        # Vetor de espalhamento *******************************************************************
-        ni = self.nodes.index(bar.start_node) # Índice do nó inicial
-        nf = self.nodes.index(bar.end_node) # Índice do nó final
-
-        spread_vector = [6 * (ni + 1) - 6, 6 * (ni + 1) - 5, 6 * (ni + 1) - 4,
-                         6 * (ni + 1) - 3, 6 * (ni + 1) - 2, 6 * (ni + 1) - 1,
-                         6 * (nf + 1) - 6, 6 * (nf + 1) - 5, 6 * (nf + 1) - 4,
-                         6 * (nf + 1) - 3, 6 * (nf + 1) - 2, 6 * (nf + 1) - 1]
-        return spread_vector
-
+        return self.numbering.spread_vector(bar)
 
     def get_displacements(self, node_name: str, load_name: str) -> NDArray[float64]:
         """Pega os deslocamentos
@@ -179,22 +815,15 @@ class Linear:
             load_name (str): Nome do caso de carga
 
         Returns:
-            ndarray: Deslocamentos
+            ndarray: Deslocamentos (vazio se o nó ou o caso não existir)
         """
-        node_displacements: NDArray[float64] = np.array([])
-        for load in self.loads:
-            if load.name == load_name:
-                for node in self.nodes:
-                    if node.name == node_name:
-                        node_index = self.nodes.index(node) # Node index
-                        initial_index = 6 * (node_index + 1) - 6
-                        end_index = 6 * (node_index + 1)
-
-                        node_displacements = self.displacements[load][initial_index : end_index]
-                        break
-                break
+        if self.results is None:
+            return np.array([])
 
-        return node_displacements
+        try:
+            return self.results.get_displacements(node_name, load_name)
+        except KeyError:
+            return np.array([])
 
     def get_reactions(self, node_name: str, load_name: str) -> NDArray[float64]:
         """Pega as reações
@@ -204,40 +833,45 @@ class Linear:
             load_name (str): Nome do caso de carga
 
         Returns:
-            ndarray: Reações
+            ndarray: Reações (vazio se o nó ou o caso não existir)
         """
-        node_reactions: NDArray[float64] = np.array([])
-        for load in self.loads:
-            if load.name == load_name:
-                for node in self.nodes:
-                    if node.name == node_name:
-                        node_index = self.nodes.index(node) # Node index
-                        initial_index = 6 * (node_index + 1) - 6
-                        end_index = 6 * (node_index + 1)
-
-                        node_reactions = self.reactions[load][initial_index : end_index]
-                        break
-                break
+        if self.results is None:
+            return np.array([])
 
-        return node_reactions
+        try:
+            return self.results.get_reactions(node_name, load_name)
+        except KeyError:
+            return np.array([])
 
-    def calculate_extremes_bars_forces(self):
+    def calculate_extremes_bars_forces(self, chunk_size: int = 4096):
         """Calculate extreme forces in bars
+
+        Args:
+            chunk_size (int, optional): Barras calculadas de cada vez. Defaults to 4096.
+        """
+        self.bars_forces = np.zeros([len(self.loads), len(self.bars), 12])
+        self.recover_bars_forces(chunk_size)
+
+        # Um dicionário de views (nome do caso -> esforços) por barra
+        load_names = [load.name for load in self.loads]
+        for bar, forces in zip(self.bars, self.bars_forces.transpose(1, 0, 2)):
+            bar.extreme_forces.update(zip(load_names, forces))
+
+    def recover_bars_forces(self, chunk_size: int = 4096) -> None:
+        """Calcula os esforços nas barras no lugar, em `bars_forces`
+
+        Args:
+            chunk_size (int, optional): Barras calculadas de cada vez. Defaults to 4096.
         """
-        for bar in self.bars:
-            for load in self.loads:
-                # Get nodal displacements for this bar
-                start_displacements = self.get_displacements(bar.start_node.name, load.name)
-                end_displacements = self.get_displacements(bar.end_node.name, load.name)
-                displacements = np.concatenate((start_displacements, end_displacements))
-
-                # Calculate bar forces: displacement forces - equivalent nodal forces
-                # The negative sign accounts for the fact that vector_loads are forces
-                # applied TO the bar, while we want forces IN the bar
-                displacement_forces = bar.klg @ displacements
-                bar_forces = displacement_forces - bar.vector_loads
-
-                # Transform to local coordinates and apply sign convention
-                bar.extreme_forces[load.name] = (bar.r @ bar_forces) * \
-                    np.array([-1,  1,  1,  1,  1, -1,
-                               1, -1, -1, -1, -1,  1])
+        for start in range(0, len(self.bars), chunk_size):
+            chunk = slice(start, start + chunk_size)
+
+            # Deslocamentos nodais (n_bars, 12, n_loads) e forças de engastamento das barras
+            displacements = self.displacements_matrix[self.numbering.spread_vectors[chunk]]
+            fixed_end = self.fixed_end_forces[:, chunk].transpose(1, 2, 0)
+
+            # Esforços: forças dos deslocamentos - forças nodais equivalentes, em coordenadas
+            # locais
+            forces = elements.end_forces(self.element_kl[chunk], self.element_r[chunk],
+                                         displacements, fixed_end)
+            self.bars_forces[:, chunk] = forces.transpose(2, 0, 1)
@@ -0,0 +1,223 @@
+"""Linhas de influência e cargas móveis"""
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from numpy import float64
+
+from ..objects import Bar
+from ..functions import elements
+from ..functions.reactions import point as pt
+
+from ._linear import Linear
+from ._results import Results
+from ._envelope import Envelope
+
+
+class MovingLoad:
+    """Linhas de influência de uma carga unitária percorrendo um caminho de barras
+
+    As forças nodais equivalentes de todas as estações são calculadas de uma vez e resolvidas
+    juntas com o solver da análise linear. As ordenadas ficam em um `Results` com uma
+    estação por caso de carga, e as envoltórias de veículos usam `Results.envelope`.
+    """
+    def __init__(self, linear: Linear, path: list[Bar],
+                 stations: int = 20,
+                 direction: ArrayLike = (0, 0, -1)):
+        """Construtor
+
+        Args:
+            linear (Linear): Análise linear já calculada
+            path (list[Bar]): Barras conectadas, na ordem do percurso (podem estar invertidas)
+            stations (int, optional): Número de divisões de cada barra. Defaults to 20.
+            direction (ArrayLike, optional): Direção da carga unitária em coordenadas globais.
+                Defaults to (0, 0, -1).
+
+        Raises:
+            ValueError: Se a análise não foi calculada ou as barras não estão conectadas
+        """
+        if linear.solver is None or linear.results is None:
+            raise ValueError("The analysis has not been calculated.")
+
+        self.linear = linear
+        self.direction = np.asarray(direction, dtype=float)
+
+        # Estações: barra, posição na barra (x) e posição no caminho ///////////////////////////////
+        bar_indices: list[NDArray[np.int64]] = []
+        x_list: list[NDArray[float64]] = []
+        s_list: list[NDArray[float64]] = []
+        start = 0.0
+        for index, (bar, reverse) in enumerate(zip(path, self.orientation(path))):
+            fraction = np.linspace(0, 1, stations + 1)[(1 if index else 0):]
+            bar_indices.append(np.full(fraction.size, linear.numbering.bar_index[bar]))
+            x_list.append(bar.length * (1 - fraction if reverse else fraction))
+            s_list.append(start + bar.length * fraction)
+            start += bar.length
+
+        self.bar_index = np.concatenate(bar_indices)
+        self.x = np.concatenate(x_list) # Posição na barra
+        self.positions = np.concatenate(s_list) # Posição no caminho
+        self.length = start
+
+        self.influence = self.calculate_influence()
+
+    @staticmethod
+    def orientation(path: list[Bar]) -> list[bool]:
+        """Verifica se cada barra do caminho está invertida (do nó final para o inicial)
+
+        Args:
+            path (list[Bar]): Barras conectadas
+
+        Raises:
+            ValueError: Se as barras não estiverem conectadas
+
+        Returns:
+            list[bool]: True para barras percorridas do nó final para o inicial
+        """
+        if not path:
+            return []
+
+        node = path[0].start_node
+        if len(path) > 1 and path[0].start_node in (path[1].start_node, path[1].end_node):
+            node = path[0].end_node
+
+        reverse: list[bool] = []
+        for bar in path:
+            if bar.start_node is node:
+                reverse.append(False)
+                node = bar.end_node
+            elif bar.end_node is node:
+                reverse.append(True)
+                node = bar.start_node
+            else:
+                raise ValueError(f"The bar '{bar.name}' is not connected to the path.")
+
+        return reverse
+
+    def calculate_local_vectors(self) -> NDArray[float64]:
+        """Forças de engastamento perfeito da carga unitária em cada estação
+
+        Returns:
+            NDArray[float64]: (n_stations, 12) vetores em coordenadas locais, sem liberações
+        """
+        bars = [self.linear.bars[index] for index in self.bar_index]
+        length = np.array([bar.length for bar in bars])
+        # Carga unitária em coordenadas locais
+        fx, fy, fz = (self.linear.element_r[self.bar_index] @ self.direction).T
+
+        fxr = pt.force_x(length, self.x, fx)
+        fyr = pt.force_y(length, self.x, fy)
+        fzr = pt.force_z(length, self.x, fz)
+
+        vectors = np.zeros([self.x.size, 12])
+        vectors[:, 0] = -fxr['Rxa']
+        vectors[:, 6] = -fxr['Rxb']
+        vectors[:, 1] = -fyr['Rya']
+        vectors[:, 7] = -fyr['Ryb']
+        vectors[:, 2] = -fzr['Rza']
+        vectors[:, 8] = -fzr['Rzb']
+        vectors[:, 4] = -fzr['Mya']
+        vectors[:, 10] = -fzr['Myb']
+        vectors[:, 5] = -fyr['Mza']
+        vectors[:, 11] = -fyr['Mzb']
+
+        return vectors
+
+    def calculate_influence(self, chunk_size: int = 4096) -> Results:
+        """Calcula as ordenadas das linhas de influência de todas as estações
+
+        Args:
+            chunk_size (int, optional): Barras por bloco no cálculo dos esforços.
+                Defaults to 4096.
+
+        Returns:
+            Results: Deslocamentos, reações e esforços nas barras, com uma estação por caso
+        """
+        linear = self.linear
+        n_stations = self.x.size
+        stations = np.arange(n_stations)
+
+        # Forças nodais equivalentes com as liberações, em coordenadas globais
+        local = np.einsum('nij,nj->ni', linear.element_operators[self.bar_index],
+                          self.calculate_local_vectors())
+        fixed_end = elements.rotate_vectors(linear.element_r[self.bar_index], local,
+                                            transpose=True)
+
+        forces = np.zeros([linear.matrix_order, n_stations])
+        np.add.at(forces, (linear.numbering.spread_vectors[self.bar_index], stations[:, None]),
+                  fixed_end)
+
+        # Todas as estações resolvidas juntas
+        if linear.solver is None:
+            raise ValueError("The analysis has not been calculated.")
+        displacements = np.zeros([linear.matrix_order, n_stations])
+        displacements[linear.free_dofs] = linear.solver.solve(forces[linear.free_dofs])
+        reactions = np.asarray(linear.kg @ displacements) - forces
+
+        # Esforços sem as forças de engastamento, depois a barra carregada de cada estação
+        bars_forces = np.zeros([n_stations, len(linear.bars), 12])
+        for start in range(0, len(linear.bars), chunk_size):
+            chunk = slice(start, start + chunk_size)
+            bar_forces = elements.end_forces(linear.element_kl[chunk], linear.element_r[chunk],
+                                             displacements[linear.numbering.spread_vectors[chunk]])
+            bars_forces[:, chunk] = bar_forces.transpose(2, 0, 1)
+        bars_forces[stations, self.bar_index] -= local * elements.END_FORCES_SIGNS
+
+        return linear.solution_results([str(index) for index in stations],
+                                       displacements, reactions, bars_forces)
+
+    def vehicle_matrix(self, offsets: ArrayLike, loads: ArrayLike,
+                       step: float | None = None) -> tuple[NDArray[float64], NDArray[float64]]:
+        """Coeficientes das estações para cada posição de um trem de eixos
+
+        Os eixos ficam `offsets` atrás do primeiro. As linhas de influência são interpoladas
+        linearmente entre as estações e eixos fora do caminho não contam.
+
+        Args:
+            offsets (ArrayLike): (n_axles,) distância de cada eixo ao primeiro
+            loads (ArrayLike): (n_axles,) carga de cada eixo (múltiplo da carga unitária)
+            step (float | None, optional): Passo do veículo. Defaults to None (menor
+                distância entre estações).
+
+        Returns:
+            tuple[NDArray[float64], NDArray[float64]]: (n_positions,) posição do primeiro eixo
+                e (n_positions, n_stations) coeficientes
+        """
+        offsets = np.asarray(offsets, dtype=float)
+        loads = np.asarray(loads, dtype=float)
+        if step is None:
+            step = float(np.min(np.diff(self.positions)))
+
+        front = np.arange(0.0, self.length + offsets.max() + step / 2, step)
+        axle_positions = front[:, None] - offsets[None, :] # (n_positions, n_axles)
+        inside = (axle_positions >= 0) & (axle_positions <= self.length)
+
+        # Trecho de cada eixo e pesos da interpolação linear
+        segment = np.clip(np.searchsorted(self.positions, axle_positions) - 1,
+                          0, self.positions.size - 2)
+        weight = ((axle_positions - self.positions[segment]) /
+                  (self.positions[segment + 1] - self.positions[segment]))
+
+        coefficients = np.zeros([front.size, self.positions.size])
+        rows = np.broadcast_to(np.arange(front.size)[:, None], axle_positions.shape)
+        values = np.where(inside, loads[None, :], 0.0)
+        np.add.at(coefficients, (rows, segment), values * (1 - weight))
+        np.add.at(coefficients, (rows, segment + 1), values * weight)
+
+        return front, coefficients
+
+    def vehicle_envelope(self, offsets: ArrayLike, loads: ArrayLike,
+                         step: float | None = None, chunk_size: int = 256) -> Envelope:
+        """Envoltória de um trem de eixos percorrendo o caminho
+
+        Args:
+            offsets (ArrayLike): (n_axles,) distância de cada eixo ao primeiro
+            loads (ArrayLike): (n_axles,) carga de cada eixo
+            step (float | None, optional): Passo do veículo. Defaults to None.
+            chunk_size (int, optional): Posições por bloco. Defaults to 256.
+
+        Returns:
+            Envelope: Máximos e mínimos; arg_* é o índice da posição do veículo e
+                combination_names traz a posição do primeiro eixo
+        """
+        front, coefficients = self.vehicle_matrix(offsets, loads, step)
+        return self.influence.envelope(coefficients, [f'{value:g}' for value in front],
+                                       chunk_size)
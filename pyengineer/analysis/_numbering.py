@@ -0,0 +1,122 @@
+"""Numeração dos graus de liberdade da estrutura"""
+import numpy as np
+from numpy.typing import NDArray
+from scipy import sparse
+from scipy.sparse import csgraph
+
+from ..objects import Node
+from ..objects import Bar
+
+
+class DofNumbering:
+    """Numeração dos graus de liberdade, criada uma vez por análise"""
+    def __init__(self, nodes: list[Node], bars: list[Bar], renumber: bool = False):
+        """Construtor
+
+        Args:
+            nodes (list[Node]): Nós
+            bars (list[Bar]): Barras
+            renumber (bool, optional): Renumera os nós com Reverse Cuthill-McKee para
+                diminuir a largura de banda da matriz de rigidez. Defaults to False.
+        """
+        self.order = 6 * len(nodes)
+        self.node_index: dict[Node, int] = {node: index for index, node in enumerate(nodes)}
+        self.bar_index: dict[Bar, int] = {bar: index for index, bar in enumerate(bars)}
+        # Nós com o mesmo nome: vale o primeiro, como na busca linear
+        self.node_names: dict[str, int] = {}
+        for index, node in enumerate(nodes):
+            self.node_names.setdefault(node.name, index)
+
+        start = np.array([self.node_index[bar.start_node] for bar in bars], dtype=np.int64)
+        end = np.array([self.node_index[bar.end_node] for bar in bars], dtype=np.int64)
+
+        # Posição de cada nó na numeração (node_order[posição] = índice do nó)
+        self.node_order = np.arange(len(nodes), dtype=np.int64)
+        if renumber and len(nodes) > 0:
+            self.node_order = self.reverse_cuthill_mckee(len(nodes), start, end)
+        position = np.empty(len(nodes), dtype=np.int64)
+        position[self.node_order] = np.arange(len(nodes), dtype=np.int64)
+
+        # (n_nodes, 6) graus de liberdade globais de cada nó, na ordem da lista de nós
+        self.node_dofs: NDArray[np.int64] = (6 * position[:, None]
+                                             + np.arange(6, dtype=np.int64))
+
+        # (n_bars, 12) vetores de espalhamento de todas as barras
+        self.spread_vectors: NDArray[np.int64] = np.hstack((self.node_dofs[start],
+                                                            self.node_dofs[end]))
+
+    def add_bar(self, bar: Bar) -> None:
+        """Adiciona uma barra no fim, mantendo a numeração dos nós
+
+        Args:
+            bar (Bar): Barra
+        """
+        self.bar_index[bar] = len(self.bar_index)
+        spread_vector = np.concatenate((self.node_dofs[self.node_index[bar.start_node]],
+                                        self.node_dofs[self.node_index[bar.end_node]]))
+        self.spread_vectors = np.vstack((self.spread_vectors, spread_vector))
+
+    def remove_bar(self, bar: Bar) -> None:
+        """Remove uma barra, mantendo a numeração dos nós
+
+        Args:
+            bar (Bar): Barra
+        """
+        index = self.bar_index.pop(bar)
+        for other, other_index in self.bar_index.items():
+            if other_index > index:
+                self.bar_index[other] = other_index - 1
+        self.spread_vectors = np.delete(self.spread_vectors, index, axis=0)
+
+    def first_dof(self, node: Node) -> int:
+        """Primeiro grau de liberdade global do nó
+
+        Args:
+            node (Node): Nó
+
+        Returns:
+            int: Índice do grau de liberdade Dx do nó
+        """
+        return int(self.node_dofs[self.node_index[node], 0])
+
+    def spread_vector(self, bar: Bar) -> NDArray[np.int64]:
+        """Vetor de espalhamento da barra
+
+        Args:
+            bar (Bar): Barra
+
+        Returns:
+            NDArray[np.int64]: Graus de liberdade globais dos 12 graus de liberdade da barra
+        """
+        return self.spread_vectors[self.bar_index[bar]]
+
+    @staticmethod
+    def reverse_cuthill_mckee(n_nodes: int,
+                              start: NDArray[np.int64],
+                              end: NDArray[np.int64]) -> NDArray[np.int64]:
+        """Ordem dos nós que diminui a largura de banda do grafo de conectividade
+
+        Args:
+            n_nodes (int): Número de nós
+            start (NDArray[np.int64]): Índice do nó inicial de cada barra
+            end (NDArray[np.int64]): Índice do nó final de cada barra
+
+        Returns:
+            NDArray[np.int64]: Índices dos nós na nova ordem
+        """
+        connectivity = sparse.coo_matrix((np.ones(2 * start.size),
+                                          (np.concatenate((start, end)),
+                                           np.concatenate((end, start)))),
+                                         shape=(n_nodes, n_nodes)).tocsr()
+        return csgraph.reverse_cuthill_mckee(connectivity, symmetric_mode=True).astype(np.int64)
+
+    def bandwidth(self) -> int:
+        """Semibanda da matriz de rigidez com esta numeração
+
+        Returns:
+            int: Maior distância entre dois graus de liberdade da mesma barra
+        """
+        if self.spread_vectors.size == 0:
+            return 0
+
+        return int(np.max(self.spread_vectors.max(axis=1) - self.spread_vectors.min(axis=1)))
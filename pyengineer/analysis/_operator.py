@@ -0,0 +1,114 @@
+"""Operador de rigidez aplicado elemento por elemento, sem montar a matriz global"""
+import numpy as np
+from numpy.typing import NDArray
+from numpy import float64
+from scipy.sparse import linalg as sparse_linalg
+
+
+class ElementOperator(sparse_linalg.LinearOperator):
+    """Produto K @ u calculado diretamente com as matrizes dos elementos
+
+    Os graus de liberdade de cada barra são tirados de u, multiplicados pelas matrizes
+    (n_bars, 12, 12) e somados de volta: a memória fica em n_bars * 144 valores. Uma diagonal
+    (molas e penalidade dos apoios) pode ser somada e o operador pode ficar restrito a alguns
+    graus de liberdade (os livres da estrutura).
+    """
+    def __init__(self,
+                 matrices: NDArray[float64],
+                 spread_vectors: NDArray[np.int64],
+                 order: int,
+                 diagonal: NDArray[float64] | None = None,
+                 dofs: NDArray[np.int64] | None = None):
+        """Construtor
+
+        Args:
+            matrices (NDArray[float64]): (n_bars, 12, 12) matrizes das barras em coordenadas
+                globais
+            spread_vectors (NDArray[np.int64]): (n_bars, 12) vetores de espalhamento
+            order (int): Número de graus de liberdade da estrutura
+            diagonal (NDArray[float64] | None, optional): (order,) valores somados na
+                diagonal. Defaults to None.
+            dofs (NDArray[np.int64] | None, optional): Graus de liberdade do operador (linhas
+                e colunas). Defaults to None (todos).
+        """
+        self.matrices = matrices
+        self.spread_vectors = spread_vectors
+        self.order = order
+        self.support_diagonal = (np.zeros(order) if diagonal is None
+                                 else np.asarray(diagonal, dtype=float))
+        self.dofs = (np.arange(order, dtype=np.int64) if dofs is None
+                     else np.asarray(dofs, dtype=np.int64))
+        super().__init__(dtype=np.dtype(float64), shape=(self.dofs.size, self.dofs.size))
+
+    def _matmat(self, X: NDArray[float64]) -> NDArray[float64]:
+        """Produto por vetores (n, k)
+
+        Args:
+            X (NDArray[float64]): Vetores nos graus de liberdade do operador
+
+        Returns:
+            NDArray[float64]: K @ X
+        """
+        X = np.asarray(X, dtype=float).reshape(self.dofs.size, -1)
+        full = np.zeros([self.order, X.shape[1]])
+        full[self.dofs] = X
+
+        products = np.einsum('nij,njk->nik', self.matrices, full[self.spread_vectors])
+        result = self.support_diagonal[:, None] * full
+        np.add.at(result, self.spread_vectors, products)
+
+        return result[self.dofs]
+
+    def _matvec(self, x: NDArray[float64]) -> NDArray[float64]:
+        """Produto por um vetor
+
+        Args:
+            x (NDArray[float64]): Vetor nos graus de liberdade do operador
+
+        Returns:
+            NDArray[float64]: K @ x
+        """
+        return self._matmat(np.reshape(x, (-1, 1))).reshape(-1)
+
+    def _rmatvec(self, x: NDArray[float64]) -> NDArray[float64]:
+        return self._matvec(x) # Simétrico
+
+    def _rmatmat(self, X: NDArray[float64]) -> NDArray[float64]:
+        return self._matmat(X) # Simétrico
+
+    def diagonal(self) -> NDArray[float64]:
+        """Diagonal do operador
+
+        Returns:
+            NDArray[float64]: (n,) diagonal nos graus de liberdade do operador
+        """
+        diagonal = self.support_diagonal.copy()
+        np.add.at(diagonal, self.spread_vectors,
+                  np.diagonal(self.matrices, axis1=1, axis2=2))
+        return diagonal[self.dofs]
+
+    def block_diagonal(self) -> tuple[NDArray[float64], NDArray[np.int64]]:
+        """Blocos nodais 6x6 da diagonal do operador
+
+        Returns:
+            tuple[NDArray[float64], NDArray[np.int64]]: (n_nodes, 6, 6) blocos e (n_nodes, 6)
+                linha de cada grau de liberdade do bloco no operador, -1 (com a identidade no
+                bloco) para os que não estão no operador
+        """
+        n_nodes = self.order // 6
+        blocks = np.zeros([n_nodes, 6, 6])
+        np.add.at(blocks, self.spread_vectors[:, 0] // 6, self.matrices[:, :6, :6])
+        np.add.at(blocks, self.spread_vectors[:, 6] // 6, self.matrices[:, 6:, 6:])
+        blocks[:, np.arange(6), np.arange(6)] += self.support_diagonal.reshape(n_nodes, 6)
+
+        position = np.full(self.order, -1, dtype=np.int64)
+        position[self.dofs] = np.arange(self.dofs.size, dtype=np.int64)
+        indices = position.reshape(n_nodes, 6)
+
+        # Tira os graus de liberdade que não estão no operador
+        missing = indices < 0
+        blocks[missing[:, :, None] | missing[:, None, :]] = 0.0
+        node, component = np.nonzero(missing)
+        blocks[node, component, component] = 1.0
+
+        return blocks, indices
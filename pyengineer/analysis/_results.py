@@ -0,0 +1,235 @@
+"""Resultados da análise guardados em arrays contíguos"""
+from typing import Iterable
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from numpy import float64
+
+from ._envelope import Envelope
+
+Names = str | Iterable[str] | None
+Index = int | slice | NDArray[np.int64]
+
+
+class Results:
+    """Deslocamentos, reações e esforços nas barras de vários casos de carga
+
+    Os valores ficam em arrays contíguos, (n_loads, n_nodes, 6) para deslocamentos e reações
+    e (n_loads, n_bars, 12) para os esforços nas barras, com o índice de cada nome.
+    """
+    def __init__(self,
+                 load_names: list[str],
+                 node_names: list[str],
+                 bar_names: list[str],
+                 displacements: NDArray[float64],
+                 reactions: NDArray[float64],
+                 bars_forces: NDArray[float64]):
+        """Construtor
+
+        Args:
+            load_names (list[str]): Nomes dos casos de carga (primeiro eixo dos arrays)
+            node_names (list[str]): Nomes dos nós
+            bar_names (list[str]): Nomes das barras
+            displacements (NDArray[float64]): (n_loads, n_nodes, 6) deslocamentos
+            reactions (NDArray[float64]): (n_loads, n_nodes, 6) reações
+            bars_forces (NDArray[float64]): (n_loads, n_bars, 12) esforços nas barras
+        """
+        self.load_names = list(load_names)
+        self.node_names = list(node_names)
+        self.bar_names = list(bar_names)
+        self.displacements = np.ascontiguousarray(displacements)
+        self.reactions = np.ascontiguousarray(reactions)
+        self.bars_forces = np.ascontiguousarray(bars_forces)
+
+        # Nomes repetidos: vale o primeiro, como na busca linear
+        self.load_index: dict[str, int] = {}
+        for index, name in enumerate(self.load_names):
+            self.load_index.setdefault(name, index)
+        self.node_index: dict[str, int] = {}
+        for index, name in enumerate(self.node_names):
+            self.node_index.setdefault(name, index)
+        self.bar_index: dict[str, int] = {}
+        for index, name in enumerate(self.bar_names):
+            self.bar_index.setdefault(name, index)
+
+    def get_displacements(self, node_names: Names = None,
+                          load_names: Names = None) -> NDArray[float64]:
+        """Deslocamentos dos nós nos casos de carga
+
+        Args:
+            node_names (Names, optional): Nome, lista de nomes ou None (todos os nós).
+            load_names (Names, optional): Nome, lista de nomes ou None (todos os casos).
+
+        Returns:
+            NDArray[float64]: Valores por (caso, nó, componente). Um nome só remove o eixo.
+                É uma view quando os nomes seguem a ordem guardada com passo constante; senão
+                é uma cópia.
+        """
+        return self._select(self.displacements,
+                            self._index(load_names, self.load_index),
+                            self._index(node_names, self.node_index))
+
+    def get_reactions(self, node_names: Names = None,
+                      load_names: Names = None) -> NDArray[float64]:
+        """Reações dos nós nos casos de carga
+
+        Args:
+            node_names (Names, optional): Nome, lista de nomes ou None (todos os nós).
+            load_names (Names, optional): Nome, lista de nomes ou None (todos os casos).
+
+        Returns:
+            NDArray[float64]: Valores por (caso, nó, componente), veja `get_displacements`.
+        """
+        return self._select(self.reactions,
+                            self._index(load_names, self.load_index),
+                            self._index(node_names, self.node_index))
+
+    def get_bars_forces(self, bar_names: Names = None,
+                        load_names: Names = None) -> NDArray[float64]:
+        """Esforços nas barras nos casos de carga
+
+        Args:
+            bar_names (Names, optional): Nome, lista de nomes ou None (todas as barras).
+            load_names (Names, optional): Nome, lista de nomes ou None (todos os casos).
+
+        Returns:
+            NDArray[float64]: Valores por (caso, barra, componente), veja `get_displacements`.
+        """
+        return self._select(self.bars_forces,
+                            self._index(load_names, self.load_index),
+                            self._index(bar_names, self.bar_index))
+
+    def combine(self, coefficients: ArrayLike, names: list[str]) -> 'Results':
+        """Combina os casos de carga por superposição
+
+        Todas as combinações saem de um produto no eixo dos casos, sem resolver a estrutura
+        novamente.
+
+        Args:
+            coefficients (ArrayLike): (n_combinations, n_loads) fator de cada caso de carga em
+                cada combinação
+            names (list[str]): Nomes das combinações
+
+        Returns:
+            Results: Resultados com as combinações no lugar dos casos de carga
+        """
+        coefficients = np.asarray(coefficients, dtype=float).reshape(len(names),
+                                                                     len(self.load_names))
+
+        return Results(names, self.node_names, self.bar_names,
+                       np.tensordot(coefficients, self.displacements, axes=1),
+                       np.tensordot(coefficients, self.reactions, axes=1),
+                       np.tensordot(coefficients, self.bars_forces, axes=1))
+
+    def envelope(self, coefficients: ArrayLike, names: list[str] | None = None,
+                 chunk_size: int = 256) -> Envelope:
+        """Envoltória de muitas combinações sem guardar os resultados de cada uma
+
+        As combinações são calculadas por blocos, guardando só os extremos.
+
+        Args:
+            coefficients (ArrayLike): (n_combinations, n_loads) fator de cada caso de carga em
+                cada combinação
+            names (list[str] | None, optional): Nomes das combinações. Defaults to None (o
+                índice de cada combinação).
+            chunk_size (int, optional): Combinações por bloco. Defaults to 256.
+
+        Returns:
+            Envelope: Máximo, mínimo e combinação que governa cada deslocamento, reação e
+                esforço nas barras
+        """
+        coefficients = np.asarray(coefficients, dtype=float).reshape(-1, len(self.load_names))
+        if names is None:
+            names = [str(index) for index in range(coefficients.shape[0])]
+
+        envelope = Envelope(names, self.node_names, self.bar_names)
+        for start in range(0, coefficients.shape[0], chunk_size):
+            chunk = coefficients[start:start + chunk_size]
+            envelope.update(np.tensordot(chunk, self.displacements, axes=1),
+                            np.tensordot(chunk, self.reactions, axes=1),
+                            np.tensordot(chunk, self.bars_forces, axes=1),
+                            start)
+
+        return envelope
+
+    def pattern_envelope(self, pattern_names: Iterable[str],
+                         permanent: ArrayLike | None = None,
+                         factor: float = 1.0) -> Envelope:
+        """Envoltória de todos os padrões de alguns casos de carga (carga alternada)
+
+        Cada caso (um vão ou painel carregado) aparece com `factor` ou não aparece. Por
+        superposição, o máximo nos 2^n padrões é a soma das contribuições positivas e o
+        mínimo a soma das negativas, sem resolver nenhum padrão.
+
+        Args:
+            pattern_names (Iterable[str]): Nomes dos casos de carga de cada painel
+            permanent (ArrayLike | None, optional): (n_loads,) fatores dos casos sempre
+                presentes (peso próprio). Defaults to None.
+            factor (float, optional): Fator dos casos alternados. Defaults to 1.0.
+
+        Returns:
+            Envelope: Máximo e mínimo de cada resultado. arg_maximum e arg_minimum são -1: o
+                padrão que governa carrega os painéis com contribuição do sinal do extremo.
+        """
+        pattern_index = [self.load_index[name] for name in pattern_names]
+        envelope = Envelope([], self.node_names, self.bar_names)
+
+        for values, extremes in ((self.displacements, envelope.displacements),
+                                 (self.reactions, envelope.reactions),
+                                 (self.bars_forces, envelope.bars_forces)):
+            if permanent is None:
+                base = np.zeros(values.shape[1:])
+            else:
+                base = np.tensordot(np.asarray(permanent, dtype=float), values, axes=1)
+            extremes.maximum = base.copy()
+            extremes.minimum = base.copy()
+
+            for index in pattern_index:
+                contribution = factor * values[index]
+                extremes.maximum += np.maximum(contribution, 0.0)
+                extremes.minimum += np.minimum(contribution, 0.0)
+
+        return envelope
+
+    @staticmethod
+    def _index(names: Names, index_map: dict[str, int]) -> Index:
+        """Converte nomes em um índice, de preferência um slice (views)
+
+        Args:
+            names (Names): Nome, lista de nomes ou None
+            index_map (dict[str, int]): Índice de cada nome
+
+        Returns:
+            Index: int, slice ou array de índices
+        """
+        if names is None:
+            return slice(None)
+        if isinstance(names, str):
+            return index_map[names]
+
+        indices = np.array([index_map[name] for name in names], dtype=np.int64)
+        if indices.size == 1:
+            return slice(int(indices[0]), int(indices[0]) + 1)
+        if indices.size > 1:
+            steps = np.diff(indices)
+            if steps[0] > 0 and np.all(steps == steps[0]):
+                return slice(int(indices[0]), int(indices[-1]) + 1, int(steps[0]))
+
+        return indices
+
+    @staticmethod
+    def _select(values: NDArray[float64], first: Index, second: Index) -> NDArray[float64]:
+        """Seleciona nos dois primeiros eixos do array
+
+        Args:
+            values (NDArray[float64]): Array
+            first (Index): Índice do primeiro eixo
+            second (Index): Índice do segundo eixo
+
+        Returns:
+            NDArray[float64]: Valores selecionados
+        """
+        if isinstance(first, np.ndarray) and isinstance(second, np.ndarray):
+            return values[np.ix_(first, second)]
+
+        return values[first, second]
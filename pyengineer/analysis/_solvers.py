@@ -0,0 +1,433 @@
+"""Solvers para os sistemas lineares da análise"""
+import typing
+import warnings
+
+import numpy as np
+from numpy.typing import NDArray
+from numpy import float64
+from scipy import linalg
+from scipy import sparse
+from scipy.sparse import linalg as sparse_linalg
+
+
+class Factorization:
+    """Fatoração da matriz de rigidez, calculada uma única vez e reutilizada nas soluções"""
+    def __init__(self, matrix: sparse.spmatrix | NDArray[float64]):
+        """Construtor
+
+        Matrizes densas usam Cholesky (LU se não for positiva definida). Matrizes esparsas
+        usam a LU do SuperLU com ordenação simétrica e pivôs na diagonal.
+
+        Args:
+            matrix (sparse.spmatrix | NDArray[float64]): Matriz simétrica
+        """
+        self.order = matrix.shape[0]
+        self.method = ''
+        self._factor: typing.Any = None # SuperLU, (c, lower) de Cholesky ou (lu, piv)
+
+        if sparse.issparse(matrix):
+            self.method = 'splu'
+            matrix = sparse.csc_matrix(matrix)
+            # Sem troca de linhas: a matriz é simétrica positiva definida (K_ff, ou K com a
+            # penalidade só somada na diagonal), então todos os pivôs são positivos e os
+            # complementos de Schur continuam positivos definidos, sem crescimento dos
+            # elementos. Um pivô de penalidade (1e25) só gera multiplicadores pequenos
+            self._factor = sparse_linalg.splu(matrix, permc_spec='MMD_AT_PLUS_A',
+                                              diag_pivot_thresh=0.0,
+                                              options={'SymmetricMode': True})
+            if np.any(self._factor.U.diagonal() <= 0):
+                # Não é positiva definida: LU com pivoteamento parcial
+                self._factor = sparse_linalg.splu(matrix, permc_spec='MMD_AT_PLUS_A')
+        else:
+            try:
+                self.method = 'cholesky'
+                self._factor = linalg.cho_factor(matrix)
+            except linalg.LinAlgError:
+                self.method = 'lu'
+                self._factor = linalg.lu_factor(matrix)
+
+    def solve(self, rhs: NDArray[float64]) -> NDArray[float64]:
+        """Resolve o sistema para um ou vários lados direitos
+
+        Args:
+            rhs (NDArray[float64]): (n,) vetor ou (n, n_rhs) matriz
+
+        Returns:
+            NDArray[float64]: Solução com a forma de rhs
+        """
+        rhs = np.asarray(rhs, dtype=float)
+        if rhs.size == 0:
+            return np.zeros_like(rhs)
+
+        match self.method:
+            case 'splu':
+                return self._factor.solve(rhs)
+            case 'cholesky':
+                return linalg.cho_solve(self._factor, rhs)
+            case _:
+                return linalg.lu_solve(self._factor, rhs)
+
+
+class BandedFactorization:
+    """Fatoração de Cholesky em banda da matriz de rigidez
+
+    Tempo e memória crescem com n * b^2 e n * b (b é a semibanda): usar junto com a
+    numeração Reverse Cuthill-McKee.
+    """
+    def __init__(self, matrix: sparse.spmatrix | NDArray[float64]):
+        """Construtor
+
+        Args:
+            matrix (sparse.spmatrix | NDArray[float64]): Matriz simétrica positiva definida
+        """
+        self.order = matrix.shape[0]
+        matrix = sparse.coo_matrix(matrix)
+        row, column = np.asarray(matrix.row), np.asarray(matrix.col)
+        upper = row <= column
+        rows = row[upper]
+        columns = column[upper]
+        self.bandwidth = int(np.max(columns - rows)) if rows.size else 0
+
+        # Forma superior: ab[b + i - j, j] = a[i, j]
+        banded = np.zeros([self.bandwidth + 1, self.order])
+        np.add.at(banded, (self.bandwidth + rows - columns, columns), matrix.data[upper])
+
+        self._factor = linalg.cholesky_banded(banded)
+
+    def solve(self, rhs: NDArray[float64]) -> NDArray[float64]:
+        """Resolve o sistema para um ou vários lados direitos
+
+        Args:
+            rhs (NDArray[float64]): (n,) vetor ou (n, n_rhs) matriz
+
+        Returns:
+            NDArray[float64]: Solução com a forma de rhs
+        """
+        rhs = np.asarray(rhs, dtype=float)
+        if rhs.size == 0:
+            return np.zeros_like(rhs)
+
+        return linalg.cho_solve_banded((self._factor, False), rhs)
+
+
+class JacobiPreconditioner:
+    """Precondicionador de Jacobi (inverso da diagonal)"""
+    def __init__(self, diagonal: NDArray[float64]):
+        """Construtor
+
+        Args:
+            diagonal (NDArray[float64]): Diagonal da matriz
+        """
+        diagonal = np.asarray(diagonal, dtype=float)
+        self.inverse = np.divide(1.0, diagonal, out=np.ones_like(diagonal),
+                                 where=diagonal != 0)
+
+    @classmethod
+    def from_matrix(cls, matrix: typing.Any) -> 'JacobiPreconditioner':
+        """Cria o precondicionador com a diagonal de uma matriz
+
+        Args:
+            matrix (typing.Any): Matriz ou operador com o método `diagonal()`
+
+        Returns:
+            JacobiPreconditioner: Precondicionador
+        """
+        return cls(matrix.diagonal())
+
+    def apply(self, residuals: NDArray[float64]) -> NDArray[float64]:
+        """Aplica o precondicionador nos resíduos (n, k)
+
+        Args:
+            residuals (NDArray[float64]): Resíduos
+
+        Returns:
+            NDArray[float64]: Resíduos precondicionados
+        """
+        return residuals * self.inverse[:, None]
+
+
+class BlockJacobiPreconditioner:
+    """Precondicionador de Jacobi em blocos nodais 6x6"""
+    def __init__(self, blocks: NDArray[float64], indices: NDArray[np.int64]):
+        """Construtor
+
+        Args:
+            blocks (NDArray[float64]): (n_blocks, 6, 6) blocos da diagonal da matriz, com a
+                identidade nas posições dos graus de liberdade que faltam
+            indices (NDArray[np.int64]): (n_blocks, 6) linha da matriz de cada grau de
+                liberdade do bloco, -1 se faltar (restringido e fora do sistema)
+        """
+        self.indices = indices
+        self.valid = indices >= 0
+        self.inverse = np.linalg.inv(blocks)
+
+    @classmethod
+    def from_matrix(cls, matrix: sparse.spmatrix | NDArray[float64],
+                    indices: NDArray[np.int64]) -> 'BlockJacobiPreconditioner':
+        """Cria o precondicionador com os blocos nodais de uma matriz
+
+        Args:
+            matrix (sparse.spmatrix | NDArray[float64]): Matriz
+            indices (NDArray[np.int64]): (n_blocks, 6) linha de cada grau de liberdade do
+                bloco, -1 se faltar
+
+        Returns:
+            BlockJacobiPreconditioner: Precondicionador
+        """
+        order = matrix.shape[0]
+        matrix = sparse.coo_matrix(matrix)
+        row, column = np.asarray(matrix.row), np.asarray(matrix.col)
+        valid = indices >= 0
+        block_of = np.full(order, -1, dtype=np.int64)
+        local_of = np.zeros(order, dtype=np.int64)
+        block_of[indices[valid]] = np.nonzero(valid)[0]
+        local_of[indices[valid]] = np.nonzero(valid)[1]
+
+        # Termos da matriz com a linha e a coluna no mesmo bloco
+        inside = (block_of[row] >= 0) & (block_of[row] == block_of[column])
+        blocks = np.zeros([indices.shape[0], 6, 6])
+        np.add.at(blocks, (block_of[row[inside]],
+                           local_of[row[inside]],
+                           local_of[column[inside]]), matrix.data[inside])
+
+        missing = np.nonzero(~valid)
+        blocks[missing[0], missing[1], missing[1]] = 1.0
+
+        return cls(blocks, indices)
+
+    def apply(self, residuals: NDArray[float64]) -> NDArray[float64]:
+        """Aplica o precondicionador nos resíduos (n, k)
+
+        Args:
+            residuals (NDArray[float64]): Resíduos
+
+        Returns:
+            NDArray[float64]: Resíduos precondicionados
+        """
+        padded = np.zeros(self.indices.shape + residuals.shape[1:])
+        padded[self.valid] = residuals[self.indices[self.valid]]
+        padded = np.einsum('nij,nj...->ni...', self.inverse, padded)
+
+        result = np.zeros_like(residuals)
+        result[self.indices[self.valid]] = padded[self.valid]
+        return result
+
+
+class ConjugateGradient:
+    """Gradientes conjugados precondicionados para vários lados direitos
+
+    Todos os lados direitos iteram juntos (um produto pela matriz por iteração) e cada
+    coluna para quando o seu resíduo relativo chega na tolerância.
+    """
+    def __init__(self, matrix: typing.Any,
+                 preconditioner: JacobiPreconditioner | BlockJacobiPreconditioner,
+                 tolerance: float = 1e-10,
+                 max_iterations: int | None = None):
+        """Construtor
+
+        Args:
+            matrix (typing.Any): Matriz simétrica positiva definida, ou operador com
+                `matrix @ x` para arrays (n, k)
+            preconditioner (JacobiPreconditioner | BlockJacobiPreconditioner): Precondicionador
+            tolerance (float, optional): Resíduo relativo ||b - A x|| / ||b||.
+                Defaults to 1e-10.
+            max_iterations (int | None, optional): Limite de iterações. Defaults to None (10
+                vezes a ordem da matriz).
+        """
+        self.matrix = matrix
+        self.order = matrix.shape[0]
+        self.preconditioner = preconditioner
+        self.tolerance = tolerance
+        self.max_iterations = (max_iterations if max_iterations is not None
+                               else 10 * self.order)
+        # Iterações, resíduo relativo e convergência de cada lado direito da última solução
+        self.iterations: NDArray[np.int64] = np.array([], dtype=np.int64)
+        self.residuals: NDArray[float64] = np.array([])
+        self.converged: NDArray[np.bool_] = np.array([], dtype=bool)
+
+    def solve(self, rhs: NDArray[float64],
+              initial: NDArray[float64] | None = None,
+              names: list[str] | None = None) -> NDArray[float64]:
+        """Resolve o sistema para um ou vários lados direitos
+
+        Avisa (RuntimeWarning) quando algum lado direito não chega na tolerância em
+        `max_iterations` iterações (veja `converged` e `residuals`).
+
+        Args:
+            rhs (NDArray[float64]): (n,) vetor ou (n, n_rhs) matriz
+            initial (NDArray[float64] | None, optional): Solução inicial. Defaults to None
+                (zero).
+            names (list[str] | None, optional): Nomes dos lados direitos no aviso.
+                Defaults to None (os índices).
+
+        Returns:
+            NDArray[float64]: Solução com a forma de rhs
+        """
+        rhs = np.asarray(rhs, dtype=float)
+        b = rhs.reshape(self.order, -1)
+
+        if initial is None:
+            x = np.zeros_like(b)
+            r = b.copy()
+        else:
+            x = np.array(initial, dtype=float).reshape(b.shape)
+            r = b - self.matrix @ x
+
+        self.iterate(x, r, np.linalg.norm(b, axis=0))
+
+        if not self.converged.all():
+            labels = names if names is not None else [str(index) for index in range(b.shape[1])]
+            failed = ', '.join(f"'{labels[index]}' ({self.residuals[index]:.2e})"
+                               for index in np.flatnonzero(~self.converged))
+            warnings.warn(f"The conjugate gradient did not converge in {self.max_iterations} "
+                          f"iterations (tolerance {self.tolerance:.2e}). Relative residuals: "
+                          f"{failed}.", RuntimeWarning, stacklevel=2)
+
+        return x.reshape(rhs.shape)
+
+    def iterate(self, x: NDArray[float64], r: NDArray[float64],
+                norm_b: NDArray[float64]) -> None:
+        """Iterações dos gradientes conjugados, alterando x e r no lugar
+
+        Args:
+            x (NDArray[float64]): (n, k) soluções iniciais
+            r (NDArray[float64]): (n, k) resíduos iniciais
+            norm_b (NDArray[float64]): (k,) norma de cada lado direito
+        """
+        norm_b[norm_b == 0] = 1.0
+        z = self.preconditioner.apply(r)
+        p = z.copy()
+        rz = np.sum(r * z, axis=0)
+
+        self.iterations = np.zeros(r.shape[1], dtype=np.int64)
+        self.residuals = np.linalg.norm(r, axis=0) / norm_b
+        active = self.residuals > self.tolerance
+
+        for _ in range(self.max_iterations):
+            if not active.any():
+                break
+
+            columns = np.flatnonzero(active)
+            ap = np.asarray(self.matrix @ p[:, columns]).reshape(self.order, -1)
+            alpha = rz[columns] / np.sum(p[:, columns] * ap, axis=0)
+            x[:, columns] += alpha * p[:, columns]
+            r[:, columns] -= alpha * ap
+            self.iterations[columns] += 1
+
+            self.residuals[columns] = np.linalg.norm(r[:, columns], axis=0) / norm_b[columns]
+            active[columns] = self.residuals[columns] > self.tolerance
+            columns = np.flatnonzero(active)
+
+            z = self.preconditioner.apply(r[:, columns])
+            rz_new = np.sum(r[:, columns] * z, axis=0)
+            p[:, columns] = z + (rz_new / rz[columns]) * p[:, columns]
+            rz[columns] = rz_new
+
+        self.converged = ~active
+
+
+class LowRankUpdate:
+    """Correção de Sherman-Morrison-Woodbury sobre um solver já fatorado
+
+    Resolve (A + U C U^T) x = b com o solver de A, onde U seleciona os graus de liberdade
+    alterados e C é a soma (r, r) das alterações da matriz neles:
+
+    x = y - W (I + C U^T W)^-1 C U^T y, com y = A^-1 b e W = A^-1 U.
+
+    C pode ser singular (matrizes de elementos são). W é calculado uma vez por grau de
+    liberdade. Com a matriz atualizada, um passo de refinamento iterativo recupera a
+    precisão perdida em correções grandes (uma barra removida, por exemplo).
+    """
+    def __init__(self, base: Factorization | BandedFactorization,
+                 matrix: sparse.csr_matrix | NDArray[float64] | None = None):
+        """Construtor
+
+        Args:
+            base (Factorization | BandedFactorization): Solver da matriz original
+            matrix (sparse.csr_matrix | NDArray[float64] | None, optional): Matriz
+                atualizada, usada no refinamento iterativo. Defaults to None.
+        """
+        self.base = base
+        self.matrix = matrix
+        self.order = base.order
+        self.dofs = np.array([], dtype=np.int64) # Graus de liberdade alterados (colunas de U)
+        self.change = np.zeros([0, 0]) # C
+        self.w = np.zeros([self.order, 0]) # A^-1 U
+
+    @property
+    def rank(self) -> int:
+        """Número de graus de liberdade alterados"""
+        return self.dofs.size
+
+    def update(self, dofs: NDArray[np.int64], change: NDArray[float64]) -> None:
+        """Soma uma alteração da matriz em alguns graus de liberdade
+
+        Args:
+            dofs (NDArray[np.int64]): (m,) linhas/colunas da alteração (podem se repetir)
+            change (NDArray[float64]): (m, m) valores somados na matriz
+        """
+        dofs = np.asarray(dofs, dtype=np.int64)
+        new = np.setdiff1d(dofs, self.dofs)
+
+        if new.size:
+            unit = np.zeros([self.order, new.size])
+            unit[new, np.arange(new.size)] = 1.0
+            self.w = np.hstack((self.w, self.base.solve(unit).reshape(self.order, -1)))
+
+            change_matrix = np.zeros([self.rank + new.size] * 2)
+            change_matrix[:self.rank, :self.rank] = self.change
+            self.change = change_matrix
+            self.dofs = np.concatenate((self.dofs, new))
+
+        sorter = np.argsort(self.dofs)
+        position = sorter[np.searchsorted(self.dofs, dofs, sorter=sorter)]
+        np.add.at(self.change, (position[:, None], position[None, :]), change)
+
+    def solve(self, rhs: NDArray[float64]) -> NDArray[float64]:
+        """Resolve o sistema atualizado para um ou vários lados direitos
+
+        Args:
+            rhs (NDArray[float64]): (n,) vetor ou (n, n_rhs) matriz
+
+        Returns:
+            NDArray[float64]: Solução com a forma de rhs
+        """
+        solution = self._solve(rhs)
+        if self.matrix is None or self.rank == 0 or solution.size == 0:
+            return solution
+
+        residual = np.asarray(rhs, dtype=float) - self.matrix @ solution
+        return solution + self._solve(residual)
+
+    def _solve(self, rhs: NDArray[float64]) -> NDArray[float64]:
+        """Solução de Woodbury sem refinamento"""
+        solution = self.base.solve(rhs)
+        if self.rank == 0 or solution.size == 0:
+            return solution
+
+        y = solution.reshape(self.order, -1)
+        capacitance = np.eye(self.rank) + self.change @ self.w[self.dofs]
+        correction = np.linalg.solve(capacitance, self.change @ y[self.dofs])
+
+        return (y - self.w @ correction).reshape(solution.shape)
+
+
+class InverseOperator(sparse_linalg.LinearOperator):
+    """Solver da análise linear visto como o operador K^-1 (OPinv / Minv de `eigsh`)"""
+    def __init__(self, solver: (Factorization | BandedFactorization | ConjugateGradient
+                                | LowRankUpdate), order: int):
+        """Construtor
+
+        Args:
+            solver (Factorization | BandedFactorization | ConjugateGradient | LowRankUpdate):
+                Solver da matriz
+            order (int): Ordem da matriz
+        """
+        self.solver = solver
+        super().__init__(dtype=np.dtype(float64), shape=(order, order))
+
+    def _matvec(self, x: NDArray[float64]) -> NDArray[float64]:
+        return self.solver.solve(x)
+
+    def _matmat(self, X: NDArray[float64]) -> NDArray[float64]:
+        return self.solver.solve(X)
@@ -163,5 +163,12 @@ def calculate_json(path: str) -> Linear:
 
 
     # Analysis and return /////////////////////////////////////////////////////////////////////////
-    linear_analysis = Linear(nodes, bars, loads, supports)
+    linear_analysis = Linear(nodes, bars, loads, supports, calculate=False)
+
+    # Combinations (optional), calculated together with the load cases ****************************
+    for combination in data.get('combinations', []):
+        linear_analysis.add_combination(combination['name'], combination['factors'])
+
+    linear_analysis.calculate_structure()
+
     return linear_analysis
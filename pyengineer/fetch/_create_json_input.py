@@ -162,6 +162,11 @@ def create_json_input(path: str, analysis: Linear) -> None:
         })
     structure['loads'] = loads_dict
 
+    # Combinations ////////////////////////////////////////////////////////////////////////////////
+    if analysis.combinations:
+        structure['combinations'] = [{'name': name, 'factors': factors}
+                                     for name, factors in analysis.combinations.items()]
+
     # Write results to JSON file //////////////////////////////////////////////////////////////////
     with open(path, 'w', encoding='utf-8') as file:
         json.dump(structure, file, indent=2)
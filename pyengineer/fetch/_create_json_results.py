@@ -3,11 +3,15 @@ from typing import Dict, List
 import json
 
 from ..analysis._linear import Linear
+from ..analysis._results import Results
 
 
 def create_json_results(path: str, analysis: Linear) -> None:
     """Create a JSON results file for the linear analysis.
 
+    Each entry has the case name in 'load_case' and 'type' set to 'load_case' or
+    'combination'. The combinations come after the load cases.
+
     Args:
         path (str): The path to the JSON file to create.
         analysis (Linear): The linear analysis object containing results.
@@ -16,53 +20,87 @@ def create_json_results(path: str, analysis: Linear) -> None:
     results: List[Dict[str, str | list[Dict[str, str | float]]]] = []
 
     # Create dictionary structure for results *****************************************************
-    for index_load, load in enumerate(analysis.loads):
-        results.append({'load_case': load.name})
-        # Get displacements for each node under the current load case -----------------------------
-        displacements: list[Dict[str, str | float]] = []
-        for node in analysis.nodes:
-            disp_vector = analysis.get_displacements(node.name, load.name)
-            displacements.append({'node': node.name,
-                                         'Dx': disp_vector[0],
-                                         'Dy': disp_vector[1],
-                                         'Dz': disp_vector[2],
-                                         'Rx': disp_vector[3],
-                                         'Ry': disp_vector[4],
-                                         'Rz': disp_vector[5]})
-        results[index_load]['displacements'] = displacements
-
-        # Get reactions for each support under the current load case -----------------------------
-        reactions: list[Dict[str, str | float]] = []
-        for node in analysis.supports.nodes_support.keys():
-            reactions_vector = analysis.get_reactions(node.name, load.name)
-            reactions.append({'node': node.name,
-                              'Fx': reactions_vector[0],
-                              'Fy': reactions_vector[1],
-                              'Fz': reactions_vector[2],
-                              'Mx': reactions_vector[3],
-                              'My': reactions_vector[4],
-                              'Mz': reactions_vector[5]})
-        results[index_load]['reactions'] = reactions
-
-        # Get extreme forces for each bar under the current load case -----------------------------
-        extreme_forces: list[Dict[str, str | float]] = []
-        for bar in analysis.bars:
-            forces_vector = bar.extreme_forces[load.name]
-            extreme_forces.append({'bar': bar.name,
-                                   'Fxi': forces_vector[0],
-                                   'Fyi': forces_vector[1],
-                                   'Fzi': forces_vector[2],
-                                   'Mxi': forces_vector[3],
-                                   'Myi': forces_vector[4],
-                                   'Mzi': forces_vector[5],
-                                   'Fxj': forces_vector[6],
-                                   'Fyj': forces_vector[7],
-                                   'Fzj': forces_vector[8],
-                                   'Mxj': forces_vector[9],
-                                   'Myj': forces_vector[10],
-                                   'Mzj': forces_vector[11]})
-        results[index_load]['extreme_forces'] = extreme_forces
+    store = analysis.results
+    if store is None:
+        raise ValueError("The analysis has not been calculated.")
+
+    support_names = [node.name for node in analysis.supports.nodes_support.keys()]
+    for load in analysis.loads:
+        results.append({'load_case': load.name,
+                        'type': 'load_case',
+                        **_case_results(store, load.name, support_names)})
+
+    # Combinations ********************************************************************************
+    if analysis.combinations_results is not None:
+        for name in analysis.combinations_results.load_names:
+            results.append({'load_case': name,
+                            'type': 'combination',
+                            **_case_results(analysis.combinations_results, name,
+                                            support_names)})
 
     # Write results to JSON file //////////////////////////////////////////////////////////////////
     with open(path, 'w', encoding='utf-8') as file:
         json.dump(results, file, indent=2)
+
+
+def _case_results(store: Results, case_name: str,
+                  support_names: list[str]) -> Dict[str, list[Dict[str, str | float]]]:
+    """Displacements, reactions and extreme forces of one load case (or combination)
+
+    Args:
+        store (Results): Results of the analysis
+        case_name (str): Name of the load case in the results
+        support_names (list[str]): Names of the supported nodes
+
+    Returns:
+        Dict[str, list[Dict[str, str | float]]]: Lists of displacements, reactions and
+            extreme forces
+    """
+    case: Dict[str, list[Dict[str, str | float]]] = {}
+
+    # Get displacements for each node under the current load case ---------------------------------
+    displacements: list[Dict[str, str | float]] = []
+    for node_name, disp_vector in zip(store.node_names,
+                                      store.get_displacements(None, case_name).tolist()):
+        displacements.append({'node': node_name,
+                              'Dx': disp_vector[0],
+                              'Dy': disp_vector[1],
+                              'Dz': disp_vector[2],
+                              'Rx': disp_vector[3],
+                              'Ry': disp_vector[4],
+                              'Rz': disp_vector[5]})
+    case['displacements'] = displacements
+
+    # Get reactions for each support under the current load case ---------------------------------
+    reactions: list[Dict[str, str | float]] = []
+    for node_name, reactions_vector in zip(
+            support_names, store.get_reactions(support_names, case_name).tolist()):
+        reactions.append({'node': node_name,
+                          'Fx': reactions_vector[0],
+                          'Fy': reactions_vector[1],
+                          'Fz': reactions_vector[2],
+                          'Mx': reactions_vector[3],
+                          'My': reactions_vector[4],
+                          'Mz': reactions_vector[5]})
+    case['reactions'] = reactions
+
+    # Get extreme forces for each bar under the current load case ---------------------------------
+    extreme_forces: list[Dict[str, str | float]] = []
+    for bar_name, forces_vector in zip(store.bar_names,
+                                       store.get_bars_forces(None, case_name).tolist()):
+        extreme_forces.append({'bar': bar_name,
+                               'Fxi': forces_vector[0],
+                               'Fyi': forces_vector[1],
+                               'Fzi': forces_vector[2],
+                               'Mxi': forces_vector[3],
+                               'Myi': forces_vector[4],
+                               'Mzi': forces_vector[5],
+                               'Fxj': forces_vector[6],
+                               'Fyj': forces_vector[7],
+                               'Fzj': forces_vector[8],
+                               'Mxj': forces_vector[9],
+                               'Myj': forces_vector[10],
+                               'Mzj': forces_vector[11]})
+    case['extreme_forces'] = extreme_forces
+
+    return case
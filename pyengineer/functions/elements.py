@@ -0,0 +1,383 @@
+"""Matrizes de elementos de barra calculadas para várias barras ao mesmo tempo"""
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from numpy import float64
+
+
+def local_stiffness(length: ArrayLike,
+                    section: tuple[ArrayLike, ArrayLike, ArrayLike, ArrayLike],
+                    material: tuple[ArrayLike, ArrayLike]) -> NDArray[float64]:
+    """Matrizes de rigidez locais de barras de pórtico 3D, sem liberações
+
+    Os valores podem ser escalares ou arrays (broadcast).
+
+    Args:
+        length (ArrayLike): Comprimento das barras
+        section (tuple[ArrayLike, ...]): Área e inércias Ix (torção), Iy e Iz das seções
+        material (tuple[ArrayLike, ArrayLike]): Módulos de elasticidade E e G dos materiais
+
+    Returns:
+        NDArray[float64]: (n_bars, 12, 12) matrizes de rigidez locais
+    """
+    l, a, ix, iy, iz, e, g = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(value, dtype=float)) for value in (length, *section,
+                                                                    *material)))
+
+    kl = np.zeros([l.size, 12, 12])
+
+    # Triângulo superior; a diagonal é dividida por 2 porque é somada duas vezes no fim
+    kl[:, 0, 0] = (e * a) / l / 2
+    kl[:, 0, 6] = -(e * a) / l
+    kl[:, 1, 1] = (12 * e * iz) / l**3 / 2
+    kl[:, 1, 5] = (6 * e * iz) / l**2
+    kl[:, 1, 7] = -(12 * e * iz) / l**3
+    kl[:, 1, 11] = (6 * e * iz) / l**2
+    kl[:, 2, 2] = (12 * e * iy) / l**3 / 2
+    kl[:, 2, 4] = (-6 * e * iy) / l**2
+    kl[:, 2, 8] = -(12 * e * iy) / l**3
+    kl[:, 2, 10] = (-6 * e * iy) / l**2
+    kl[:, 3, 3] = (g * ix) / l / 2
+    kl[:, 3, 9] = -(g * ix) / l
+    kl[:, 4, 4] = (4 * e * iy) / l / 2
+    kl[:, 4, 8] = (6 * e * iy) / l**2
+    kl[:, 4, 10] = (2 * e * iy) / l
+    kl[:, 5, 5] = (4 * e * iz) / l / 2
+    kl[:, 5, 7] = -(6 * e * iz) / l**2
+    kl[:, 5, 11] = (2 * e * iz) / l
+    kl[:, 6, 6] = kl[:, 0, 0]
+    kl[:, 7, 7] = kl[:, 1, 1]
+    kl[:, 7, 11] = -(6 * e * iz) / l**2
+    kl[:, 8, 8] = kl[:, 2, 2]
+    kl[:, 8, 10] = (6 * e * iy) / l**2
+    kl[:, 9, 9] = kl[:, 3, 3]
+    kl[:, 10, 10] = kl[:, 4, 4]
+    kl[:, 11, 11] = kl[:, 5, 5]
+
+    return kl + kl.transpose(0, 2, 1)
+
+
+def local_mass(length: ArrayLike,
+               area: ArrayLike,
+               rho: ArrayLike,
+               polar: ArrayLike,
+               lumped: bool = False) -> NDArray[float64]:
+    """Matrizes de massa locais de barras de pórtico 3D
+
+    As matrizes consistentes usam as funções de forma cúbicas (Hermite) da rigidez. As
+    discretas (lumped) são a diagonal HRZ das consistentes: translações rho*A*L/2, torção
+    rho*J*L/2 e rotações de flexão rho*A*L^3/78.
+
+    Args:
+        length (ArrayLike): Comprimento das barras
+        area (ArrayLike): Área das seções
+        rho (ArrayLike): Massa específica dos materiais
+        polar (ArrayLike): Momento polar de inércia das seções (Iy + Iz)
+        lumped (bool, optional): Matrizes diagonais (massas discretas). Defaults to False.
+
+    Returns:
+        NDArray[float64]: (n_bars, 12, 12) matrizes de massa locais
+    """
+    l, a, rho, j = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(value, dtype=float)) for value in (length, area,
+                                                                    rho, polar)))
+    m = rho * a * l # Massa das barras
+
+    ml = np.zeros([l.size, 12, 12])
+
+    if lumped:
+        for index in (0, 1, 2, 6, 7, 8):
+            ml[:, index, index] = m / 2
+        ml[:, 3, 3] = ml[:, 9, 9] = rho * j * l / 2
+        for index in (4, 5, 10, 11):
+            ml[:, index, index] = m * l**2 / 78
+        return ml
+
+    # Triângulo superior; a diagonal é dividida por 2 porque é somada duas vezes no fim
+    ml[:, 0, 0] = m / 3 / 2
+    ml[:, 0, 6] = m / 6
+    ml[:, 1, 1] = 13 * m / 35 / 2
+    ml[:, 1, 5] = 11 * m * l / 210
+    ml[:, 1, 7] = 9 * m / 70
+    ml[:, 1, 11] = -13 * m * l / 420
+    ml[:, 2, 2] = 13 * m / 35 / 2
+    ml[:, 2, 4] = -11 * m * l / 210
+    ml[:, 2, 8] = 9 * m / 70
+    ml[:, 2, 10] = 13 * m * l / 420
+    ml[:, 3, 3] = rho * j * l / 3 / 2
+    ml[:, 3, 9] = rho * j * l / 6
+    ml[:, 4, 4] = m * l**2 / 105 / 2
+    ml[:, 4, 8] = -13 * m * l / 420
+    ml[:, 4, 10] = -m * l**2 / 140
+    ml[:, 5, 5] = m * l**2 / 105 / 2
+    ml[:, 5, 7] = 13 * m * l / 420
+    ml[:, 5, 11] = -m * l**2 / 140
+    ml[:, 6, 6] = ml[:, 0, 0]
+    ml[:, 7, 7] = ml[:, 1, 1]
+    ml[:, 7, 11] = -11 * m * l / 210
+    ml[:, 8, 8] = ml[:, 2, 2]
+    ml[:, 8, 10] = 11 * m * l / 210
+    ml[:, 9, 9] = ml[:, 3, 3]
+    ml[:, 10, 10] = ml[:, 4, 4]
+    ml[:, 11, 11] = ml[:, 5, 5]
+
+    return ml + ml.transpose(0, 2, 1)
+
+
+def local_geometric_stiffness(length: ArrayLike,
+                              axial: ArrayLike,
+                              area: ArrayLike,
+                              polar: ArrayLike) -> NDArray[float64]:
+    """Matrizes de rigidez geométrica locais de barras de pórtico 3D, sem liberações
+
+    Matrizes consistentes das funções de forma cúbicas (Hermite) para uma força normal
+    constante (tração positiva), com o termo de torção N*Ip/(A*L).
+
+    Args:
+        length (ArrayLike): Comprimento das barras
+        axial (ArrayLike): Força normal das barras (tração positiva)
+        area (ArrayLike): Área das seções
+        polar (ArrayLike): Momento polar de inércia das seções (Iy + Iz)
+
+    Returns:
+        NDArray[float64]: (n_bars, 12, 12) matrizes de rigidez geométrica locais
+    """
+    l, n, a, j = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(value, dtype=float)) for value in (length, axial,
+                                                                    area, polar)))
+    p = n / l
+
+    kg = np.zeros([l.size, 12, 12])
+
+    # Triângulo superior; a diagonal é dividida por 2 porque é somada duas vezes no fim
+    kg[:, 1, 1] = 6 * p / 5 / 2
+    kg[:, 1, 5] = p * l / 10
+    kg[:, 1, 7] = -6 * p / 5
+    kg[:, 1, 11] = p * l / 10
+    kg[:, 2, 2] = 6 * p / 5 / 2
+    kg[:, 2, 4] = -p * l / 10
+    kg[:, 2, 8] = -6 * p / 5
+    kg[:, 2, 10] = -p * l / 10
+    kg[:, 3, 3] = p * j / a / 2
+    kg[:, 3, 9] = -p * j / a
+    kg[:, 4, 4] = 2 * p * l**2 / 15 / 2
+    kg[:, 4, 8] = p * l / 10
+    kg[:, 4, 10] = -p * l**2 / 30
+    kg[:, 5, 5] = 2 * p * l**2 / 15 / 2
+    kg[:, 5, 7] = -p * l / 10
+    kg[:, 5, 11] = -p * l**2 / 30
+    kg[:, 7, 7] = kg[:, 1, 1]
+    kg[:, 7, 11] = -p * l / 10
+    kg[:, 8, 8] = kg[:, 2, 2]
+    kg[:, 8, 10] = p * l / 10
+    kg[:, 9, 9] = kg[:, 3, 3]
+    kg[:, 10, 10] = kg[:, 4, 4]
+    kg[:, 11, 11] = kg[:, 5, 5]
+
+    return kg + kg.transpose(0, 2, 1)
+
+
+def _assistant_directions(axis_x: NDArray[float64],
+                          rotation: NDArray[float64],
+                          y_up: NDArray[np.bool_]) -> NDArray[float64]:
+    """Direções auxiliares que definem o plano xy das barras
+
+    Args:
+        axis_x (NDArray[float64]): (n_bars, 3) eixos x locais
+        rotation (NDArray[float64]): (n_bars,) rotações das barras em graus
+        y_up (NDArray[np.bool_]): (n_bars,) True se 'y' é o eixo vertical
+
+    Returns:
+        NDArray[float64]: (n_bars, 3) direções auxiliares já rotacionadas
+    """
+    # Initial assistant direction *****************************************************************
+    assistant = np.zeros_like(axis_x)
+    dx, dy, dz = axis_x.T
+    # y up: y global, ou x global para barras paralelas a y
+    y_parallel = y_up & (dx == 0) & (dz == 0)
+    assistant[y_up & ~y_parallel, 1] = 1
+    assistant[y_parallel, 0] = 1
+    # z up: z global, ou -x/+x para barras verticais subindo/descendo
+    z_vertical = ~y_up & (dx == 0) & (dy == 0)
+    assistant[~y_up & ~z_vertical, 2] = 1
+    assistant[z_vertical, 0] = np.where(dz[z_vertical] > 0, -1, 1)
+
+    # Rotate assistant direction around x axis (Rodrigues) ****************************************
+    angle = np.deg2rad(rotation + np.where(y_up, 0, -90))[:, None] # sum -90 deg for z up
+    return (assistant * np.cos(angle) + np.cross(axis_x, assistant) * np.sin(angle) +
+            axis_x * np.sum(axis_x * assistant, axis=1)[:, None] * (1 - np.cos(angle)))
+
+
+def direction_cosines(start: ArrayLike,
+                      end: ArrayLike,
+                      rotation: ArrayLike = 0,
+                      y_up: ArrayLike = False) -> NDArray[float64]:
+    """Cossenos diretores (eixos locais em coordenadas globais) de várias barras
+
+    Args:
+        start (ArrayLike): (n_bars, 3) coordenadas dos nós iniciais
+        end (ArrayLike): (n_bars, 3) coordenadas dos nós finais
+        rotation (ArrayLike, optional): Rotação das barras em torno do eixo, em graus.
+            Defaults to 0.
+        y_up (ArrayLike, optional): Usa 'y' como eixo vertical no lugar de 'z'.
+            Defaults to False.
+
+    Returns:
+        NDArray[float64]: (n_bars, 3, 3) matrizes com os eixos locais x, y e z nas linhas
+    """
+    delta = (np.asarray(end, dtype=float).reshape(-1, 3) -
+             np.asarray(start, dtype=float).reshape(-1, 3))
+    n_bars = delta.shape[0]
+
+    axis_x = delta / np.linalg.norm(delta, axis=1)[:, None]
+    assistant = _assistant_directions(
+        axis_x, np.broadcast_to(np.asarray(rotation, dtype=float), (n_bars,)),
+        np.broadcast_to(np.asarray(y_up, dtype=bool), (n_bars,)))
+
+    axis_z = np.cross(axis_x, assistant)
+    axis_z /= np.linalg.norm(axis_z, axis=1)[:, None]
+    axis_y = np.cross(axis_z, axis_x)
+
+    return np.stack((axis_x, axis_y, axis_z), axis=1)
+
+
+def to_global(matrices: NDArray[float64], rotations: NDArray[float64]) -> NDArray[float64]:
+    """Transforma matrizes de elementos das coordenadas locais para as globais (R^T @ K @ R)
+
+    Cada um dos dezesseis blocos 3x3 de K é transformado separadamente.
+
+    Args:
+        matrices (NDArray[float64]): (n_bars, 12, 12) matrizes em coordenadas locais
+        rotations (NDArray[float64]): (n_bars, 3, 3) cossenos diretores
+
+    Returns:
+        NDArray[float64]: (n_bars, 12, 12) matrizes em coordenadas globais
+    """
+    n_bars = matrices.shape[0]
+    blocks = matrices.reshape(n_bars, 4, 3, 4, 3)
+    blocks = np.einsum('nji,najbk,nkl->naibl', rotations, blocks, rotations, optimize=True)
+    return blocks.reshape(n_bars, 12, 12)
+
+
+def rotate_vectors(rotations: NDArray[float64],
+                   vectors: NDArray[float64],
+                   transpose: bool = False) -> NDArray[float64]:
+    """Rotaciona vetores de 12 componentes das barras pelos blocos 3x3
+
+    Args:
+        rotations (NDArray[float64]): (n_bars, 3, 3) cossenos diretores
+        vectors (NDArray[float64]): (n_bars, 12) ou (n_bars, 12, m) vetores
+        transpose (bool, optional): Usa R^T (local para global) no lugar de R (global para
+            local). Defaults to False.
+
+    Returns:
+        NDArray[float64]: Vetores rotacionados, com o mesmo formato de `vectors`
+    """
+    n_bars = vectors.shape[0]
+    blocks = vectors.reshape(n_bars, 4, 3, -1)
+    subscripts = 'nji,najm->naim' if transpose else 'nij,najm->naim'
+    return np.einsum(subscripts, rotations, blocks).reshape(vectors.shape)
+
+
+def _condense_pattern(matrices: NDArray[float64],
+                      pattern: NDArray[np.bool_],
+                      tol: float) -> tuple[NDArray[float64], NDArray[float64]]:
+    """Condensação estática de barras com o mesmo padrão de liberações
+
+    Args:
+        matrices (NDArray[float64]): (n, 12, 12) matrizes locais sem liberações
+        pattern (NDArray[np.bool_]): (12,) True para os graus de liberdade liberados
+        tol (float): Tolerância para a verificação de singularidade
+
+    Returns:
+        tuple[NDArray[float64], NDArray[float64]]: Matrizes condensadas e operadores de
+            condensação das cargas
+    """
+    r_idx = np.flatnonzero(pattern) # Released DOFs
+    k_idx = np.flatnonzero(~pattern) # Maintained DOFs
+    k_kr = matrices[:, k_idx[:, None], r_idx]
+    k_rr = matrices[:, r_idx[:, None], r_idx]
+
+    # Inverte K_rr; se for singular, usa a pseudo-inversa
+    krr_inv = np.linalg.pinv(k_rr)
+    regular = np.linalg.cond(k_rr) < 1.0 / tol
+    if regular.any():
+        krr_inv[regular] = np.linalg.inv(k_rr[regular])
+
+    transfer = -k_kr @ krr_inv # (n, n_k, n_r)
+
+    condensed = np.zeros_like(matrices)
+    condensed[:, k_idx[:, None], k_idx] = (matrices[:, k_idx[:, None], k_idx] +
+                                           transfer @ k_kr.transpose(0, 2, 1))
+    operators = np.zeros_like(matrices)
+    operators[:, k_idx, k_idx] = 1
+    operators[:, k_idx[:, None], r_idx] = transfer
+
+    return condensed, operators
+
+
+def condense_releases(matrices: NDArray[float64],
+                      releases: NDArray[np.bool_],
+                      tol: float = 1e-12) -> tuple[NDArray[float64], NDArray[float64]]:
+    """Condensação estática dos graus de liberdade liberados de várias barras
+
+    As barras são agrupadas por padrão de liberações: K_c = K_kk - K_kr @ K_rr^-1 @ K_rk.
+    Os operadores T condensam os vetores de cargas (f_c = T @ f).
+
+    Args:
+        matrices (NDArray[float64]): (n_bars, 12, 12) matrizes locais sem liberações
+        releases (NDArray[np.bool_]): (n_bars, 12) True para os graus de liberdade liberados
+        tol (float, optional): Tolerância para a verificação de singularidade.
+            Defaults to 1e-12.
+
+    Returns:
+        tuple[NDArray[float64], NDArray[float64]]: (n_bars, 12, 12) matrizes condensadas e
+            (n_bars, 12, 12) operadores de condensação das cargas
+    """
+    releases = np.asarray(releases, dtype=bool).reshape(-1, 12)
+    condensed = matrices.copy()
+    operators = np.zeros_like(matrices)
+    operators[:] = np.eye(12)
+
+    if not releases.any():
+        return condensed, operators
+
+    patterns, inverse = np.unique(releases, axis=0, return_inverse=True)
+    for pattern_index, pattern in enumerate(patterns):
+        if pattern.any():
+            selected = np.flatnonzero(inverse.ravel() == pattern_index)
+            condensed[selected], operators[selected] = _condense_pattern(matrices[selected],
+                                                                         pattern, tol)
+
+    return condensed, operators
+
+
+# Convenção de sinais dos esforços nas extremidades (esforços internos em coordenadas locais)
+END_FORCES_SIGNS = np.array([-1,  1,  1,  1,  1, -1,
+                              1, -1, -1, -1, -1,  1], dtype=float)
+
+
+def end_forces(matrices: NDArray[float64],
+               rotations: NDArray[float64],
+               displacements: NDArray[float64],
+               fixed_end: NDArray[float64] | None = None) -> NDArray[float64]:
+    """Esforços internos nas extremidades de várias barras, em coordenadas locais
+
+    f = sinal * (K_local @ R @ u - R @ f_engastamento) para cada barra e coluna de u.
+
+    Args:
+        matrices (NDArray[float64]): (n_bars, 12, 12) matrizes de rigidez locais (com
+            liberações)
+        rotations (NDArray[float64]): (n_bars, 3, 3) cossenos diretores
+        displacements (NDArray[float64]): (n_bars, 12, m) deslocamentos dos graus de
+            liberdade das barras em coordenadas globais
+        fixed_end (NDArray[float64] | None, optional): (n_bars, 12, m) esforços de
+            engastamento perfeito em coordenadas globais. Defaults to None.
+
+    Returns:
+        NDArray[float64]: (n_bars, 12, m) esforços nas extremidades
+    """
+    local = np.einsum('nij,njm->nim', matrices, rotate_vectors(rotations, displacements))
+    if fixed_end is not None:
+        local -= rotate_vectors(rotations, fixed_end)
+
+    return local * END_FORCES_SIGNS[:, None]
@@ -2,67 +2,87 @@
 Functions to calculate reactions in bars with point load.
 All functions fo point loads in "Análise de Estruturas" by
     Umberto Lima Soriano and Silvio de Souza Lima.
+The functions also accept arrays of lengths, positions and intensities (one load each).
 """
-from typing import Dict, Literal
+from typing import Dict, Literal, Mapping, overload
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from numpy import float64
 
 
 # Forces //////////////////////////////////////////////////////////////////////////////////////////
 # Force in x direction ****************************************************************************
+@overload
+def force_x(length: float, x: float, p: float
+            ) -> Dict[Literal['Rxa', 'Rxb'], float]: ...
+@overload
+def force_x(length: ArrayLike, x: ArrayLike, p: ArrayLike
+            ) -> Mapping[Literal['Rxa', 'Rxb'], NDArray[float64] | float]: ...
 def force_x(
-        length: float,
-        x: float,
-        p: float
-    ) -> Dict[Literal['Rxa', 'Rxb'], float]:
+        length: ArrayLike,
+        x: ArrayLike,
+        p: ArrayLike
+    ) -> Mapping[Literal['Rxa', 'Rxb'], NDArray[float64] | float]:
     """Calculates the reactions of a bar with a point axial load in x direction.
 
     Args:
-        length (float): Length of the bar
-        x (float): Position of the load
-        p (float): Intensity of the load
+        length (ArrayLike): Length of the bar
+        x (ArrayLike): Position of the load
+        p (ArrayLike): Intensity of the load
 
     Raises:
         ValueError: If the position is not in the range 0 <= x <= L
 
     Returns:
-        Dict[Literal['Rxa', 'Rxb'], float]: The reactions at the two ends of the bar (A and B)
+        Mapping[Literal['Rxa', 'Rxb'], NDArray[float64] | float]:
+            The reactions at the two ends of the bar (A and B)
     """
-    if (0 <= x <= length) is False:
+    l = np.asarray(length, dtype=float)
+    a = np.asarray(x, dtype=float)
+    if not np.all((a >= 0) & (a <= l)):
         raise ValueError("Need 0 <= x <= L.")
 
-    a = x
-    b = length - x
-    l = length
+    b = l - a
+    p = np.asarray(p, dtype=float)
     reaction_a = -p * b / l
     reaction_b = -p * a / l
 
     return {'Rxa': reaction_a, 'Rxb': reaction_b}
 
 # Force in y direction ****************************************************************************
+@overload
+def force_y(length: float, x: float, p: float
+            ) -> Dict[Literal['Rya', 'Ryb', 'Mza', 'Mzb'], float]: ...
+@overload
+def force_y(length: ArrayLike, x: ArrayLike, p: ArrayLike
+            ) -> Mapping[Literal['Rya', 'Ryb', 'Mza', 'Mzb'], NDArray[float64] | float]: ...
 def force_y(
-        length: float,
-        x: float,
-        p: float
-    ) -> Dict[Literal['Rya', 'Ryb', 'Mza', 'Mzb'], float]:
+        length: ArrayLike,
+        x: ArrayLike,
+        p: ArrayLike
+    ) -> Mapping[Literal['Rya', 'Ryb', 'Mza', 'Mzb'], NDArray[float64] | float]:
     """Calculates the reactions of a bar with a point transverse load in y direction.
 
     Args:
-        length (float): Length of the bar
-        x (float): Position of the load
-        p (float): Intensity of the load
+        length (ArrayLike): Length of the bar
+        x (ArrayLike): Position of the load
+        p (ArrayLike): Intensity of the load
 
     Raises:
         ValueError: If the position is not in the range 0 <= x <= L
 
     Returns:
-        Dict[Literal['Rya', 'Ryb', 'Mza', 'Mzb'], float]:
+        Mapping[Literal['Rya', 'Ryb', 'Mza', 'Mzb'], NDArray[float64] | float]:
             The reactions at the two ends of the bar (A and B)
     """
-    if (0 <= x <= length) is False:
+    l = np.asarray(length, dtype=float)
+    a = np.asarray(x, dtype=float)
+    if not np.all((a >= 0) & (a <= l)):
         raise ValueError("Need 0 <= x <= L.")
 
-    a = x
-    b = length - x
-    l = length
+    b = l - a
+    p = np.asarray(p, dtype=float)
 
     moment_a = -(p * a * b**2) / l**2
     moment_b = (p * a**2 * b) / l**2
@@ -72,31 +92,38 @@ def force_y(
     return {'Rya': reaction_a, 'Ryb': reaction_b, 'Mza': moment_a, 'Mzb': moment_b}
 
 # Force in z direction ****************************************************************************
+@overload
+def force_z(length: float, x: float, p: float
+            ) -> Dict[Literal['Rza', 'Rzb', 'Mya', 'Myb'], float]: ...
+@overload
+def force_z(length: ArrayLike, x: ArrayLike, p: ArrayLike
+            ) -> Mapping[Literal['Rza', 'Rzb', 'Mya', 'Myb'], NDArray[float64] | float]: ...
 def force_z(
-        length: float,
-        x: float,
-        p: float
-    ) -> Dict[Literal['Rza', 'Rzb', 'Mya', 'Myb'], float]:
+        length: ArrayLike,
+        x: ArrayLike,
+        p: ArrayLike
+    ) -> Mapping[Literal['Rza', 'Rzb', 'Mya', 'Myb'], NDArray[float64] | float]:
     """Calculates the reactions of a bar with a point transverse load in z direction.
 
     Args:
-        length (float): Length of the bar
-        x (float): Position of the load
-        p (float): Intensity of the load
+        length (ArrayLike): Length of the bar
+        x (ArrayLike): Position of the load
+        p (ArrayLike): Intensity of the load
 
     Raises:
         ValueError: If the position is not in the range 0 <= x <= L
 
     Returns:
-        Dict[Literal['Rza', 'Rzb', 'Mya', 'Myb'], float]:
+        Mapping[Literal['Rza', 'Rzb', 'Mya', 'Myb'], NDArray[float64] | float]:
             The reactions at the two ends of the bar (A and B)
     """
-    if (0 <= x <= length) is False:
+    l = np.asarray(length, dtype=float)
+    a = np.asarray(x, dtype=float)
+    if not np.all((a >= 0) & (a <= l)):
         raise ValueError("Need 0 <= x <= L.")
 
-    a = x
-    b = length - x
-    l = length
+    b = l - a
+    p = np.asarray(p, dtype=float)
 
     moment_a = (p * a * b**2) / l**2
     moment_b = -(p * a**2 * b) / l**2
@@ -107,27 +134,35 @@ def force_z(
 
 # Moments /////////////////////////////////////////////////////////////////////////////////////////
 # Moment in x direction ***************************************************************************
+@overload
+def moment_x(length: float, x: float, m: float
+             ) -> Dict[Literal['Mxa', 'Mxb'], float]: ...
+@overload
+def moment_x(length: ArrayLike, x: ArrayLike, m: ArrayLike
+             ) -> Mapping[Literal['Mxa', 'Mxb'], NDArray[float64] | float]: ...
 def moment_x(
-        length: float,
-        x: float,
-        m: float
-    ) -> Dict[Literal['Mxa', 'Mxb'], float]:
+        length: ArrayLike,
+        x: ArrayLike,
+        m: ArrayLike
+    ) -> Mapping[Literal['Mxa', 'Mxb'], NDArray[float64] | float]:
     """Calculates the reactions of a bar with a point moment around x axis.
     Args:
-        length (float): Length of the bar
-        x (float): Position of the moment
-        m (float): Intensity of the moment
+        length (ArrayLike): Length of the bar
+        x (ArrayLike): Position of the moment
+        m (ArrayLike): Intensity of the moment
     Raises:
         ValueError: If the position is not in the range 0 <= x <= L
     Returns:
-        Dict[Literal['Mxa', 'Mxb'], float]: The reactions at the two ends of the bar (A and B)
+        Mapping[Literal['Mxa', 'Mxb'], NDArray[float64] | float]:
+            The reactions at the two ends of the bar (A and B)
     """
-    if (0 <= x <= length) is False:
+    l = np.asarray(length, dtype=float)
+    a = np.asarray(x, dtype=float)
+    if not np.all((a >= 0) & (a <= l)):
         raise ValueError("Need 0 <= x <= L.")
 
-    a = x
-    b = length - x
-    l = length
+    b = l - a
+    m = np.asarray(m, dtype=float)
 
     torque_a = -m * b / l
     torque_b = -m * a / l
@@ -135,28 +170,35 @@ def moment_x(
     return {'Mxa': torque_a, 'Mxb': torque_b}
 
 # Moment in y direction ***************************************************************************
+@overload
+def moment_y(length: float, x: float, m: float
+             ) -> Dict[Literal['Mya', 'Myb', 'Rza', 'Rzb'], float]: ...
+@overload
+def moment_y(length: ArrayLike, x: ArrayLike, m: ArrayLike
+             ) -> Mapping[Literal['Mya', 'Myb', 'Rza', 'Rzb'], NDArray[float64] | float]: ...
 def moment_y(
-        length: float,
-        x: float,
-        m: float
-    ) -> Dict[Literal['Mya', 'Myb', 'Rza', 'Rzb'], float]:
+        length: ArrayLike,
+        x: ArrayLike,
+        m: ArrayLike
+    ) -> Mapping[Literal['Mya', 'Myb', 'Rza', 'Rzb'], NDArray[float64] | float]:
     """Calculates the reactions of a bar with a point moment around y axis.
     Args:
-        length (float): Length of the bar
-        x (float): Position of the moment
-        m (float): Intensity of the moment
+        length (ArrayLike): Length of the bar
+        x (ArrayLike): Position of the moment
+        m (ArrayLike): Intensity of the moment
     Raises:
         ValueError: If the position is not in the range 0 <= x <= L
     Returns:
-        Dict[Literal['Mya', 'Myb', 'Rza', 'Rzb'], float]:
+        Mapping[Literal['Mya', 'Myb', 'Rza', 'Rzb'], NDArray[float64] | float]:
             The reactions at the two ends of the bar (A and B)
     """
-    if (0 <= x <= length) is False:
+    l = np.asarray(length, dtype=float)
+    a = np.asarray(x, dtype=float)
+    if not np.all((a >= 0) & (a <= l)):
         raise ValueError("Need 0 <= x <= L.")
 
-    a = x
-    b = length - x
-    l = length
+    b = l - a
+    m = np.asarray(m, dtype=float)
 
     moment_a = ((m * b) / l**2) * (2*a - b)
     moment_b = ((m * a) / l**2) * (2*b - a)
@@ -166,28 +208,35 @@ def moment_y(
     return {'Mya': moment_a, 'Myb': moment_b, 'Rza': reaction_a, 'Rzb': reaction_b}
 
 # Moment in z direction ***************************************************************************
+@overload
+def moment_z(length: float, x: float, m: float
+             ) -> Dict[Literal['Mza', 'Mzb', 'Rya', 'Ryb'], float]: ...
+@overload
+def moment_z(length: ArrayLike, x: ArrayLike, m: ArrayLike
+             ) -> Mapping[Literal['Mza', 'Mzb', 'Rya', 'Ryb'], NDArray[float64] | float]: ...
 def moment_z(
-        length: float,
-        x: float,
-        m: float
-    ) -> Dict[Literal['Mza', 'Mzb', 'Rya', 'Ryb'], float]:
+        length: ArrayLike,
+        x: ArrayLike,
+        m: ArrayLike
+    ) -> Mapping[Literal['Mza', 'Mzb', 'Rya', 'Ryb'], NDArray[float64] | float]:
     """Calculates the reactions of a bar with a point moment around z axis.
     Args:
-        length (float): Length of the bar
-        x (float): Position of the moment
-        m (float): Intensity of the moment
+        length (ArrayLike): Length of the bar
+        x (ArrayLike): Position of the moment
+        m (ArrayLike): Intensity of the moment
     Raises:
         ValueError: If the position is not in the range 0 <= x <= L
     Returns:
-        Dict[Literal['Mza', 'Mzb', 'Rya', 'Ryb'], float]:
+        Mapping[Literal['Mza', 'Mzb', 'Rya', 'Ryb'], NDArray[float64] | float]:
             The reactions at the two ends of the bar (A and B)
     """
-    if (0 <= x <= length) is False:
+    l = np.asarray(length, dtype=float)
+    a = np.asarray(x, dtype=float)
+    if not np.all((a >= 0) & (a <= l)):
         raise ValueError("Need 0 <= x <= L.")
 
-    a = x
-    b = length - x
-    l = length
+    b = l - a
+    m = np.asarray(m, dtype=float)
 
     moment_a = ((m * b) / l**2) * (2*a - b)
     moment_b = ((m * a) / l**2) * (2*b - a)
@@ -11,7 +11,7 @@ from ._material import Material
 from ._node import Node
 from ._section import Section
 
-from ..functions import space_3d
+from ..functions import elements
 from ..functions.reactions import point as pt
 from ..functions.reactions import section as sc
 
@@ -59,12 +59,12 @@ class Bar:
         self.kl: NDArray[float64] =  np.zeros([12, 12]) # Matriz of local stiffness
         # Matriz of local stiffness without releases
         self.kl_nr: NDArray[float64] = np.zeros([12, 12])
-        self.r: NDArray[float64]  = np.zeros([12, 12]) # Matriz of rotation
+        self.r: NDArray[float64]  = np.zeros([3, 3]) # Matriz of rotation (direction cosines)
         self.klg: NDArray[float64]  = np.zeros([12, 12]) # Matriz de rigidez nas coordenadas globais
+        # Operador de condensação das liberações para os vetores de cargas (f_c = T @ f)
+        self.releases_operator: NDArray[float64] = np.eye(12)
         self.y_up = False # Modify default up for compare with PyNite
         self.extreme_forces: dict[str, NDArray[float64]] = {}
-        # Vector of all loads in global coordinates
-        self.vector_loads: NDArray[float64] = np.zeros(12)
 
     def calculate_klg(self) -> NDArray[float64]:
         """Transforma a matriz de rigidez local em global
@@ -75,8 +75,7 @@ class Bar:
         Returns:
             ndarray: Matriz de rigidez global
         """
-        r = self.r.copy()
-        klg = self.r.T @ self.kl @ r
+        klg = elements.to_global(self.kl[np.newaxis], self.r[np.newaxis])[0]
 
         self.klg = klg # Atribui ao objeto
 
@@ -92,160 +91,87 @@ class Bar:
         Returns:
             ndarray: matriz de rigidez local
         """
-        kl = np.zeros([12, 12])
-
-        l = self.length
-        a = self.section.properties['area']
-        ix = self.section.properties['Ix']
-        iy = self.section.properties['Iy']
-        iz = self.section.properties['Iz']
-        e = self.material.properties['E']
-        g = self.material.properties['G']
-
-        kl[0][0] = (e * a) / l
-        kl[0][6] = -kl[0][0]
-        kl[1][1] = (12 * e * iz) / l**3
-        kl[1][5] = (6 * e * iz) / l**2
-        kl[1][7] = -kl[1][1]
-        kl[1][11] = kl[1][5]
-        kl[2][2] = (12 * e * iy) / l**3
-        kl[2][4] = (-6 * e * iy) / l**2
-        kl[2][8] = -kl[2][2]
-        kl[2][10] = kl[2][4]
-        kl[3][3] = (g * ix) / l
-        kl[3][9] = -kl[3][3]
-        kl[4][4] = (4 * e * iy) / l
-        kl[4][8] = -kl[2][4]
-        kl[4][10] = (2 * e * iy) / l
-        kl[5][5] = (4 * e * iz) / l
-        kl[5][7] = -kl[1][5]
-        kl[5][11] = (2 * e * iz) / l
-        kl[6][6] = kl[0][0]
-        kl[7][7] = kl[1][1]
-        kl[7][11] = -kl[1][5]
-        kl[8][8] = kl[2][2]
-        kl[8][10] = -kl[2][4]
-        kl[9][9] = kl[3][3]
-        kl[10][10] = kl[4][4]
-        kl[11][11] = kl[5][5]
-        kl = kl + kl.T - np.diag(kl.diagonal())
+        section = self.section.properties
+        kl = elements.local_stiffness(self.length,
+                                      (section['area'], section['Ix'], section['Iy'],
+                                       section['Iz']),
+                                      (self.material.properties['E'],
+                                       self.material.properties['G']))[0]
 
         self.kl_nr = kl.copy() # Stores the matrix without considering releases
 
-        # Apply releases //////////////////////////////////////////////////////////////////////////
-        kl_releases = np.zeros([12, 12])
-        releases_calculates: list[int] = []
-        for index, value in enumerate(self.releases.values()):
-            if value:
-                l = index
-            else:
-                continue
+        kl = self.apply_releases(kl)
 
-            for j in range(12):
-                if j in releases_calculates:
-                    continue
+        self.kl = kl # Atribui ao objeto
 
-                kl_bar = kl[j, l] / kl[l, l]
-                for k in range(12):
-                    if k in releases_calculates:
-                        continue
-                    kl_releases[j, k] = kl[j, k] - kl_bar * kl[l, k]
+        return kl
 
-            kl = kl_releases.copy()
-            releases_calculates.append(l)
+    def apply_releases(self, kl: NDArray[float64]) -> NDArray[float64]:
+        """Condensa os graus de liberdade liberados da matriz de rigidez local
 
-        # /////////////////////////////////////////////////////////////////////////////////////////
+        O operador de condensação das cargas fica em `releases_operator`.
 
-        self.kl = kl # Atribui ao objeto
+        Args:
+            kl (NDArray[float64]): Matriz de rigidez local sem liberações
 
-        return kl
+        Returns:
+            NDArray[float64]: Matriz de rigidez local com as liberações
+        """
+        condensed, operators = elements.condense_releases(kl[np.newaxis],
+                                                          self.release_mask[np.newaxis])
+        self.releases_operator = operators[0]
 
-    def calculate_r(self):
-        """Calcula a matriz de rotação da barra
+        return condensed[0]
 
-        Args:
-            bar (Bar): Barra
+    @property
+    def release_mask(self) -> NDArray[np.bool_]:
+        """Liberações como vetor booleano na ordem dos graus de liberdade da barra"""
+        return np.array([self.releases[key] for key in tp.get_args(ReleasesType)], dtype=bool)
+
+    def calculate_r(self) -> NDArray[float64]:
+        """Calcula a matriz de rotação da barra
 
         Returns:
-            ndarray: Matriz de rotação
+            ndarray: Matriz 3x3 de cossenos diretores, cujas linhas são os eixos locais x, y e z
         """
-        x1 = self.end_node.x
-        y1 = self.end_node.y
-        z1 = self.end_node.z
-
-        dx = self.dx
-        dy = self.dy
-        dz = self.dz
-
-        rot_aux = np.zeros([3, 3])
-        rot_aux[0, 0] = dx / self.length
-        rot_aux[0, 1] = dy / self.length
-        rot_aux[0, 2] = dz / self.length
-
-        # Assistant point for determinate xy to bar ////////////////////////////////////////////////
-        # Initial Assistant point ******************************************************************
-        if self.y_up:
-            if dx != 0 or dz != 0:
-                aux = np.array([x1, y1 + 1, z1])
-            else:
-                aux = np.array([x1 + 1, y1, z1])
-        else:
-            if dx != 0 or dy != 0: # If not vertical
-                aux = np.array([x1, y1, z1 + 1])
-            else:
-                if dz > 0: # vertical up
-                    aux = np.array([x1 - 1, y1, z1])
-                else: # vertical down
-                    aux = np.array([x1 + 1, y1, z1])
-
-        # Rotate assistant point around x axis ****************************************************
-        axis_up = 0 if self.y_up else -90  # sum -90 deg for z up
-        rotation = np.deg2rad(self.rotation + axis_up)
-        aux = space_3d.rotate_point_around_line(aux,
-                                                self.start_node.position,
-                                                self.end_node.position,
-                                                rotation)
-        # /////////////////////////////////////////////////////////////////////////////////////////
-
-        dx = aux[0] - x1
-        dy = aux[1] - y1
-        dz = aux[2] - z1
-        c = np.sqrt(dx**2 + dy**2 + dz**2)
-
-        alpha = dx / c
-        beta = dy / c
-        gamma = dz / c
-
-        dx = rot_aux[0, 1] * gamma - rot_aux[0, 2] * beta
-        dy = rot_aux[0, 2] * alpha - rot_aux[0, 0] * gamma
-        dz = rot_aux[0, 0] * beta - rot_aux[0, 1] * alpha
-        c = np.sqrt(dx**2 + dy**2 + dz**2)
-
-        rot_aux[2, 0] = dx / c
-        rot_aux[2, 1] = dy / c
-        rot_aux[2, 2] = dz / c
-
-        rot_aux[1, 0] = rot_aux[0, 2] * rot_aux[2, 1] - rot_aux[0, 1] * rot_aux[2, 2]
-        rot_aux[1, 1] = rot_aux[0, 0] * rot_aux[2, 2] - rot_aux[0, 2] * rot_aux[2, 0]
-        rot_aux[1, 2] = rot_aux[0, 1] * rot_aux[2, 0] - rot_aux[0, 0] * rot_aux[2, 1]
-
-        rotation = np.zeros([12, 12])
-
-        rotation[0:3, 0:3] = rot_aux
-        rotation[3:6, 3:6] = rot_aux
-        rotation[6:9, 6:9] = rot_aux
-        rotation[9:12, 9:12] = rot_aux
+        rotation = elements.direction_cosines(self.start_node.position,
+                                              self.end_node.position,
+                                              self.rotation,
+                                              self.y_up)[0]
 
         self.r = rotation # Atribui matriz de rotação no objeto barra
 
         return rotation
 
-    def calculate_forces_vector(self, load: Load):
+    def calculate_forces_vector(self, load: Load) -> NDArray[float64]:
         """Calculate the vector of forces in global coordinates considering releases
 
         Args:
             load (Load): Load
+
+        Returns:
+            NDArray[float64]: Fixed-end forces of the bar for this load case
+        """
+        loads_vector = self.calculate_local_loads_vectors(load).sum(axis=0)
+
+        # Apply releases to the loads vector before transforming to global coordinates
+        return elements.rotate_vectors(self.r[np.newaxis],
+                                       self.apply_loads_releases(loads_vector)[np.newaxis],
+                                       transpose=True)[0]
+
+    def calculate_local_loads_vectors(self, load: Load) -> NDArray[float64]:
+        """Calcula as cargas nodais equivalentes de cada carga da barra em coordenadas locais
+
+        As liberações não são aplicadas (ver `apply_loads_releases`).
+
+        Args:
+            load (Load): Caso de carga
+
+        Returns:
+            NDArray[float64]: (n_bar_loads, 12) vetores de engastamento perfeito, um para cada
+                carga concentrada e distribuída da barra neste caso
         """
+        vectors: list[NDArray[float64]] = []
         if self in load.bars_loads_pt:
             # Point loads in bars /////////////////////////////////////////////////////////////////
             for value in load.bars_loads_pt.get(self, {}).values():
@@ -258,7 +184,8 @@ class Bar:
                 mz = value['Mz']
 
                 if system == 'global':
-                    fx, fy, fz, mx, my, mz = self.r[0:6, 0:6] @ np.array([fx, fy, fz, mx, my, mz])
+                    fx, fy, fz, mx, my, mz = (np.array([[fx, fy, fz],
+                                                        [mx, my, mz]]) @ self.r.T).ravel()
 
                 x = value['position']
                 l = self.length
@@ -284,8 +211,7 @@ class Bar:
                 loads_vector[5] -= fyr['Mza'] + mzr['Mza'] # Moment in z initial
                 loads_vector[11] -= fyr['Mzb'] + mzr['Mzb'] # Moment in z final
 
-                # Apply releases to the loads vector before transforming to global coordinates
-                self.vector_loads += self.r.T @ self.apply_loads_releases(self.kl_nr, loads_vector)
+                vectors.append(loads_vector)
 
         # Distributed loads in bars ///////////////////////////////////////////////////////////////
         for value in load.bars_loads_dist.get(self, {}).values():
@@ -298,10 +224,10 @@ class Bar:
             mz1, mz2 = value['Mz']
 
             if system == 'global':
-                fx1, fy1, fz1, mx1, my1, mz1 = self.r[0:6, 0:6] @ np.array([fx1, fy1, fz1,
-                                                                            mx1, my1, mz1])
-                fx2, fy2, fz2, mx2, my2, mz2 = self.r[0:6, 0:6] @ np.array([fx2, fy2, fz2,
-                                                                            mx2, my2, mz2])
+                fx1, fy1, fz1, mx1, my1, mz1 = (np.array([[fx1, fy1, fz1],
+                                                          [mx1, my1, mz1]]) @ self.r.T).ravel()
+                fx2, fy2, fz2, mx2, my2, mz2 = (np.array([[fx2, fy2, fz2],
+                                                          [mx2, my2, mz2]]) @ self.r.T).ravel()
 
             x1 = value['x1']
             x2 = value['x2']
@@ -329,65 +255,20 @@ class Bar:
             loads_vector[5] -= fyr['Mza'] + mzr['Mza'] # Moment in z initial
             loads_vector[11] -= fyr['Mzb'] + mzr['Mzb'] # Moment in z final
 
-            # Apply releases to the loads vector before transforming to global coordinates
-            self.vector_loads += self.r.T @ self.apply_loads_releases(self.kl_nr, loads_vector)
+            vectors.append(loads_vector)
+
+        return np.array(vectors).reshape(-1, 12)
 
-    def apply_loads_releases(self,
-                             kl_nr: NDArray[float64],
-                             loads_vector: NDArray[float64],
-                             tol: float=1e-12):
+    def apply_loads_releases(self, loads_vector: NDArray[float64]) -> NDArray[float64]:
         """Apply releases to the loads vector before transforming to global coordinates
 
+        Uses the condensation operator calculated with the stiffness matrix.
+
         Args:
-            kl_nr (NDArray[float64]): Stiffness matrix without releases
             loads_vector (NDArray[float64]): Vector of loads
-            tol (float, optional): Tolerance for singularity check. Defaults to 1e-12.
 
         Returns:
             NDArray[float64]: Condensed loads vector with released DOFs zeroed and loads
                 redistributed to maintained DOFs.
         """
-        release_mask = np.array([
-                self.releases['Dxi'], self.releases['Dyi'], self.releases['Dzi'],
-                self.releases['Rxi'], self.releases['Ryi'], self.releases['Rzi'],
-                self.releases['Dxj'], self.releases['Dyj'], self.releases['Dzj'],
-                self.releases['Rxj'], self.releases['Ryj'], self.releases['Rzj']
-                ], dtype=bool)
-        # Index of maintained and released DOFs
-        r_idx = np.where(release_mask)[0]
-        k_idx = np.where(~release_mask)[0]
-
-        # If no releases, return as is
-        if r_idx.size == 0:
-            return loads_vector.copy()
-
-        # Partitions K and f
-        # k_kk = kl_no_releases[np.ix_(k_idx, k_idx)]
-        k_kr = kl_nr[np.ix_(k_idx, r_idx)]
-        k_rr = kl_nr[np.ix_(r_idx, r_idx)]
-
-        f_k = loads_vector[k_idx]
-        f_r = loads_vector[r_idx]
-
-        # Try resolving K_rr x = f_r; if singular, use pseudo-inverse
-        try:
-            # Check simple determinant/conditioning
-            if np.linalg.cond(k_rr) < 1.0 / tol:
-                krr_inv = np.linalg.inv(k_rr)
-            else:
-                krr_inv = np.linalg.pinv(k_rr)
-        except np.linalg.LinAlgError:
-            krr_inv = np.linalg.pinv(k_rr)
-
-        # Calculate the redistributed contribution
-        add_on_k = k_kr @ (krr_inv @ f_r)
-
-        # f_condensed for DOFs maintained:
-        f_k_cond = f_k - add_on_k
-
-        # Construct resulting vector (released = 0)
-        loads_condensed = np.zeros_like(loads_vector)
-        loads_condensed[k_idx] = f_k_cond
-        # loads_condensed[r_idx] = 0
-
-        return loads_condensed
+        return self.releases_operator @ loads_vector
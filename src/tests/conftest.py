@@ -0,0 +1,71 @@
+"""Estruturas usadas nos testes"""
+# pylint: disable=C0413
+# Add project root to sys.path for imports ////////////////////////////////////////////////////////
+import sys
+import os
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.join(current_dir, '..', '..')
+sys.path.append(project_root)
+# /////////////////////////////////////////////////////////////////////////////////////////////////
+
+import pytest
+
+import pyengineer as pg
+
+Frame = tuple[list[pg.Node], list[pg.Bar], list[pg.Load], pg.Support]
+
+
+def build_frame() -> Frame:
+    """Pórtico 3D de dois pavimentos com liberações, molas e três casos de carga"""
+    material = pg.Material('steel', 2e11, 7.692308e10, 0.3, 7850)
+    column = pg.Section('column', area=4.0e-3, ix=2.0e-7, iy=3.0e-5, iz=1.0e-5)
+    beam = pg.Section('beam', area=2.5e-3, ix=1.0e-7, iy=1.8e-5, iz=2.0e-6)
+
+    nodes: list[pg.Node] = []
+    grid: dict[tuple[int, int, int], pg.Node] = {}
+    for k in range(3):
+        for j in range(2):
+            for i in range(2):
+                node = pg.Node(f'N{i}{j}{k}', [5.0 * i, 4.0 * j, 3.0 * k])
+                nodes.append(node)
+                grid[i, j, k] = node
+
+    bars: list[pg.Bar] = []
+    for k in range(2):
+        for j in range(2):
+            for i in range(2):
+                bars.append(pg.Bar(f'C{i}{j}{k}', grid[i, j, k], grid[i, j, k + 1],
+                                   column, material))
+        for j in range(2):
+            bars.append(pg.Bar(f'X{j}{k}', grid[0, j, k + 1], grid[1, j, k + 1], beam, material))
+        for i in range(2):
+            bars.append(pg.Bar(f'Y{i}{k}', grid[i, 0, k + 1], grid[i, 1, k + 1], beam, material,
+                               90.0))
+    bars[4].releases['Ryj'] = True
+    bars[4].releases['Rzj'] = True
+
+    support = pg.Support()
+    support.add_fixed_support(grid[0, 0, 0])
+    support.add_fixed_support(grid[1, 0, 0])
+    support.add_support(grid[0, 1, 0], True, True, True, 1e7, True, 2e6)
+    support.add_support(grid[1, 1, 0], True, True, 5e8, True, True, True)
+
+    dead = pg.Load('Dead')
+    for bar in bars[4:8] + bars[12:]:
+        dead.add_bar_load_dist(f'q{bar.name}', bar, 0.0, bar.length, 'global', fz=(-5e3, -5e3))
+    wind = pg.Load('Wind')
+    wind.add_node_load('w1', grid[0, 0, 2], fx=8e3)
+    wind.add_node_load('w2', grid[0, 1, 1], fx=4e3, my=1e3)
+    wind.add_bar_load_dist('w3', bars[0], 0.5, 2.5, 'local', fy=(1e3, 2e3))
+    live = pg.Load('Live')
+    live.add_bar_load_pt('p1', bars[4], 2.0, 'global', fz=-1e4)
+    live.add_bar_load_pt('p2', bars[6], 1.5, 'local', fy=3e3, mx=5e2)
+
+    return nodes, bars, [dead, wind, live], support
+
+
+@pytest.fixture
+def frame() -> Frame:
+    """Pórtico 3D novo para cada teste"""
+    return build_frame()
@@ -0,0 +1,27 @@
+"""Testes da análise de flambagem"""
+import numpy as np
+
+import pyengineer as pg
+from pyengineer import analysis
+
+
+def test_euler_buckling_of_cantilever():
+    """O menor fator crítico de um pilar em balanço é pi^2 E I / (2 L)^2"""
+    young, inertia, length, force = 2e11, 8e-6, 6.0, 1e3
+    material = pg.Material('steel', young, young / 2.6, 0.3, 7850)
+    section = pg.Section('column', area=1e-2, ix=1e-5, iy=inertia, iz=inertia)
+
+    n_bars = 10
+    nodes = [pg.Node(f'N{i}', [0, 0, length * i / n_bars]) for i in range(n_bars + 1)]
+    bars = [pg.Bar(f'B{i}', nodes[i], nodes[i + 1], section, material) for i in range(n_bars)]
+    support = pg.Support()
+    support.add_fixed_support(nodes[0])
+    load = pg.Load('P')
+    load.add_node_load('P', nodes[-1], fz=-force)
+
+    buckling = analysis.Buckling(analysis.Linear(nodes, bars, [load], support), load, modes=3)
+    euler = np.pi**2 * young * inertia / (2 * length)**2 / force
+
+    # Mesma inércia nos dois planos de flexão
+    np.testing.assert_allclose(buckling.critical_factors[:2], euler, rtol=1e-4)
+    assert buckling.critical_factors[2] > 8 * euler
@@ -0,0 +1,51 @@
+"""Testes do cache das matrizes locais"""
+import numpy as np
+from conftest import Frame
+
+from pyengineer import analysis
+from pyengineer.analysis._cache import ElementCache
+from pyengineer.functions import elements
+
+
+def test_identical_bars_share_the_local_matrices(frame: Frame):
+    """Pilares, vigas X (com e sem liberações) e vigas Y: quatro matrizes calculadas"""
+    nodes, bars, loads, support = frame
+    cache = analysis.Linear(nodes, bars, loads, support).element_cache
+    assert cache.statistics() == {'hits': 12, 'misses': 4, 'hit_rate': 0.75, 'size': 4,
+                                  'max_size': 4096}
+
+    cache = ElementCache()
+    kl_nr, kl, operators = cache.get_matrices(bars)
+    for index, bar in enumerate(bars):
+        properties = bar.section.properties
+        expected_nr = elements.local_stiffness(bar.length,
+                                               (properties['area'], properties['Ix'],
+                                                properties['Iy'], properties['Iz']),
+                                               (bar.material.properties['E'],
+                                                bar.material.properties['G']))
+        expected, expected_operators = elements.condense_releases(expected_nr,
+                                                                  bar.release_mask[np.newaxis])
+        np.testing.assert_allclose(kl_nr[index], expected_nr[0], rtol=1e-14)
+        np.testing.assert_allclose(kl[index], expected[0], rtol=1e-12, atol=1e-6)
+        np.testing.assert_allclose(operators[index], expected_operators[0], atol=1e-12)
+
+    # Segunda chamada: tudo já está no cache
+    cache.get_matrices(bars)
+    assert (cache.hits, cache.misses) == (12 + 16, 4)
+
+
+def test_least_recently_used_entries_are_discarded(frame: Frame):
+    """Com espaço para uma matriz só a última usada continua no cache"""
+    _, bars, _, _ = frame
+    cache = ElementCache(max_size=1)
+
+    cache.get_matrices(bars)
+    assert len(cache) == 1
+    cache.get_matrices([bars[-1]])
+    assert (cache.hits, cache.misses) == (12 + 1, 4)
+
+    cache.get_matrices([bars[0]])
+    assert (cache.hits, cache.misses) == (13, 5)
+
+    cache.clear()
+    assert cache.statistics()['size'] == cache.hits == cache.misses == 0
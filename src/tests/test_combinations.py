@@ -0,0 +1,130 @@
+"""Testes das combinações e envoltórias"""
+import itertools
+import json
+
+import numpy as np
+import pytest
+from conftest import Frame
+
+import pyengineer as pg
+from pyengineer import analysis, fetch
+
+# Combinações usadas nos testes
+COMBINATIONS: dict[str, dict[str, float]] = {
+    'ELU1': {'Dead': 1.4, 'Live': 1.4},
+    'ELU2': {'Dead': 1.0, 'Wind': 1.4, 'Live': 0.7},
+    'ELU3': {'Dead': 1.0, 'Wind': -1.4},
+}
+
+
+def combined_analysis(frame: Frame) -> analysis.Linear:
+    """Análise linear do pórtico com as combinações dos testes"""
+    nodes, bars, loads, support = frame
+    linear = analysis.Linear(nodes, bars, loads, support)
+    for name, factors in COMBINATIONS.items():
+        linear.add_combination(name, factors)
+
+    return linear
+
+
+def test_combinations_are_the_superposition_of_the_load_cases(frame: Frame):
+    """Cada combinação é a soma dos casos de carga multiplicados pelos fatores"""
+    linear = combined_analysis(frame)
+    results = linear.results
+    combinations = linear.combinations_results
+    assert results is not None and combinations is not None
+
+    np.testing.assert_array_equal(linear.combination_matrix(),
+                                  [[1.4, 0.0, 1.4], [1.0, 1.4, 0.7], [1.0, -1.4, 0.0]])
+    assert combinations.load_names == list(COMBINATIONS)
+    for name, factors in COMBINATIONS.items():
+        index = combinations.load_index[name]
+        for actual, cases in ((combinations.displacements, results.displacements),
+                              (combinations.reactions, results.reactions),
+                              (combinations.bars_forces, results.bars_forces)):
+            expected = sum(factor * cases[results.load_index[load_name]]
+                           for load_name, factor in factors.items())
+            np.testing.assert_allclose(actual[index], expected, rtol=1e-12,
+                                       atol=1e-12 * np.abs(cases).max())
+
+    # Substituir uma combinação recalcula só ela
+    linear.add_combination('ELU3', {'Wind': 2.0})
+    assert linear.combinations_results is combinations
+    np.testing.assert_allclose(combinations.bars_forces[2], 2.0 * results.bars_forces[1],
+                               rtol=1e-12)
+    np.testing.assert_allclose(linear.calculate_combinations().bars_forces,
+                               combinations.bars_forces, rtol=1e-12,
+                               atol=1e-12 * np.abs(results.bars_forces).max())
+
+    with pytest.raises(ValueError, match='Snow'):
+        linear.add_combination('ELU4', {'Snow': 1.0})
+
+
+def test_json_files_keep_the_combinations(frame: Frame, tmp_path):
+    """As combinações vão para o arquivo de entrada e os resultados têm o tipo de cada caso"""
+    linear = combined_analysis(frame)
+    input_path = str(tmp_path / 'input.json')
+    results_path = str(tmp_path / 'results.json')
+
+    fetch.create_json_input(input_path, linear)
+    calculated = fetch.calculate_json(input_path)
+    assert calculated.combinations == COMBINATIONS
+    assert calculated.combinations_results is not None
+    assert linear.combinations_results is not None
+    np.testing.assert_allclose(calculated.combinations_results.bars_forces,
+                               linear.combinations_results.bars_forces, rtol=1e-9,
+                               atol=1e-9 * np.abs(linear.combinations_results.bars_forces).max())
+
+    fetch.create_json_results(results_path, calculated)
+    with open(results_path, 'r', encoding='utf-8') as file:
+        entries = json.load(file)
+    assert [(entry['load_case'], entry['type']) for entry in entries] == [
+        ('Dead', 'load_case'), ('Wind', 'load_case'), ('Live', 'load_case'),
+        ('ELU1', 'combination'), ('ELU2', 'combination'), ('ELU3', 'combination')]
+    assert entries[3]['extreme_forces'][0]['bar'] == frame[1][0].name
+
+
+def test_envelope_matches_the_stored_combinations(frame: Frame):
+    """A envoltória por blocos tem os extremos dos resultados de todas as combinações"""
+    linear = combined_analysis(frame)
+    combinations = linear.combinations_results
+    assert combinations is not None
+
+    envelope = linear.calculate_envelope(chunk_size=2)
+
+    assert envelope.combination_names == list(COMBINATIONS)
+    for extremes, values in ((envelope.displacements, combinations.displacements),
+                             (envelope.reactions, combinations.reactions),
+                             (envelope.bars_forces, combinations.bars_forces)):
+        atol = 1e-12 * np.abs(values).max()
+        np.testing.assert_allclose(extremes.maximum, values.max(axis=0), rtol=1e-12, atol=atol)
+        np.testing.assert_allclose(extremes.minimum, values.min(axis=0), rtol=1e-12, atol=atol)
+        # A combinação que governa tem o valor extremo
+        for arg, expected in ((extremes.arg_maximum, extremes.maximum),
+                              (extremes.arg_minimum, extremes.minimum)):
+            np.testing.assert_allclose(np.take_along_axis(values, arg[np.newaxis], axis=0)[0],
+                                       expected, rtol=1e-12, atol=atol)
+
+
+def test_pattern_envelope_matches_every_pattern(frame: Frame):
+    """A envoltória por superposição é a mesma das 2^n combinações de vãos carregados"""
+    nodes, bars, loads, support = frame
+    panels: list[pg.Load] = []
+    for bar in bars[4:8]:
+        panel = pg.Load(f'Live {bar.name}')
+        panel.add_bar_load_dist('q', bar, 0.0, bar.length, 'global', fz=(-3e3, -3e3))
+        panels.append(panel)
+    linear = analysis.Linear(nodes, bars, loads[:2] + panels, support)
+    assert linear.results is not None
+
+    envelope = linear.pattern_envelope(panels, {'Dead': 1.2, 'Wind': 0.6}, 1.5)
+
+    patterns = [[1.2, 0.6] + [1.5 * loaded for loaded in pattern]
+                for pattern in itertools.product([0.0, 1.0], repeat=len(panels))]
+    combinations = linear.results.combine(patterns, [str(index) for index in range(len(patterns))])
+    for extremes, values in ((envelope.displacements, combinations.displacements),
+                             (envelope.reactions, combinations.reactions),
+                             (envelope.bars_forces, combinations.bars_forces)):
+        atol = 1e-12 * np.abs(values).max()
+        np.testing.assert_allclose(extremes.maximum, values.max(axis=0), rtol=1e-12, atol=atol)
+        np.testing.assert_allclose(extremes.minimum, values.min(axis=0), rtol=1e-12, atol=atol)
@@ -0,0 +1,230 @@
+"""Testes da análise dinâmica"""
+from typing import Literal
+
+import numpy as np
+from numpy.typing import NDArray
+from numpy import float64
+import pytest
+from scipy import linalg
+from scipy import sparse
+from conftest import Frame
+
+import pyengineer as pg
+from pyengineer import analysis
+
+
+def to_dense(matrix: object) -> NDArray[float64]:
+    """Cópia densa de uma matriz esparsa ou densa"""
+    if isinstance(matrix, sparse.csr_matrix):
+        return matrix.toarray()
+    return np.asarray(matrix, dtype=float)
+
+
+def dynamic_analysis(frame: Frame, modes: int | None = None) -> analysis.Dynamic:
+    """Análise dinâmica do pórtico; sem `modes`, com quase todos os modos"""
+    nodes, bars, loads, support = frame
+    linear = analysis.Linear(nodes, bars, loads, support)
+    return analysis.Dynamic(linear, modes=linear.free_dofs.size - 1 if modes is None else modes)
+
+
+@pytest.mark.parametrize('mass', ['lumped', 'consistent'])
+def test_modal_frequencies_match_dense_eigh(frame: Frame, mass: Literal['lumped', 'consistent']):
+    """Os autovalores de Lanczos são os menores autovalores do problema generalizado denso"""
+    nodes, bars, loads, support = frame
+    linear = analysis.Linear(nodes, bars, loads, support)
+    dynamic = analysis.Dynamic(linear, modes=6, mass=mass)
+
+    stiffness = to_dense(linear.kg_solution)
+    mass_matrix = to_dense(dynamic.mg_solution)
+    expected = linalg.eigh(stiffness, mass_matrix, eigvals_only=True, subset_by_index=[0, 5])
+
+    np.testing.assert_allclose(dynamic.eigenvalues, expected, rtol=1e-8)
+    # Modos normalizados pela massa
+    np.testing.assert_allclose(dynamic.modes_matrix.T @ mass_matrix @ dynamic.modes_matrix,
+                               np.eye(6), atol=1e-8)
+
+
+def test_penalty_supports_have_the_same_modal_masses(frame: Frame):
+    """Os apoios por penalidade não entram nos vetores de influência nem nas massas totais"""
+    nodes, bars, loads, support = frame
+    partition = analysis.Dynamic(analysis.Linear(nodes, bars, loads, support), modes=6)
+    penalty = analysis.Dynamic(analysis.Linear(nodes, bars, loads, support,
+                                               supports_method='penalty'), modes=6)
+
+    np.testing.assert_allclose(penalty.total_masses, partition.total_masses, rtol=1e-10)
+    np.testing.assert_allclose(penalty.frequencies, partition.frequencies, rtol=1e-8)
+    np.testing.assert_allclose(penalty.effective_masses, partition.effective_masses,
+                               rtol=1e-6, atol=1e-9 * partition.total_masses.max())
+
+
+def newmark_and_modal_errors(frame: Frame, divisions: list[int]) -> list[float]:
+    """Diferença entre HHT e a superposição de quase todos os modos para cada passo T1 / n"""
+    nodes, bars, _, _ = frame
+    dynamic = dynamic_analysis(frame)
+    omega = dynamic.angular_frequencies
+    damping = analysis.Dynamic.rayleigh_coefficients(0.02, omega[0], omega[5])
+    period = dynamic.periods[0]
+
+    errors = []
+    for division in divisions:
+        time = np.arange(2 * division + 1) * period / division
+        factors = np.zeros([time.size, 3])
+        factors[:, 1] = np.sin(2 * np.pi * time / (1.5 * period))
+        direct = dynamic.time_history(factors, period / division, nodes[-4:], bars[:2],
+                                      damping, alpha=0.1)
+        modal = dynamic.modal_time_history(factors, period / division, nodes[-4:], bars[:2],
+                                           damping[0] / (2 * omega) + damping[1] * omega / 2)
+        errors.append(float(np.abs(direct.displacements - modal.displacements).max()
+                            / np.abs(modal.displacements).max()))
+    return errors
+
+
+def test_hht_converges_to_the_modal_time_history(frame: Frame):
+    """O erro de HHT em relação à solução modal exata cai com o quadrado do passo"""
+    errors = newmark_and_modal_errors(frame, [50, 100, 200])
+
+    assert errors[2] < 2e-3
+    np.testing.assert_allclose(np.array(errors[:-1]) / errors[1:], 4.0, rtol=0.1)
+
+
+def test_time_history_with_massless_nodes(frame: Frame):
+    """Nós sem massa (M singular) começam sem aceleração e chegam na solução estática"""
+    nodes, bars, loads, support = frame
+    tip = pg.Node('Tip', [-1.0, 0.0, 6.0])
+    massless = pg.Material('massless', 2e11, 7.692308e10, 0.3, 0.0)
+    stub = pg.Bar('Stub', tip, nodes[8], bars[0].section, massless)
+    load = pg.Load('Tip')
+    load.add_node_load('P', tip, fx=2e3, fz=-1e3)
+    linear = analysis.Linear(nodes + [tip], bars + [stub], loads + [load], support)
+    dynamic = analysis.Dynamic(linear, modes=4)
+
+    factors = np.zeros([600, 4])
+    factors[:, 1:] = 1.0
+    history = dynamic.time_history(factors, dynamic.periods[0] / 40, [tip, nodes[8]], [stub],
+                                   dynamic.rayleigh_coefficients(
+                                       0.5, *dynamic.angular_frequencies[[0, 3]]),
+                                   alpha=0.1)
+
+    np.testing.assert_array_equal(history.accelerations[0, 0], np.zeros(6))
+    assert np.abs(history.accelerations[0, 1]).max() > 0
+    assert linear.results is not None
+    static = linear.results.displacements[1:].sum(axis=0)[[12, 8]]
+    forces = linear.results.bars_forces[1:, -1].sum(axis=0)
+    np.testing.assert_allclose(history.displacements[-1], static, rtol=0,
+                               atol=1e-8 * np.abs(static).max())
+    np.testing.assert_allclose(history.bars_forces[-1, 0], forces, rtol=0,
+                               atol=1e-8 * np.abs(forces).max())
+
+
+def step_response(omega: NDArray[float64], zeta: NDArray[float64], modal_loads: NDArray[float64],
+                  time: NDArray[float64]) -> tuple[NDArray[float64], NDArray[float64]]:
+    """Deslocamentos e velocidades modais de uma carga constante a partir do repouso"""
+    damped = omega * np.sqrt(1 - zeta**2)
+    decay = np.exp(-zeta * omega * time[:, None])
+    phase = damped * time[:, None]
+    q = modal_loads / omega**2 * (1 - decay * (np.cos(phase)
+                                               + zeta / np.sqrt(1 - zeta**2) * np.sin(phase)))
+    return q, modal_loads / damped * decay * np.sin(phase)
+
+
+def test_modal_step_response_is_exact(frame: Frame):
+    """Carga constante a partir do repouso: resposta analítica de cada modo amortecido"""
+    nodes = frame[0]
+    dynamic = dynamic_analysis(frame, 6)
+    zeta = np.linspace(0.0, 0.1, 6)
+    factors = np.zeros([200, 3])
+    factors[:, 1] = 1.0
+
+    history = dynamic.modal_time_history(factors, dynamic.periods[0] / 30, nodes[-4:],
+                                         damping_ratios=zeta)
+
+    q, q_dot = step_response(dynamic.angular_frequencies, zeta,
+                             dynamic.modes_matrix.T @ dynamic.linear.forces[
+                                 dynamic.linear.free_dofs, 1], history.time)
+    node_rows, _, _ = dynamic.recorded_rows(nodes[-4:], [])
+    modes = np.vstack((dynamic.modes_matrix, np.zeros([1, 6])))[node_rows]
+    for actual, expected in ((history.displacements, np.einsum('njm,tm->tnj', modes, q)),
+                             (history.velocities, np.einsum('njm,tm->tnj', modes, q_dot))):
+        np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-10 * np.abs(expected).max())
+
+
+def test_frequency_response_matches_direct_complex_solve(frame: Frame):
+    """A varredura harmônica com quase todos os modos resolve (K - W^2 M + i W C) u = F"""
+    dynamic = dynamic_analysis(frame)
+    omega = dynamic.angular_frequencies
+    damping = analysis.Dynamic.rayleigh_coefficients(0.05, omega[0], omega[5])
+    frequencies = np.array([0.5, 1.0, 1.7]) * dynamic.frequencies[0]
+    amplitudes = np.array([0.0, 1.0, 0.5j])
+
+    response = dynamic.frequency_response(
+        frequencies, amplitudes, frame[0][-4:],
+        damping_ratios=damping[0] / (2 * omega) + damping[1] * omega / 2)
+
+    stiffness = to_dense(dynamic.linear.kg_solution)
+    mass = to_dense(dynamic.mg_solution)
+    node_rows, _, _ = dynamic.recorded_rows(frame[0][-4:], [])
+    for index, excitation in enumerate(2 * np.pi * frequencies):
+        matrix = (stiffness - excitation**2 * mass
+                  + 1j * excitation * (damping[0] * mass + damping[1] * stiffness))
+        forces = dynamic.linear.forces[dynamic.linear.free_dofs] @ amplitudes
+        expected = np.append(np.linalg.solve(matrix, forces), 0.0)[node_rows]
+        np.testing.assert_allclose(response.displacements[index], expected, rtol=0,
+                                   atol=1e-5 * np.abs(expected).max())
+
+
+def test_modal_time_history_reaches_the_harmonic_response(frame: Frame):
+    """Depois do transiente a resposta no tempo é Re(u e^(i W t)) da varredura harmônica"""
+    nodes, bars, _, _ = frame
+    dynamic = dynamic_analysis(frame, 6)
+    frequency = 0.8 * dynamic.frequencies[0]
+    time_step = 1 / (200 * frequency)
+    time = np.arange(10000) * time_step
+    factors = np.zeros([time.size, 3])
+    factors[:, 1] = np.cos(2 * np.pi * frequency * time)
+
+    history = dynamic.modal_time_history(factors, time_step, nodes[-4:], bars[:2], 0.05)
+    harmonic = dynamic.frequency_response(frequency, [0.0, 1.0, 0.0], nodes[-4:], bars[:2], 0.05)
+
+    # A carga é linear entre os instantes: erro da ordem de (W dt)^2 / 12
+    phase = np.exp(2j * np.pi * frequency * time[-200:])[:, None, None]
+    for actual, amplitude in ((history.displacements[-200:], harmonic.displacements[0]),
+                              (history.bars_forces[-200:], harmonic.bars_forces[0])):
+        expected = np.real(amplitude * phase)
+        np.testing.assert_allclose(actual, expected, rtol=0, atol=2e-4 * np.abs(expected).max())
+
+
+def test_modal_base_shear_is_the_effective_mass_times_sa(frame: Frame):
+    """A força cortante na base de cada modo é a massa efetiva vezes Sa"""
+    nodes, bars, loads, support = frame
+    dynamic = analysis.Dynamic(analysis.Linear(nodes, bars, loads, support), modes=6)
+    spectrum = ([0.0, 0.1, 0.5, 1.0, 2.0], [2.0, 5.0, 5.0, 3.0, 1.5])
+
+    modal = dynamic.modal_peak_results(spectrum, 0)
+
+    accelerations = np.interp(dynamic.periods, *spectrum)
+    np.testing.assert_allclose(np.abs(modal.reactions[:, :, 0].sum(axis=1)),
+                               dynamic.effective_masses[:, 0] * accelerations, rtol=1e-8)
+
+
+def test_response_spectrum_combinations(frame: Frame):
+    """SRSS e CQC combinam as respostas máximas de cada modo"""
+    nodes, bars, loads, support = frame
+    dynamic = analysis.Dynamic(analysis.Linear(nodes, bars, loads, support), modes=6)
+    spectrum = ([0.0, 0.1, 0.5, 1.0, 2.0], [2.0, 5.0, 5.0, 3.0, 1.5])
+    modal = dynamic.modal_peak_results(spectrum, [1.0, 0.3])
+
+    srss = dynamic.response_spectrum(spectrum, [1.0, 0.3], 'SRSS')
+    cqc = dynamic.response_spectrum(spectrum, [1.0, 0.3], 'CQC', 0.05, 'E')
+    undamped = dynamic.response_spectrum(spectrum, [1.0, 0.3], 'CQC', 0.0)
+
+    correlation = analysis.Dynamic.cqc_correlation(dynamic.angular_frequencies, 0.05)
+    for values, combined in ((modal.displacements, cqc.displacements),
+                             (modal.reactions, cqc.reactions),
+                             (modal.bars_forces, cqc.bars_forces)):
+        expected = sum(correlation[i, j] * values[i] * values[j]
+                       for i in range(6) for j in range(6))
+        np.testing.assert_allclose(combined[0], np.sqrt(expected), rtol=1e-10,
+                                   atol=1e-12 * np.abs(combined).max())
+    np.testing.assert_allclose(srss.bars_forces[0], np.sqrt((modal.bars_forces**2).sum(axis=0)))
+    np.testing.assert_allclose(undamped.bars_forces, srss.bars_forces)
+    assert cqc.load_names == ['E']
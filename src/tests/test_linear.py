@@ -0,0 +1,153 @@
+"""Testes da análise linear"""
+import numpy as np
+import pytest
+from scipy import sparse
+from conftest import Frame
+
+import pyengineer as pg
+from pyengineer import analysis
+from pyengineer.analysis._numbering import DofNumbering
+from pyengineer.analysis._solvers import ConjugateGradient
+from pyengineer.analysis._operator import ElementOperator
+
+# Opções da análise linear testadas
+SOLVER_MODES: dict[str, dict] = {
+    'direct': {},
+    'dense': {'use_sparse': False},
+    'penalty': {'supports_method': 'penalty'},
+    'renumber': {'renumber': True},
+    'banded': {'solver': 'banded', 'renumber': True},
+    'cg': {'solver': 'cg'},
+    'cg_jacobi': {'solver': 'cg', 'preconditioner': 'jacobi'},
+    'matrix_free': {'solver': 'cg', 'matrix_free': True},
+}
+
+
+@pytest.mark.parametrize('mode', list(SOLVER_MODES))
+def test_load_cases_match_single_case_solves(frame: Frame, mode: str):
+    """Todos os casos de carga resolvidos juntos dão os resultados de uma análise por caso"""
+    nodes, bars, loads, support = frame
+    results = analysis.Linear(nodes, bars, loads, support, **SOLVER_MODES[mode]).results
+    assert results is not None
+    reference = analysis.Linear(nodes, bars, loads, support, use_sparse=False).results
+    assert reference is not None
+
+    for index, load in enumerate(loads):
+        single = analysis.Linear(nodes, bars, [load], support, **SOLVER_MODES[mode]).results
+        assert single is not None
+        for expected, actual in ((single.displacements[0], results.displacements[index]),
+                                 (single.reactions[0], results.reactions[index]),
+                                 (single.bars_forces[0], results.bars_forces[index]),
+                                 (reference.bars_forces[index], results.bars_forces[index])):
+            scale = np.abs(expected).max()
+            assert scale > 0
+            np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-7 * scale)
+
+
+def test_renumbering_reduces_bandwidth(frame: Frame):
+    """A numeração Reverse Cuthill-McKee diminui a largura de banda de nós embaralhados"""
+    nodes, bars, _, _ = frame
+    shuffled = [nodes[index] for index in np.random.default_rng(0).permutation(len(nodes))]
+
+    original = DofNumbering(shuffled, bars)
+    renumbered = DofNumbering(shuffled, bars, renumber=True)
+
+    assert renumbered.bandwidth() < original.bandwidth()
+    assert sorted(renumbered.node_dofs.ravel()) == list(range(6 * len(nodes)))
+
+
+def test_conjugate_gradient_warns_with_the_load_names(frame: Frame):
+    """Os casos de carga que não convergem aparecem no aviso"""
+    nodes, bars, loads, support = frame
+    with pytest.warns(RuntimeWarning, match="'Dead'.*'Wind'.*'Live'"):
+        linear = analysis.Linear(nodes, bars, loads, support, solver='cg', max_iterations=2)
+
+    assert isinstance(linear.solver, ConjugateGradient)
+    assert not linear.solver.converged.any()
+    assert np.all(linear.solver.iterations == 2)
+
+
+def test_element_operator_matches_assembled_matrix(frame: Frame):
+    """O operador elemento por elemento tem o produto e a diagonal da matriz montada"""
+    nodes, bars, loads, support = frame
+    assembled = analysis.Linear(nodes, bars, loads, support)
+    operator = analysis.Linear(nodes, bars, loads, support, solver='cg', matrix_free=True)
+    assert isinstance(operator.kg_solution, ElementOperator)
+
+    matrix = sparse.csr_matrix(assembled.kg_solution)
+    vectors = np.random.default_rng(0).normal(size=(operator.kg_solution.dofs.size, 3))
+    np.testing.assert_allclose(operator.kg_solution.matmat(vectors), matrix @ vectors,
+                               rtol=1e-12, atol=1e-12 * abs(matrix).max())
+    np.testing.assert_allclose(operator.kg_solution.diagonal(), matrix.diagonal(), rtol=1e-12)
+
+
+def test_bar_changes_keep_the_given_bars_list(frame: Frame):
+    """add_bar e remove_bar alteram apenas a lista de barras da análise"""
+    nodes, bars, loads, support = frame
+    given = list(bars)
+    linear = analysis.Linear(nodes, bars, loads, support)
+
+    linear.remove_bar(bars[-1])
+    linear.add_bar(pg.Bar('Diagonal', nodes[0], nodes[-1], bars[0].section, bars[0].material))
+
+    assert bars == given
+    assert len(linear.bars) == len(given)
+    assert linear.bars[-1].name == 'Diagonal'
+
+
+def assert_same_results(changed: analysis.Linear, nodes: list[pg.Node], loads: list[pg.Load],
+                        support: pg.Support, mode: str):
+    """Compara os resultados com os de uma análise nova das barras atuais"""
+    reference = analysis.Linear(nodes, changed.bars, loads, support, **SOLVER_MODES[mode])
+    assert changed.results is not None and reference.results is not None
+    for actual, expected in ((changed.results.displacements, reference.results.displacements),
+                             (changed.results.reactions, reference.results.reactions),
+                             (changed.results.bars_forces, reference.results.bars_forces)):
+        np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-8 * np.abs(expected).max())
+
+
+@pytest.mark.parametrize('mode', ['direct', 'dense', 'penalty', 'banded', 'matrix_free'])
+def test_bar_changes_match_a_new_analysis(frame: Frame, mode: str):
+    """modify_bar, add_bar e remove_bar dão os resultados de uma análise nova"""
+    nodes, bars, loads, support = frame
+    linear = analysis.Linear(nodes, bars, loads, support, **SOLVER_MODES[mode])
+    displacements = linear.displacements[loads[0]]
+    extreme_forces = bars[4].extreme_forces['Live']
+
+    linear.modify_bar(bars[4], section=bars[0].section, releases={'Ryj': False})
+    linear.modify_bar(bars[6], material=pg.Material('alum', 7e10, 2.6e10, 0.33, 2700))
+    assert_same_results(linear, nodes, loads, support, mode)
+
+    # Mesmas barras: os resultados são atualizados no lugar
+    assert linear.results is not None
+    np.testing.assert_array_equal(displacements, linear.results.displacements[0].ravel())
+    np.testing.assert_array_equal(extreme_forces, linear.results.bars_forces[2, 4])
+
+    linear.add_bar(pg.Bar('Diagonal', nodes[0], nodes[-1], bars[0].section, bars[0].material))
+    linear.remove_bar(bars[6])
+    assert_same_results(linear, nodes, loads, support, mode)
+
+
+def test_extreme_forces_keep_the_cases_of_other_analyses(frame: Frame):
+    """Os esforços de cada caso são somados ao dicionário da barra, sem apagar os outros"""
+    nodes, bars, loads, support = frame
+    analysis.Linear(nodes, bars, loads[:1], support)
+    wind = analysis.Linear(nodes, bars, loads[1:2], support).results
+    assert wind is not None
+
+    assert list(bars[0].extreme_forces) == ['Dead', 'Wind']
+    np.testing.assert_array_equal(bars[0].extreme_forces['Wind'], wind.bars_forces[0, 0])
+
+
+def test_forces_vector_is_in_the_node_order(frame: Frame):
+    """Com renumeração o vetor de forças de cada caso continua na ordem dos nós"""
+    nodes, bars, loads, support = frame
+    original = analysis.Linear(nodes, bars, loads, support)
+    renumbered = analysis.Linear(nodes, bars, loads, support, renumber=True)
+    assert not np.array_equal(renumbered.numbering.node_dofs.ravel(), np.arange(72))
+
+    for linear in (original, renumbered):
+        linear.modify_bar(bars[6], releases={'Rzj': True})
+    for load in loads:
+        np.testing.assert_allclose(renumbered.forces_vector[load], original.forces_vector[load],
+                                   rtol=1e-12, atol=1e-9)
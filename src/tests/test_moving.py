@@ -0,0 +1,75 @@
+"""Testes das linhas de influência e cargas móveis"""
+import numpy as np
+from conftest import Frame
+
+import pyengineer as pg
+from pyengineer import analysis
+
+
+def vehicle_results(frame: Frame, axles: list[tuple[pg.Bar, float, float]]) -> analysis.Results:
+    """Análise linear de forças verticais nas barras
+
+    Args:
+        frame (Frame): Pórtico
+        axles (list[tuple[pg.Bar, float, float]]): Barra, posição e valor de cada força
+
+    Returns:
+        analysis.Results: Resultados do único caso de carga
+    """
+    nodes, bars, _, support = frame
+    load = pg.Load('Vehicle')
+    for index, (bar, position, value) in enumerate(axles):
+        load.add_bar_load_pt(f'P{index}', bar, position, 'global', fz=-value)
+
+    results = analysis.Linear(nodes, bars, [load], support).results
+    assert results is not None
+    return results
+
+
+def assert_same_case(actual: analysis.Results, index: int, expected: analysis.Results):
+    """Compara um caso dos resultados com o único caso de outros resultados"""
+    for values, reference in ((actual.displacements[index], expected.displacements[0]),
+                              (actual.reactions[index], expected.reactions[0]),
+                              (actual.bars_forces[index], expected.bars_forces[0])):
+        np.testing.assert_allclose(values, reference, rtol=0,
+                                   atol=1e-9 * np.abs(reference).max())
+
+
+def test_influence_lines_match_point_loads(frame: Frame):
+    """Cada estação tem os resultados de uma força unitária na mesma posição"""
+    nodes, bars, loads, support = frame
+    # X00 é percorrida do nó final para o inicial e tem liberações
+    path = [bars[4], bars[6]]
+    moving = analysis.MovingLoad(analysis.Linear(nodes, bars, loads, support), path, 4)
+
+    assert moving.positions[-1] == moving.length == bars[4].length + bars[6].length
+    for index in range(moving.x.size):
+        bar = bars[4] if moving.bar_index[index] == 4 else bars[6]
+        assert_same_case(moving.influence, index,
+                         vehicle_results(frame, [(bar, float(moving.x[index]), 1.0)]))
+
+
+def test_vehicle_envelope_matches_the_axle_positions(frame: Frame):
+    """A envoltória de um veículo com eixos nas estações vem das análises de cada posição"""
+    nodes, bars, loads, support = frame
+    beam = bars[12]
+    moving = analysis.MovingLoad(analysis.Linear(nodes, bars, loads, support), [beam], 4)
+    spacing = beam.length / 4
+
+    envelope = moving.vehicle_envelope([0.0, 2 * spacing], [1.0, 0.5])
+
+    # Primeiro eixo de 0 a L + 2 espaçamentos; só os eixos dentro da barra contam
+    front = spacing * np.arange(7)
+    np.testing.assert_allclose([float(name) for name in envelope.combination_names], front)
+    cases = []
+    for first in front:
+        axles = [(beam, min(max(position, 0.0), beam.length), value)
+                 for position, value in ((first, 1.0), (first - 2 * spacing, 0.5))
+                 if -1e-9 < position < beam.length + 1e-9]
+        cases.append(vehicle_results(frame, axles))
+    forces = np.array([case.bars_forces[0] for case in cases])
+    scale = np.abs(forces).max()
+    np.testing.assert_allclose(envelope.bars_forces.maximum, forces.max(axis=0),
+                               rtol=0, atol=1e-9 * scale)
+    np.testing.assert_allclose(envelope.bars_forces.minimum, forces.min(axis=0),
+                               rtol=0, atol=1e-9 * scale)
@@ -0,0 +1,34 @@
+"""Testes dos solvers dos sistemas lineares"""
+import numpy as np
+from scipy import sparse
+from conftest import Frame
+
+from pyengineer import analysis
+from pyengineer.analysis._solvers import Factorization
+
+
+def test_factorization_of_penalty_matrix_is_backward_stable(frame: Frame):
+    """A LU sem troca de linhas da matriz com penalidade (1e25) é estável"""
+    nodes, bars, loads, support = frame
+    linear = analysis.Linear(nodes, bars, loads, support, supports_method='penalty')
+    matrix = sparse.csr_matrix(linear.kg_solution)
+    rhs = linear.forces
+
+    solution = Factorization(matrix).solve(rhs)
+    residual = np.abs(matrix @ solution - rhs).max()
+    scale = abs(matrix).max() * np.abs(solution).max() + np.abs(rhs).max()
+    assert residual < 1e-14 * scale
+
+    partition = analysis.Linear(nodes, bars, loads, support).displacements_matrix
+    np.testing.assert_allclose(solution, partition, rtol=0, atol=1e-9 * np.abs(partition).max())
+
+
+def test_factorization_of_indefinite_matrix_uses_pivoting():
+    """Uma matriz simétrica indefinida é fatorada com pivoteamento parcial"""
+    matrix = np.array([[1e-20, 1.0, 0.0],
+                       [1.0, 1e-20, 1.0],
+                       [0.0, 1.0, 2.0]])
+    rhs = np.array([[1.0, 0.0], [2.0, 1.0], [3.0, -1.0]])
+
+    solution = Factorization(sparse.csr_matrix(matrix)).solve(rhs)
+    np.testing.assert_allclose(solution, np.linalg.solve(matrix, rhs), atol=1e-12)